@@ -1,8 +1,12 @@
 """FastAPI dependencies for dependency injection"""
 
-from typing import AsyncGenerator
-from fastapi import Depends, HTTPException, status
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from typing import Any, AsyncGenerator, Dict
+from uuid import UUID
+import hashlib
+from cachetools import TTLCache
+from jwt import PyJWTError
+from fastapi import Depends, HTTPException, Request, status
+from fastapi.security import HTTPBearer
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.db.session import get_db
 from app.db.base import User
@@ -15,10 +19,50 @@ from app.services.quiz_service import QuizService
 from app.services.attempt_service import AttemptService
 from app.services.scoring_service import ScoringService
 from app.domain.enums import UserRole
+from app.core.security import decode_token
 from app.core.exceptions import InvalidTokenException, InsufficientPermissionsException
 
+
+class BearerToken(HTTPBearer):
+    """
+    Bearer scheme that returns the raw token string
+    
+    Reads the Authorization header directly instead of building an
+    HTTPAuthorizationCredentials model per request. Subclassing HTTPBearer
+    keeps the scheme registered in the OpenAPI docs.
+    """
+    
+    async def __call__(self, request: Request) -> str:
+        authorization = request.headers.get("authorization")
+        if authorization and authorization[:7].lower() == "bearer ":
+            token = authorization[7:].strip()
+            if token:
+                return token
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated",
+            headers={"WWW-Authenticate": "Bearer"}
+        )
+
+
 # Security scheme
-security = HTTPBearer()
+security = BearerToken()
+
+# Short-lived cache of verified access tokens -> User
+# TTL is kept well below ACCESS_TOKEN_EXPIRE_MINUTES / 2 to bound revocation latency
+_user_cache: TTLCache = TTLCache(maxsize=10000, ttl=30)
+
+
+def purge_user_cache(user_id: UUID) -> None:
+    """
+    Drop all cached tokens belonging to a user
+    
+    Args:
+        user_id: User ID
+    """
+    for key, user in list(_user_cache.items()):
+        if user.id == user_id:
+            _user_cache.pop(key, None)
 
 
 # Repository dependencies
@@ -73,14 +117,17 @@ def get_attempt_service(
 
 # Authentication dependencies
 async def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
+    token: str = Depends(security),
     auth_service: AuthService = Depends(get_auth_service)
 ) -> User:
     """
     Get current authenticated user from JWT token
     
+    Verified tokens are cached for a short TTL so repeated requests with the
+    same token skip JWT decoding and the user lookup.
+    
     Args:
-        credentials: HTTP bearer credentials
+        token: Raw bearer token
         auth_service: Authentication service
         
     Returns:
@@ -89,8 +136,14 @@ async def get_current_user(
     Raises:
         HTTPException: If token is invalid
     """
+    key = hashlib.sha256(token.encode()).hexdigest()[:32]
+    cached_user = _user_cache.get(key)
+    if cached_user is not None:
+        return cached_user
+    
     try:
-        user = await auth_service.get_current_user(credentials.credentials)
+        user = await auth_service.get_current_user(token)
+        _user_cache[key] = user
         return user
     except Exception as e:
         raise HTTPException(
@@ -100,25 +153,68 @@ async def get_current_user(
         )
 
 
-async def require_admin(current_user: User = Depends(get_current_user)) -> User:
+async def get_current_user_claims(token: str = Depends(security)) -> Dict[str, Any]:
     """
-    Require admin role
+    Verify the access token and return its claims without loading the user
+    
+    Role and active flag are embedded in the token at login, so routes that
+    only need them skip the users query. Revocation by logout is not seen
+    here until the access token expires.
     
     Args:
-        current_user: Current user
+        token: Raw bearer token
+        
+    Returns:
+        Decoded token claims
+        
+    Raises:
+        HTTPException: If token is invalid or the account is inactive
+    """
+    try:
+        claims = decode_token(token)
+    except PyJWTError:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or malformed token",
+            headers={"WWW-Authenticate": "Bearer"}
+        )
+    
+    if claims.get("type") == "refresh":
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Refresh token cannot be used for authentication",
+            headers={"WWW-Authenticate": "Bearer"}
+        )
+    
+    if claims.get("active") is False:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="User account is inactive"
+        )
+    return claims
+
+
+async def require_admin(
+    claims: Dict[str, Any] = Depends(get_current_user_claims)
+) -> Dict[str, Any]:
+    """
+    Require admin role (checked on the token claims)
+    
+    Args:
+        claims: Verified access token claims
         
     Returns:
-        Current user (if admin)
+        Token claims (if admin); the user ID is in claims["sub"]
         
     Raises:
         HTTPException: If user is not admin
     """
-    if current_user.role != UserRole.ADMIN:
+    if claims.get("role") != UserRole.ADMIN.value:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Admin access required"
         )
-    return current_user
+    return claims
 
 
 async def get_current_active_user(current_user: User = Depends(get_current_user)) -> User:
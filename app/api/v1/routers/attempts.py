@@ -1,16 +1,45 @@
 """Quiz attempt router"""
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, BackgroundTasks, Depends, Query, status
+from fastapi.responses import ORJSONResponse
+from typing import List
 from uuid import UUID
-from datetime import datetime
-from app.schemas.attempt import AttemptStart, AnswerSubmit, AttemptResponse, AnswerResponse
+from app.schemas.attempt import AttemptStart, AnswerSubmit, AnswersBulkSubmit, AttemptResponse, AnswerResponse
 from app.services.attempt_service import AttemptService
 from app.api.v1.deps import get_attempt_service, get_current_user
-from app.db.base import User
+from app.db.base import Answer, Attempt, User
 
 router = APIRouter(prefix="/attempts", tags=["Attempts"])
 
 
+# Handlers return ORJSONResponse bodies built from these helpers, skipping
+# response_model validation; response_model stays for the OpenAPI schema
+def _answer_body(answer: Answer) -> dict:
+    """AnswerResponse fields of an answer"""
+    return {
+        "id": answer.id,
+        "question_id": answer.question_id,
+        "selected_answer": answer.selected_answer,
+        "answered_at": answer.answered_at
+    }
+
+
+def _attempt_body(attempt: Attempt, time_remaining_seconds: int, answers: List[dict]) -> dict:
+    """AttemptResponse fields of an attempt"""
+    return {
+        "id": attempt.id,
+        "quiz_id": attempt.quiz_id,
+        "user_id": attempt.user_id,
+        "started_at": attempt.started_at,
+        "expires_at": attempt.expires_at,
+        "submitted_at": attempt.submitted_at,
+        "is_submitted": attempt.is_submitted,
+        "status": attempt.status,
+        "time_remaining_seconds": time_remaining_seconds,
+        "answers": answers
+    }
+
+
 @router.post("/quizzes/{quiz_id}/start", response_model=AttemptResponse, status_code=status.HTTP_201_CREATED)
 async def start_quiz_attempt(
     quiz_id: UUID,
@@ -30,20 +59,9 @@ async def start_quiz_attempt(
     """
     attempt = await attempt_service.start_attempt(quiz_id, current_user.id)
     
-    # Calculate time remaining
-    time_remaining = int((attempt.expires_at - datetime.utcnow()).total_seconds())
-    
-    return AttemptResponse(
-        id=attempt.id,
-        quiz_id=attempt.quiz_id,
-        user_id=attempt.user_id,
-        started_at=attempt.started_at,
-        expires_at=attempt.expires_at,
-        submitted_at=attempt.submitted_at,
-        is_submitted=attempt.is_submitted,
-        status=attempt.status,
-        time_remaining_seconds=max(0, time_remaining),
-        answers=[]
+    return ORJSONResponse(
+        content=_attempt_body(attempt, attempt_service.time_remaining_seconds(attempt), []),
+        status_code=status.HTTP_201_CREATED
     )
 
 
@@ -74,28 +92,11 @@ async def get_attempt(
             detail="Not authorized to access this attempt"
         )
     
-    # Calculate time remaining
-    time_remaining = int((attempt.expires_at - datetime.utcnow()).total_seconds())
-    
-    return AttemptResponse(
-        id=attempt.id,
-        quiz_id=attempt.quiz_id,
-        user_id=attempt.user_id,
-        started_at=attempt.started_at,
-        expires_at=attempt.expires_at,
-        submitted_at=attempt.submitted_at,
-        is_submitted=attempt.is_submitted,
-        status=attempt.status,
-        time_remaining_seconds=max(0, time_remaining),
-        answers=[
-            AnswerResponse(
-                id=a.id,
-                question_id=a.question_id,
-                selected_answer=a.selected_answer,
-                answered_at=a.answered_at
-            ) for a in attempt.answers
-        ]
-    )
+    return ORJSONResponse(content=_attempt_body(
+        attempt,
+        attempt_service.time_remaining_seconds(attempt),
+        [_answer_body(a) for a in attempt.answers]
+    ))
 
 
 @router.post("/{attempt_id}/answers", response_model=AnswerResponse)
@@ -117,33 +118,51 @@ async def submit_answer(
     Returns:
         Submitted answer
     """
-    # Verify user owns the attempt
-    attempt = await attempt_service.get_attempt(attempt_id)
-    if attempt.user_id != current_user.id:
-        from fastapi import HTTPException
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not authorized to access this attempt"
-        )
-    
-    # Submit answer
+    # Submit answer (ownership is checked in the same query)
     answer = await attempt_service.submit_answer(
         attempt_id=attempt_id,
+        user_id=current_user.id,
         question_id=answer_data.question_id,
         selected_answer=answer_data.selected_answer
     )
     
-    return AnswerResponse(
-        id=answer.id,
-        question_id=answer.question_id,
-        selected_answer=answer.selected_answer,
-        answered_at=answer.answered_at
+    return ORJSONResponse(content=_answer_body(answer))
+
+
+@router.post("/{attempt_id}/answers/bulk", response_model=List[AnswerResponse])
+async def submit_answers_bulk(
+    attempt_id: UUID,
+    bulk_data: AnswersBulkSubmit,
+    current_user: User = Depends(get_current_user),
+    attempt_service: AttemptService = Depends(get_attempt_service)
+):
+    """
+    Submit several answers in one request (single upsert)
+    
+    Args:
+        attempt_id: Attempt ID
+        bulk_data: Answers to submit
+        current_user: Current user
+        attempt_service: Attempt service
+        
+    Returns:
+        Submitted answers
+    """
+    # Submit answers (ownership is checked in the same query)
+    answers = await attempt_service.submit_answers_bulk(
+        attempt_id=attempt_id,
+        user_id=current_user.id,
+        answers=bulk_data.answers
     )
+    
+    return ORJSONResponse(content=[_answer_body(a) for a in answers])
 
 
 @router.post("/{attempt_id}/submit")
 async def submit_quiz(
     attempt_id: UUID,
+    background_tasks: BackgroundTasks,
+    defer: bool = Query(False, description="Grade in a worker and answer 202 Accepted"),
     current_user: User = Depends(get_current_user),
     attempt_service: AttemptService = Depends(get_attempt_service)
 ):
@@ -152,23 +171,27 @@ async def submit_quiz(
     
     Args:
         attempt_id: Attempt ID
+        background_tasks: Runs the result notification after the response
+        defer: Submit now but queue grading instead of scoring in the
+            request; the result notification is sent once the worker has
+            scored the attempt
         current_user: Current user
         attempt_service: Attempt service
         
     Returns:
-        Result summary
+        Result summary (or an accepted message when deferred)
     """
-    # Verify user owns the attempt
-    attempt = await attempt_service.get_attempt(attempt_id)
-    if attempt.user_id != current_user.id:
-        from fastapi import HTTPException
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not authorized to access this attempt"
+    if defer:
+        await attempt_service.queue_submit_attempt(attempt_id, user_id=current_user.id)
+        return ORJSONResponse(
+            content={"message": "Quiz submitted for grading", "attempt_id": attempt_id},
+            status_code=status.HTTP_202_ACCEPTED
         )
     
-    # Submit attempt
-    result = await attempt_service.submit_attempt(attempt_id)
+    # Submit attempt (ownership is checked in the same query)
+    result = await attempt_service.submit_attempt(
+        attempt_id, user_id=current_user.id, background_tasks=background_tasks
+    )
     
     return {
         "message": "Quiz submitted successfully",
@@ -1,15 +1,41 @@
 """Authentication router"""
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import ORJSONResponse
 from app.schemas.auth import UserRegister, UserLogin, TokenResponse, RefreshTokenRequest, UserResponse
 from app.services.auth_service import AuthService
-from app.api.v1.deps import get_auth_service, get_current_user
+from app.api.v1.deps import get_auth_service, get_current_user, purge_user_cache
 from app.db.base import User
 from app.core.config import settings
+from app.core.security import purge_decoded_tokens
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
 
+# Handlers return ORJSONResponse bodies built from these helpers; the
+# response_model on each route stays for the OpenAPI schema only
+def _user_body(user: User) -> dict:
+    """UserResponse fields of a user"""
+    return {
+        "id": user.id,
+        "email": user.email,
+        "username": user.username,
+        "role": user.role,
+        "is_active": user.is_active,
+        "created_at": user.created_at
+    }
+
+
+def _token_body(access_token: str, refresh_token: str, expires_in: int) -> dict:
+    """TokenResponse fields for an issued token pair"""
+    return {
+        "access_token": access_token,
+        "refresh_token": refresh_token,
+        "token_type": "bearer",
+        "expires_in": expires_in
+    }
+
+
 @router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
 async def register(
     user_data: UserRegister,
@@ -32,7 +58,7 @@ async def register(
         username=user_data.username,
         password=user_data.password
     )
-    return user
+    return ORJSONResponse(content=_user_body(user), status_code=status.HTTP_201_CREATED)
 
 
 @router.post("/login", response_model=TokenResponse)
@@ -55,12 +81,7 @@ async def login(
         password=credentials.password
     )
     
-    return TokenResponse(
-        access_token=access_token,
-        refresh_token=refresh_token,
-        token_type="bearer",
-        expires_in=expires_in
-    )
+    return ORJSONResponse(content=_token_body(access_token, refresh_token, expires_in))
 
 
 @router.post("/refresh", response_model=TokenResponse)
@@ -82,12 +103,7 @@ async def refresh_token(
         refresh_token=token_request.refresh_token
     )
     
-    return TokenResponse(
-        access_token=access_token,
-        refresh_token=refresh_token,
-        token_type="bearer",
-        expires_in=expires_in
-    )
+    return ORJSONResponse(content=_token_body(access_token, refresh_token, expires_in))
 
 
 @router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
@@ -96,13 +112,15 @@ async def logout(
     auth_service: AuthService = Depends(get_auth_service)
 ):
     """
-    Logout user by revoking all refresh tokens
+    Logout user by invalidating all previously issued tokens
     
     Args:
         current_user: Current authenticated user
         auth_service: Authentication service
     """
     await auth_service.logout(current_user.id)
+    purge_user_cache(current_user.id)
+    purge_decoded_tokens(str(current_user.id))
     return None
 
 
@@ -117,4 +135,4 @@ async def get_current_user_info(current_user: User = Depends(get_current_user)):
     Returns:
         User information
     """
-    return current_user
+    return ORJSONResponse(content=_user_body(current_user))
@@ -1,23 +1,61 @@
 """Leaderboard router"""
 
 from fastapi import APIRouter, Depends
+from fastapi.responses import ORJSONResponse
 from typing import List
 from uuid import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, desc
+from sqlalchemy import select, desc, func, bindparam
 from app.schemas.result import LeaderboardEntry
 from app.db.base import Result, User
 from app.db.session import get_db
 from app.api.v1.deps import get_current_user
 
-router = APIRouter(prefix="/leaderboard", tags=["Leaderboard"])
+# Every route requires an authenticated user; handlers that need the user
+# still declare get_current_user (resolved once per request)
+router = APIRouter(
+    prefix="/leaderboard",
+    tags=["Leaderboard"],
+    dependencies=[Depends(get_current_user)]
+)
+
+
+def _leaderboard_query():
+    """Build leaderboard query with rank computed in SQL via row_number()"""
+    rank = func.row_number().over(
+        order_by=(desc(Result.score), Result.created_at)
+    ).label("rank")
+    
+    return (
+        select(
+            rank,
+            User.id.label("user_id"),
+            User.username,
+            Result.score,
+            Result.total_points,
+            Result.percentage,
+            Result.created_at.label("submitted_at")
+        )
+        .join(User, Result.user_id == User.id)
+        .order_by(rank)
+    )
+
+
+# Statements are built once at import time; per-request values are bound
+# parameters, so SQLAlchemy's compiled cache and asyncpg's prepared-statement
+# cache are both hit on every call
+QUIZ_LEADERBOARD_STMT = (
+    _leaderboard_query()
+    .where(Result.quiz_id == bindparam("quiz_id"))
+    .limit(bindparam("limit"))
+)
+GLOBAL_LEADERBOARD_STMT = _leaderboard_query().limit(bindparam("limit"))
 
 
 @router.get("/quizzes/{quiz_id}", response_model=List[LeaderboardEntry])
 async def get_quiz_leaderboard(
     quiz_id: UUID,
     limit: int = 10,
-    current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -26,46 +64,24 @@ async def get_quiz_leaderboard(
     Args:
         quiz_id: Quiz ID
         limit: Number of top results to return
-        current_user: Current user
         db: Database session
         
     Returns:
         List of leaderboard entries
     """
-    # Query top results with user information
-    query = (
-        select(Result, User)
-        .join(User, Result.user_id == User.id)
-        .where(Result.quiz_id == quiz_id)
-        .order_by(desc(Result.score), Result.created_at)
-        .limit(limit)
+    result = await db.execute(
+        QUIZ_LEADERBOARD_STMT, {"quiz_id": quiz_id, "limit": limit}
     )
+    rows = result.mappings().all()
     
-    result = await db.execute(query)
-    rows = result.all()
-    
-    # Build leaderboard entries
-    leaderboard = []
-    for rank, (result_obj, user_obj) in enumerate(rows, start=1):
-        leaderboard.append(
-            LeaderboardEntry(
-                rank=rank,
-                user_id=user_obj.id,
-                username=user_obj.username,
-                score=result_obj.score,
-                total_points=result_obj.total_points,
-                percentage=result_obj.percentage,
-                submitted_at=result_obj.created_at
-            )
-        )
-    
-    return leaderboard
+    # Rows already match LeaderboardEntry - serialize directly, skipping
+    # response_model validation
+    return ORJSONResponse(content=[dict(row) for row in rows])
 
 
 @router.get("/global", response_model=List[LeaderboardEntry])
 async def get_global_leaderboard(
     limit: int = 10,
-    current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -73,36 +89,14 @@ async def get_global_leaderboard(
     
     Args:
         limit: Number of top results to return
-        current_user: Current user
         db: Database session
         
     Returns:
         List of leaderboard entries
     """
-    # Query top results across all quizzes
-    query = (
-        select(Result, User)
-        .join(User, Result.user_id == User.id)
-        .order_by(desc(Result.score), Result.created_at)
-        .limit(limit)
-    )
-    
-    result = await db.execute(query)
-    rows = result.all()
-    
-    # Build leaderboard entries
-    leaderboard = []
-    for rank, (result_obj, user_obj) in enumerate(rows, start=1):
-        leaderboard.append(
-            LeaderboardEntry(
-                rank=rank,
-                user_id=user_obj.id,
-                username=user_obj.username,
-                score=result_obj.score,
-                total_points=result_obj.total_points,
-                percentage=result_obj.percentage,
-                submitted_at=result_obj.created_at
-            )
-        )
+    result = await db.execute(GLOBAL_LEADERBOARD_STMT, {"limit": limit})
+    rows = result.mappings().all()
     
-    return leaderboard
+    # Rows already match LeaderboardEntry - serialize directly, skipping
+    # response_model validation
+    return ORJSONResponse(content=[dict(row) for row in rows])
@@ -1,9 +1,10 @@
 """API router for notifications"""
 
 from fastapi import APIRouter, Depends, status, Query, HTTPException
+from fastapi.responses import ORJSONResponse
 from sqlmodel.ext.asyncio.session import AsyncSession
 from app.api.v1.deps import get_db, get_current_user
-from app.services.notification_service import NotificationService
+from app.services.notification_service import NotificationService, encode_notification_cursor
 from app.repositories.notification_repo import NotificationRepository
 from app.repositories.quiz_repo import QuizRepository
 from app.repositories.user_repo import UserRepository
@@ -14,7 +15,7 @@ from app.schemas.notification import (
     UnreadCountResponse
 )
 from uuid import UUID
-from typing import Annotated
+from typing import Annotated, Optional
 
 router = APIRouter(prefix="/notifications", tags=["Notifications"])
 
@@ -34,28 +35,38 @@ async def get_my_notifications(
     limit: Annotated[int, Query(ge=1, le=100)] = 50,
     offset: Annotated[int, Query(ge=0)] = 0,
     unread_only: bool = False,
+    cursor: Optional[str] = None,
     current_user: User = Depends(get_current_user),
     notification_service: NotificationService = Depends(get_notification_service)
-) -> NotificationListResponse:
+) -> ORJSONResponse:
     """
     Get current user's notifications.
     Supports pagination and filtering by unread status.
+    Pass the previous page's next_cursor to continue without OFFSET.
     """
-    notifications = await notification_service.get_user_notifications(
+    notifications, total = await notification_service.get_user_notifications(
         current_user.id,
         limit=limit,
         offset=offset,
-        unread_only=unread_only
+        unread_only=unread_only,
+        cursor=cursor
     )
     
-    total = len(notifications)  # For simplicity; implement proper count if needed
-    
-    return NotificationListResponse(
-        notifications=[NotificationResponse.model_validate(n) for n in notifications],
-        total=total,
-        limit=limit,
-        offset=offset
-    )
+    # ORM rows are already valid - build items without validation and
+    # serialize directly, skipping the response_model pass
+    return ORJSONResponse(content={
+        "notifications": [
+            NotificationResponse.model_construct(**n.__dict__).model_dump()
+            for n in notifications
+        ],
+        "total": total,
+        "limit": limit,
+        "offset": offset,
+        "next_cursor": (
+            encode_notification_cursor(notifications[-1])
+            if len(notifications) == limit else None
+        )
+    })
 
 
 @router.get("/unread-count", response_model=UnreadCountResponse)
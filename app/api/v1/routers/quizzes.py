@@ -1,21 +1,51 @@
 """Quiz router"""
 
 from fastapi import APIRouter, Depends, status
-from typing import List
+from fastapi.responses import Response
+from pydantic import BaseModel, TypeAdapter
+from typing import Any, Dict, List, Type
 from uuid import UUID
 from app.schemas.quiz import QuizCreate, QuizUpdate, QuizResponse, QuizAdminResponse, QuizListItem
 from app.schemas.assignment import QuizAssignmentCreate, QuizAssignmentResponse, QuizAssignmentWithUser
-from app.services.quiz_service import QuizService
-from app.api.v1.deps import get_quiz_service, require_admin, get_current_user
+from app.services.quiz_service import QuizService, PUBLISHED_QUIZZES_CACHE_NS
+from app.core.cache import cache_get, cache_set
+from app.api.v1.deps import get_quiz_service, require_admin, get_current_user, get_current_user_claims
 from app.db.base import User
 
-router = APIRouter(prefix="/quizzes", tags=["Quizzes"])
+# Every route requires a valid access token; handlers that need the user
+# row declare get_current_user, admin routes check the role claim
+router = APIRouter(
+    prefix="/quizzes",
+    tags=["Quizzes"],
+    dependencies=[Depends(get_current_user_claims)]
+)
+
+# Built once: validates a whole ORM page and dumps it to JSON in pydantic-core
+_QUIZ_LIST_ADAPTER = TypeAdapter(List[QuizResponse])
+
+
+def _schema_response(
+    schema: Type[BaseModel],
+    obj: Any,
+    status_code: int = status.HTTP_200_OK
+) -> Response:
+    """
+    Validate an ORM object through a response schema and serialize it in
+    pydantic-core, skipping FastAPI's response_model pass (which stays for
+    the OpenAPI schema)
+    """
+    model = schema.model_validate(obj)
+    return Response(
+        content=model.__pydantic_serializer__.to_json(model),
+        media_type="application/json",
+        status_code=status_code
+    )
 
 
 @router.post("/", response_model=QuizAdminResponse, status_code=status.HTTP_201_CREATED)
 async def create_quiz(
     quiz_data: QuizCreate,
-    current_admin: User = Depends(require_admin),
+    current_admin: Dict[str, Any] = Depends(require_admin),
     quiz_service: QuizService = Depends(get_quiz_service)
 ):
     """
@@ -23,7 +53,7 @@ async def create_quiz(
     
     Args:
         quiz_data: Quiz creation data
-        current_admin: Current admin user
+        current_admin: Current admin token claims
         quiz_service: Quiz service
         
     Returns:
@@ -38,16 +68,15 @@ async def create_quiz(
         randomize_options=quiz_data.randomize_options,
         max_attempts=quiz_data.max_attempts,
         questions=quiz_data.questions,
-        created_by=current_admin.id
+        created_by=UUID(current_admin["sub"])
     )
-    return quiz
+    return _schema_response(QuizAdminResponse, quiz, status.HTTP_201_CREATED)
 
 
 @router.get("/", response_model=List[QuizResponse])
 async def list_published_quizzes(
     skip: int = 0,
     limit: int = 100,
-    current_user: User = Depends(get_current_user),
     quiz_service: QuizService = Depends(get_quiz_service)
 ):
     """
@@ -56,14 +85,27 @@ async def list_published_quizzes(
     Args:
         skip: Number of records to skip
         limit: Maximum number of records to return
-        current_user: Current user
         quiz_service: Quiz service
         
     Returns:
         List of published quizzes
     """
+    # The listing is the same for every user, so the encoded body is cached
+    # per page; publish/update/delete clear the namespace
+    cache_key = f"{skip}:{limit}"
+    cached = await cache_get(PUBLISHED_QUIZZES_CACHE_NS, cache_key)
+    if cached is not None:
+        return Response(content=cached, media_type="application/json")
+    
     quizzes = await quiz_service.get_published_quizzes(skip, limit)
-    return quizzes
+    
+    # Validate once through QuizResponse (drops correct answers) and
+    # serialize directly, skipping the second response_model pass
+    body = _QUIZ_LIST_ADAPTER.dump_json(
+        _QUIZ_LIST_ADAPTER.validate_python(quizzes, from_attributes=True)
+    )
+    await cache_set(PUBLISHED_QUIZZES_CACHE_NS, cache_key, body, expire=60)
+    return Response(content=body, media_type="application/json")
 
 
 
@@ -77,13 +119,15 @@ async def get_my_assigned_quizzes(
     Includes both public quizzes and specifically assigned ones
     """
     quizzes = await quiz_service.get_user_quizzes(current_user.id)
-    return quizzes
+    body = _QUIZ_LIST_ADAPTER.dump_json(
+        _QUIZ_LIST_ADAPTER.validate_python(quizzes, from_attributes=True)
+    )
+    return Response(content=body, media_type="application/json")
 
 
 @router.get("/{quiz_id}", response_model=QuizResponse)
 async def get_quiz(
     quiz_id: UUID,
-    current_user: User = Depends(get_current_user),
     quiz_service: QuizService = Depends(get_quiz_service)
 ):
     """
@@ -91,21 +135,20 @@ async def get_quiz(
     
     Args:
         quiz_id: Quiz ID
-        current_user: Current user
         quiz_service: Quiz service
         
     Returns:
         Quiz details
     """
     quiz = await quiz_service.get_quiz(quiz_id)
-    return quiz
+    return _schema_response(QuizResponse, quiz)
 
 
 @router.put("/{quiz_id}", response_model=QuizAdminResponse)
 async def update_quiz(
     quiz_id: UUID,
     quiz_update: QuizUpdate,
-    current_admin: User = Depends(require_admin),
+    current_admin: Dict[str, Any] = Depends(require_admin),
     quiz_service: QuizService = Depends(get_quiz_service)
 ):
     """
@@ -114,7 +157,7 @@ async def update_quiz(
     Args:
         quiz_id: Quiz ID
         quiz_update: Quiz update data
-        current_admin: Current admin user
+        current_admin: Current admin token claims
         quiz_service: Quiz service
         
     Returns:
@@ -130,13 +173,13 @@ async def update_quiz(
         randomize_options=quiz_update.randomize_options,
         max_attempts=quiz_update.max_attempts
     )
-    return quiz
+    return _schema_response(QuizAdminResponse, quiz)
 
 
 @router.post("/{quiz_id}/publish", response_model=QuizAdminResponse)
 async def publish_quiz(
     quiz_id: UUID,
-    current_admin: User = Depends(require_admin),
+    current_admin: Dict[str, Any] = Depends(require_admin),
     quiz_service: QuizService = Depends(get_quiz_service)
 ):
     """
@@ -144,20 +187,20 @@ async def publish_quiz(
     
     Args:
         quiz_id: Quiz ID
-        current_admin: Current admin user
+        current_admin: Current admin token claims
         quiz_service: Quiz service
         
     Returns:
         Published quiz
     """
     quiz = await quiz_service.publish_quiz(quiz_id)
-    return quiz
+    return _schema_response(QuizAdminResponse, quiz)
 
 
 @router.delete("/{quiz_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_quiz(
     quiz_id: UUID,
-    current_admin: User = Depends(require_admin),
+    current_admin: Dict[str, Any] = Depends(require_admin),
     quiz_service: QuizService = Depends(get_quiz_service)
 ):
     """
@@ -165,7 +208,7 @@ async def delete_quiz(
     
     Args:
         quiz_id: Quiz ID
-        current_admin: Current admin user
+        current_admin: Current admin token claims
         quiz_service: Quiz service
     """
     await quiz_service.delete_quiz(quiz_id)
@@ -178,7 +221,7 @@ async def delete_quiz(
 async def assign_quiz_to_users(
     quiz_id: UUID,
     assignment_data: QuizAssignmentCreate,
-    current_admin: User = Depends(require_admin),
+    current_admin: Dict[str, Any] = Depends(require_admin),
     quiz_service: QuizService = Depends(get_quiz_service)
 ):
     """
@@ -193,7 +236,7 @@ async def assign_quiz_to_users(
     result = await quiz_service.assign_quiz(
         quiz_id=quiz_id,
         user_ids=assignment_data.user_ids,
-        assigned_by=current_admin.id,
+        assigned_by=UUID(current_admin["sub"]),
         due_date=assignment_data.due_date
     )
     return result
@@ -203,7 +246,7 @@ async def assign_quiz_to_users(
 async def revoke_quiz_assignment(
     quiz_id: UUID,
     user_id: UUID,
-    current_admin: User = Depends(require_admin),
+    current_admin: Dict[str, Any] = Depends(require_admin),
     quiz_service: QuizService = Depends(get_quiz_service)
 ):
     """Admin revokes quiz assignment from a user"""
@@ -214,7 +257,7 @@ async def revoke_quiz_assignment(
 @router.get("/{quiz_id}/assignments")
 async def get_quiz_assignments(
     quiz_id: UUID,
-    current_admin: User = Depends(require_admin),
+    current_admin: Dict[str, Any] = Depends(require_admin),
     quiz_service: QuizService = Depends(get_quiz_service)
 ):
     """Get all users assigned to this quiz"""
@@ -1,15 +1,35 @@
 """Results router"""
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from typing import List
+from fastapi.responses import StreamingResponse
+from typing import Any, AsyncIterator, Dict, List
 from uuid import UUID
+import orjson
 from app.schemas.result import ResultResponse
 from app.repositories.result_repo import ResultRepository
-from app.api.v1.deps import get_result_repo, get_current_user
-from app.db.base import User
+from app.api.v1.deps import get_result_repo, get_current_user, require_admin
+from app.db.base import Result, User
+from app.db.session import AsyncSessionLocal
 
 router = APIRouter(prefix="/results", tags=["Results"])
 
+_RESULT_FIELDS = tuple(ResultResponse.model_fields)
+
+# Rows per write when streaming NDJSON
+_STREAM_BATCH_SIZE = 500
+
+
+async def _ndjson(results: AsyncIterator[Result]) -> AsyncIterator[bytes]:
+    """Encode results as NDJSON, one write per _STREAM_BATCH_SIZE rows"""
+    batch: List[bytes] = []
+    async for result in results:
+        batch.append(orjson.dumps({field: getattr(result, field) for field in _RESULT_FIELDS}))
+        if len(batch) >= _STREAM_BATCH_SIZE:
+            yield b"\n".join(batch) + b"\n"
+            batch.clear()
+    if batch:
+        yield b"\n".join(batch) + b"\n"
+
 
 @router.get("/attempts/{attempt_id}", response_model=ResultResponse)
 async def get_result_by_attempt(
@@ -63,3 +83,57 @@ async def get_my_results(
     """
     results = await result_repo.get_user_results(current_user.id)
     return results
+
+
+@router.get("/my-results/stream")
+async def stream_my_results(
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Stream all results for current user as NDJSON (one result per line)
+    
+    Rows are read through a server-side cursor and written as they arrive,
+    so memory stays flat however long the history is.
+    
+    Args:
+        current_user: Current user
+        
+    Returns:
+        Streaming NDJSON response
+    """
+    user_id = current_user.id
+    
+    async def generate() -> AsyncIterator[bytes]:
+        # Request-scoped dependencies are closed before the body is sent,
+        # so the stream owns its session
+        async with AsyncSessionLocal() as session:
+            result_repo = ResultRepository(session)
+            async for chunk in _ndjson(result_repo.stream_user_results(user_id)):
+                yield chunk
+    
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
+
+
+@router.get("/quizzes/{quiz_id}/stream")
+async def stream_quiz_results(
+    quiz_id: UUID,
+    current_admin: Dict[str, Any] = Depends(require_admin)
+):
+    """
+    Stream all results for a quiz as NDJSON, best score first (admin only)
+    
+    Args:
+        quiz_id: Quiz ID
+        current_admin: Current admin claims
+        
+    Returns:
+        Streaming NDJSON response
+    """
+    async def generate() -> AsyncIterator[bytes]:
+        # Owns its session for the same reason as stream_my_results
+        async with AsyncSessionLocal() as session:
+            result_repo = ResultRepository(session)
+            async for chunk in _ndjson(result_repo.stream_quiz_results(quiz_id)):
+                yield chunk
+    
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
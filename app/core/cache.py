@@ -0,0 +1,150 @@
+"""Redis-backed cache helpers
+
+Cache failures never fail a request: every helper logs the Redis error and
+behaves like a cache miss, so callers fall back to the database.
+"""
+
+import asyncio
+import logging
+from typing import Iterable, Optional
+from redis import asyncio as aioredis
+from redis.exceptions import RedisError
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_redis: Optional[aioredis.Redis] = None
+_redis_loop: Optional[asyncio.AbstractEventLoop] = None
+
+# INCRBY only when the counter is already cached; a missing key means
+# "unknown" and must be rebuilt from the database, not started at 0
+_INCR_IF_EXISTS = """
+if redis.call('EXISTS', KEYS[1]) == 1 then
+    return redis.call('INCRBY', KEYS[1], ARGV[1])
+end
+return nil
+"""
+
+
+def get_redis() -> aioredis.Redis:
+    """
+    Get the shared async Redis client (created lazily on first use)
+    
+    The client is bound to the running event loop; Celery tasks run each
+    job in a fresh loop, so a new client is created when the loop changes.
+    
+    Returns:
+        Redis client
+    """
+    global _redis, _redis_loop
+    loop = asyncio.get_running_loop()
+    if _redis is None or _redis_loop is not loop:
+        _redis_loop = loop
+        _redis = aioredis.from_url(
+            settings.REDIS_URL,
+            socket_connect_timeout=1,
+            socket_timeout=1
+        )
+    return _redis
+
+
+async def close_redis() -> None:
+    """Close the shared Redis client"""
+    global _redis
+    if _redis is not None:
+        try:
+            await _redis.aclose()
+        except RedisError as e:
+            logger.warning(f"Redis close failed: {e}")
+        _redis = None
+
+
+def _cache_key(namespace: str, key: str) -> str:
+    """Build the Redis key for an entry in a namespace"""
+    return f"cache:{namespace}:{key}"
+
+
+async def cache_get(namespace: str, key: str) -> Optional[bytes]:
+    """
+    Get a cached value
+    
+    Args:
+        namespace: Cache namespace
+        key: Key within the namespace
+    
+    Returns:
+        Cached bytes, or None on miss or Redis error
+    """
+    try:
+        return await get_redis().get(_cache_key(namespace, key))
+    except RedisError as e:
+        logger.warning(f"Cache get failed for {namespace}:{key}: {e}")
+        return None
+
+
+async def cache_set(namespace: str, key: str, value: bytes, expire: int) -> None:
+    """
+    Store a value with a TTL
+    
+    Args:
+        namespace: Cache namespace
+        key: Key within the namespace
+        value: Bytes to store
+        expire: TTL in seconds
+    """
+    try:
+        await get_redis().set(_cache_key(namespace, key), value, ex=expire)
+    except RedisError as e:
+        logger.warning(f"Cache set failed for {namespace}:{key}: {e}")
+
+
+async def cache_clear(namespace: str) -> None:
+    """
+    Drop every key in a namespace
+    
+    Args:
+        namespace: Cache namespace
+    """
+    try:
+        client = get_redis()
+        keys = [key async for key in client.scan_iter(match=_cache_key(namespace, "*"))]
+        if keys:
+            await client.unlink(*keys)
+    except RedisError as e:
+        logger.warning(f"Cache clear failed for {namespace}: {e}")
+
+
+async def cache_incr_existing(namespace: str, key: str, amount: int = 1) -> None:
+    """
+    Adjust a cached counter, leaving it uncached if it is not cached yet
+    
+    Args:
+        namespace: Cache namespace
+        key: Key within the namespace
+        amount: Increment (negative to decrement)
+    """
+    try:
+        await get_redis().eval(_INCR_IF_EXISTS, 1, _cache_key(namespace, key), amount)
+    except RedisError as e:
+        logger.warning(f"Cache increment failed for {namespace}:{key}: {e}")
+
+
+async def cache_incr_existing_many(namespace: str, keys: Iterable[str], amount: int = 1) -> None:
+    """
+    Adjust several cached counters in one pipelined round trip
+    
+    Args:
+        namespace: Cache namespace
+        keys: Keys within the namespace
+        amount: Increment applied to each (negative to decrement)
+    """
+    keys = list(keys)
+    if not keys:
+        return
+    try:
+        async with get_redis().pipeline(transaction=False) as pipe:
+            for key in keys:
+                pipe.eval(_INCR_IF_EXISTS, 1, _cache_key(namespace, key), amount)
+            await pipe.execute()
+    except RedisError as e:
+        logger.warning(f"Cache increment failed for {len(keys)} keys in {namespace}: {e}")
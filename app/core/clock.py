@@ -0,0 +1,13 @@
+"""Single source of "now" for timestamps"""
+
+from datetime import datetime, timezone
+
+
+def utcnow() -> datetime:
+    """
+    Current UTC time as a naive datetime
+    
+    Every timestamp column is TIMESTAMP WITHOUT TIME ZONE holding UTC, so
+    all writes and comparisons go through this one clock.
+    """
+    return datetime.now(timezone.utc).replace(tzinfo=None)
@@ -1,7 +1,8 @@
 """Core configuration using Pydantic Settings"""
 
-from typing import List
-from pydantic_settings import BaseSettings
+from functools import lru_cache
+from typing import Any, FrozenSet
+from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import Field, field_validator
 import json
 
@@ -18,6 +19,16 @@ class Settings(BaseSettings):
     # Database
     DATABASE_URL: str
     DB_ECHO: bool = False
+    # Per-process pool; total connections = workers * (size + overflow)
+    DB_POOL_SIZE: int = Field(default=20, ge=1)
+    DB_MAX_OVERFLOW: int = Field(default=10, ge=0)
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+    # Celery worker pools, per task a worker process runs at once (one per
+    # prefork child, --concurrency for thread/green pools); each task holds
+    # one session, so overflow only absorbs reconnects and stragglers
+    WORKER_DB_POOL_SIZE: int = Field(default=1, ge=1)
+    WORKER_DB_MAX_OVERFLOW: int = Field(default=2, ge=0)
+    WORKER_DB_POOL_TIMEOUT_SECONDS: int = Field(default=10, ge=1)
     
     # Redis
     REDIS_URL: str
@@ -28,6 +39,9 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 15
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
     
+    # Password hashing (bcrypt cost factor; each +1 doubles hash time)
+    BCRYPT_ROUNDS: int = Field(default=12, ge=4, le=15)
+    
     # Celery
     CELERY_BROKER_URL: str
     CELERY_RESULT_BACKEND: str
@@ -40,26 +54,49 @@ class Settings(BaseSettings):
     SMTP_FROM_EMAIL: str
     SMTP_FROM_NAME: str = "Online Quiz System"
     
-    # CORS - Store as List[str] 
-    BACKEND_CORS_ORIGINS: List[str] = ["http://localhost:3000", "http://localhost:8000"]
+    # CORS - frozenset so the middleware's per-request origin check is O(1)
+    BACKEND_CORS_ORIGINS: FrozenSet[str] = frozenset(
+        {"http://localhost:3000", "http://localhost:8000"}
+    )
     
     @field_validator("BACKEND_CORS_ORIGINS", mode="before")
     @classmethod
     def parse_cors_origins(cls, v):
-        """Parse CORS origins from JSON string or return list directly"""
+        """Parse CORS origins from JSON string or return list directly (coerced to frozenset)"""
         if isinstance(v, str):
-            try:
-                return json.loads(v)
-            except json.JSONDecodeError:
-                # Fallback: split by comma
-                return [origin.strip() for origin in v.split(",")]
+            stripped = v.lstrip()
+            if stripped.startswith("["):
+                return json.loads(stripped)
+            # Comma-separated list
+            return [origin.strip() for origin in v.split(",") if origin.strip()]
         return v
     
-    class Config:
-        env_file = ".env"
-        env_file_encoding = "utf-8"
-        case_sensitive = True
+    model_config = SettingsConfigDict(
+        env_file=".env",
+        env_file_encoding="utf-8",
+        case_sensitive=True
+    )
+
 
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """
+    Load settings once, on first use
+    
+    Modules bind the instance at import (`from app.core.config import
+    settings`), so get_settings.cache_clear() does not reach them; tests
+    change values on the shared instance instead (see conftest).
+    """
+    return Settings()
 
-# Global settings instance
-settings = Settings()
+
+def __getattr__(name: str) -> Any:
+    """
+    Resolve the module-level `settings` lazily (PEP 562)
+    
+    `from app.core.config import settings` keeps working, but .env parsing
+    and validation only happen when something actually asks for settings.
+    """
+    if name == "settings":
+        return get_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,6 +1,7 @@
 """Custom exceptions for the application"""
 
-from typing import Any, Optional, Dict
+from types import MappingProxyType
+from typing import Any, ClassVar, Mapping, Optional, Dict
 
 
 class CustomException(Exception):
@@ -10,9 +11,13 @@ class CustomException(Exception):
     error_code: str = "INTERNAL_SERVER_ERROR"
     message: str = "An internal server error occurred"
     
+    # Shared read-only default so raising without details allocates nothing
+    _EMPTY_DETAILS: ClassVar[Mapping[str, Any]] = MappingProxyType({})
+    
     def __init__(self, message: Optional[str] = None, details: Optional[Dict[str, Any]] = None):
-        self.message = message or self.message
-        self.details = details or {}
+        if message:
+            self.message = message
+        self.details: Mapping[str, Any] = details if details else self._EMPTY_DETAILS
         super().__init__(self.message)
 
 
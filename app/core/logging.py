@@ -1,8 +1,10 @@
 """Structured logging configuration"""
 
 import logging
+import queue
 import sys
-from typing import Any
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Optional
 from datetime import datetime
 
 
@@ -26,25 +28,41 @@ class CustomFormatter(logging.Formatter):
             logging.ERROR: self.red + self.fmt + self.reset,
             logging.CRITICAL: self.bold_red + self.fmt + self.reset
         }
+        # One Formatter per level, built once instead of per record
+        self._formatters = {
+            levelno: logging.Formatter(log_fmt, datefmt="%Y-%m-%d %H:%M:%S")
+            for levelno, log_fmt in self.FORMATS.items()
+        }
+        self._default_formatter = logging.Formatter(self.fmt, datefmt="%Y-%m-%d %H:%M:%S")
     
     def format(self, record: logging.LogRecord) -> str:
-        log_fmt = self.FORMATS.get(record.levelno)
-        formatter = logging.Formatter(log_fmt, datefmt="%Y-%m-%d %H:%M:%S")
+        formatter = self._formatters.get(record.levelno, self._default_formatter)
         return formatter.format(record)
 
 
+# Background thread that writes queued records to the console
+_listener: Optional[QueueListener] = None
+
+
 def setup_logging(level: str = "INFO") -> None:
     """
     Configure application logging
     
+    Records are put on an in-memory queue by the calling thread and written
+    to stdout by a QueueListener thread, so logging never blocks a request
+    on a console write.
+    
     Args:
         level: Logging level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
     """
+    global _listener
+    
     # Create logger
     logger = logging.getLogger()
     logger.setLevel(getattr(logging, level.upper()))
     
     # Remove existing handlers
+    stop_logging()
     logger.handlers.clear()
     
     # Console handler with custom formatter
@@ -54,13 +72,24 @@ def setup_logging(level: str = "INFO") -> None:
     fmt = "%(asctime)s | %(levelname)-8s | %(name)s:%(funcName)s:%(lineno)d - %(message)s"
     console_handler.setFormatter(CustomFormatter(fmt))
     
-    logger.addHandler(console_handler)
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    logger.addHandler(QueueHandler(log_queue))
+    _listener = QueueListener(log_queue, console_handler, respect_handler_level=True)
+    _listener.start()
     
     # Reduce noise from third-party libraries
     logging.getLogger("uvicorn.access").setLevel(logging.WARNING)
     logging.getLogger("sqlalchemy.engine").setLevel(logging.WARNING)
 
 
+def stop_logging() -> None:
+    """Flush queued records and stop the listener thread"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
 def get_logger(name: str) -> logging.Logger:
     """
     Get a logger instance
@@ -0,0 +1,88 @@
+"""ASGI middleware"""
+
+import hashlib
+from typing import List, Tuple
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+def _header(headers: List[Tuple[bytes, bytes]], name: bytes) -> bytes:
+    """Get a header value from raw ASGI headers (b"" if absent)"""
+    for key, value in headers:
+        if key.lower() == name:
+            return value
+    return b""
+
+
+def _etag_matches(if_none_match: bytes, etag: bytes) -> bool:
+    """Weak If-None-Match comparison against our (strong) ETag"""
+    for candidate in if_none_match.split(b","):
+        candidate = candidate.strip()
+        if candidate == b"*" or candidate.removeprefix(b"W/") == etag:
+            return True
+    return False
+
+
+class ETagMiddleware:
+    """
+    Add ETags to successful JSON GET responses and answer 304 on a match
+    
+    The ETag hashes the body computed for this request, so per-user
+    responses stay correct; Cache-Control marks them private so shared
+    caches never store them. Other responses (streams, errors, writes)
+    pass through untouched.
+    """
+    
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] != "GET":
+            await self.app(scope, receive, send)
+            return
+        
+        if_none_match = _header(scope["headers"], b"if-none-match")
+        start: Message = {}
+        body: List[bytes] = []
+        passthrough = False
+        
+        async def send_wrapper(message: Message) -> None:
+            nonlocal start, passthrough
+            if message["type"] == "http.response.start":
+                headers = message.get("headers", [])
+                passthrough = (
+                    message["status"] != 200
+                    or not _header(headers, b"content-type").startswith(b"application/json")
+                    or bool(_header(headers, b"etag"))
+                )
+                if passthrough:
+                    await send(message)
+                else:
+                    start = message
+                return
+            
+            if passthrough or message["type"] != "http.response.body":
+                await send(message)
+                return
+            
+            body.append(message.get("body", b""))
+            if message.get("more_body", False):
+                return
+            
+            content = b"".join(body)
+            etag = b'"' + hashlib.blake2b(content, digest_size=16).hexdigest().encode() + b'"'
+            caching = [(b"etag", etag), (b"cache-control", b"private, no-cache")]
+            
+            if if_none_match and _etag_matches(if_none_match, etag):
+                headers = [
+                    (key, value) for key, value in start.get("headers", [])
+                    if key.lower() not in (b"content-length", b"content-type")
+                ]
+                await send({"type": "http.response.start", "status": 304, "headers": headers + caching})
+                await send({"type": "http.response.body", "body": b""})
+                return
+            
+            start["headers"] = list(start.get("headers", [])) + caching
+            await send(start)
+            await send({"type": "http.response.body", "body": content})
+        
+        await self.app(scope, receive, send_wrapper)
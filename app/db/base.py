@@ -3,8 +3,12 @@
 from datetime import datetime
 from typing import Optional, List
 from uuid import UUID, uuid4
+from uuid_extensions import uuid7  # time-ordered ids for high-insert tables
 from sqlmodel import SQLModel, Field, Relationship, Column, JSON
+from sqlalchemy import Index, LargeBinary, UniqueConstraint, text
+from sqlalchemy.dialects.postgresql import JSONB
 from app.domain.enums import UserRole, QuestionType, AttemptStatus
+from app.core.clock import utcnow
 
 
 class User(SQLModel, table=True):
@@ -18,8 +22,10 @@ class User(SQLModel, table=True):
     hashed_password: str = Field(max_length=255)
     role: UserRole = Field(default=UserRole.USER)
     is_active: bool = Field(default=True)
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    # Tokens issued (iat) before this instant are rejected; set on logout
+    token_invalidated_at: Optional[datetime] = Field(default=None)
+    created_at: datetime = Field(default_factory=utcnow)
+    updated_at: datetime = Field(default_factory=utcnow, sa_column_kwargs={"onupdate": utcnow})
     
     # Relationships
     quizzes: List["Quiz"] = Relationship(back_populates="creator")
@@ -49,8 +55,8 @@ class Quiz(SQLModel, table=True):
     randomize_options: bool = Field(default=False)
     max_attempts: Optional[int] = Field(default=None, ge=1)
     created_by: UUID = Field(foreign_key="users.id")
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=utcnow)
+    updated_at: datetime = Field(default_factory=utcnow, sa_column_kwargs={"onupdate": utcnow})
     
     # Relationships
     creator: User = Relationship(back_populates="quizzes")
@@ -72,11 +78,19 @@ class Question(SQLModel, table=True):
     quiz_id: UUID = Field(foreign_key="quizzes.id")
     question_text: str
     question_type: QuestionType
-    options: List[str] = Field(sa_column=Column(JSON))  # JSON list of options
+    # JSON list of options; JSONB on PostgreSQL (binary, no re-parse on read).
+    # NULL for TRUE_FALSE questions, whose options are fixed
+    options: Optional[List[str]] = Field(
+        default=None,
+        sa_column=Column(
+            JSON(none_as_null=True).with_variant(JSONB(none_as_null=True), "postgresql"),
+            nullable=True
+        )
+    )
     correct_answer: str = Field()  # Stored as string (for MCQ: option text, for T/F: "true" or "false")
     points: int = Field(default=1, gt=0)
     order: int = Field(ge=0)
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=utcnow)
     
     # Relationships
     quiz: Quiz = Relationship(back_populates="questions")
@@ -87,21 +101,55 @@ class Attempt(SQLModel, table=True):
     """Quiz attempt model with timing"""
     
     __tablename__ = "attempts"
+    __table_args__ = (
+        # Serves "in-progress attempts for a user"; also covers user_id alone
+        Index("ix_attempts_user_status", "user_id", "status"),
+        # Partial indexes over in-progress attempts only (enum stored by name)
+        Index(
+            "ix_attempts_user_quiz_in_progress",
+            "user_id", "quiz_id",
+            postgresql_where=text("status = 'IN_PROGRESS'")
+        ),
+        Index(
+            "ix_attempts_expires_at_in_progress",
+            "expires_at",
+            postgresql_where=text("status = 'IN_PROGRESS'")
+        ),
+        # Expired attempts whose scoring task has not run yet (recovery sweep)
+        Index(
+            "ix_attempts_expires_at_expired_unscored",
+            "expires_at",
+            postgresql_where=text("status = 'EXPIRED' AND NOT is_submitted")
+        ),
+        # Deferred submissions whose grading task has not run yet (recovery sweep)
+        Index(
+            "ix_attempts_submitted_at_ungraded",
+            "submitted_at",
+            postgresql_where=text("status = 'SUBMITTED' AND time_taken_seconds IS NULL")
+        ),
+    )
     
-    id: UUID = Field(default_factory=uuid4, primary_key=True)
+    id: UUID = Field(default_factory=uuid7, primary_key=True)
     quiz_id: UUID = Field(foreign_key="quizzes.id", index=True)
-    user_id: UUID = Field(foreign_key="users.id", index=True)
-    started_at: datetime = Field(default_factory=datetime.utcnow)
+    user_id: UUID = Field(foreign_key="users.id")
+    started_at: datetime = Field(default_factory=utcnow)
     expires_at: datetime
     submitted_at: Optional[datetime] = Field(default=None)
     is_submitted: bool = Field(default=False)
     time_taken_seconds: Optional[int] = Field(default=None)
     status: AttemptStatus = Field(default=AttemptStatus.IN_PROGRESS, index=True)
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=utcnow)
     
     # Relationships
-    quiz: Quiz = Relationship(back_populates="attempts")
-    user: User = Relationship(back_populates="attempts")
+    # Many-to-one links must be eager-loaded explicitly; lazy loads raise
+    quiz: Quiz = Relationship(
+        back_populates="attempts",
+        sa_relationship_kwargs={"lazy": "raise"}
+    )
+    user: User = Relationship(
+        back_populates="attempts",
+        sa_relationship_kwargs={"lazy": "raise"}
+    )
     answers: List["Answer"] = Relationship(
         back_populates="attempt",
         sa_relationship_kwargs={"cascade": "all, delete-orphan"}
@@ -113,17 +161,24 @@ class Answer(SQLModel, table=True):
     """User's answer to a question"""
     
     __tablename__ = "answers"
+    __table_args__ = (
+        # One answer per question per attempt; target of the answer upsert
+        UniqueConstraint("attempt_id", "question_id", name="uq_answers_attempt_id_question_id"),
+    )
     
-    id: UUID = Field(default_factory=uuid4, primary_key=True)
-    attempt_id: UUID = Field(foreign_key="attempts.id", index=True)
+    id: UUID = Field(default_factory=uuid7, primary_key=True)
+    attempt_id: UUID = Field(foreign_key="attempts.id")
     question_id: UUID = Field(foreign_key="questions.id", index=True)
     selected_answer: str  # User's selected option
     is_correct: Optional[bool] = Field(default=None)
-    answered_at: datetime = Field(default_factory=datetime.utcnow)
+    answered_at: datetime = Field(default_factory=utcnow)
     
     # Relationships
     attempt: Attempt = Relationship(back_populates="answers")
-    question: Question = Relationship(back_populates="answers")
+    question: Question = Relationship(
+        back_populates="answers",
+        sa_relationship_kwargs={"lazy": "raise"}
+    )
 
 
 class Result(SQLModel, table=True):
@@ -131,7 +186,7 @@ class Result(SQLModel, table=True):
     
     __tablename__ = "results"
     
-    id: UUID = Field(default_factory=uuid4, primary_key=True)
+    id: UUID = Field(default_factory=uuid7, primary_key=True)
     attempt_id: UUID = Field(foreign_key="attempts.id", unique=True, index=True)
     user_id: UUID = Field(foreign_key="users.id", index=True)
     quiz_id: UUID = Field(foreign_key="quizzes.id", index=True)
@@ -140,12 +195,18 @@ class Result(SQLModel, table=True):
     percentage: float = Field(ge=0.0, le=100.0)
     passed: bool
     rank: Optional[int] = Field(default=None)
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=utcnow)
     
     # Relationships
     attempt: Attempt = Relationship(back_populates="result")
-    user: User = Relationship(back_populates="results")
-    quiz: Quiz = Relationship(back_populates="results")
+    user: User = Relationship(
+        back_populates="results",
+        sa_relationship_kwargs={"lazy": "raise"}
+    )
+    quiz: Quiz = Relationship(
+        back_populates="results",
+        sa_relationship_kwargs={"lazy": "raise"}
+    )
 
 
 class RefreshToken(SQLModel, table=True):
@@ -153,12 +214,15 @@ class RefreshToken(SQLModel, table=True):
     
     __tablename__ = "refresh_tokens"
     
-    id: UUID = Field(default_factory=uuid4, primary_key=True)
+    id: UUID = Field(default_factory=uuid7, primary_key=True)
     user_id: UUID = Field(foreign_key="users.id", index=True)
-    token_hash: str = Field(unique=True, index=True, max_length=64)  # SHA-256 hash
+    # Raw 32-byte SHA-256 digest (half the size of hex in the unique index)
+    token_hash: bytes = Field(
+        sa_column=Column(LargeBinary, unique=True, index=True, nullable=False)
+    )
     expires_at: datetime
     is_revoked: bool = Field(default=False, index=True)
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=utcnow)
     
     # Relationships
     user: User = Relationship(back_populates="refresh_tokens")
@@ -171,12 +235,15 @@ class QuizAssignment(SQLModel, table=True):
     """
     
     __tablename__ = "quiz_assignments"
+    __table_args__ = (
+        UniqueConstraint("quiz_id", "user_id", name="uq_quiz_assignments_quiz_id_user_id"),
+    )
     
     id: UUID = Field(default_factory=uuid4, primary_key=True)
     quiz_id: UUID = Field(foreign_key="quizzes.id", index=True)
     user_id: UUID = Field(foreign_key="users.id", index=True)
     assigned_by: UUID = Field(foreign_key="users.id")  # Admin who assigned
-    assigned_at: datetime = Field(default_factory=datetime.utcnow)
+    assigned_at: datetime = Field(default_factory=utcnow)
     due_date: Optional[datetime] = Field(default=None)  # Optional deadline
     is_active: bool = Field(default=True)
     
@@ -194,8 +261,27 @@ class Notification(SQLModel, table=True):
     """
     
     __tablename__ = "notifications"
+    __table_args__ = (
+        # Partial index for the unread listing, newest first
+        Index(
+            "ix_notifications_user_unread_created",
+            "user_id", "is_read", "created_at",
+            postgresql_where=text("is_read = false")
+        ),
+        # Full listing in keyset order: (created_at, id) seeks per user
+        Index("ix_notifications_user_created_id", "user_id", "created_at", "id"),
+        # One "quiz published" notification per user and quiz, so retried
+        # fan-outs are no-ops (partial on sqlite too: other types may repeat)
+        Index(
+            "uq_notifications_user_quiz_published",
+            "user_id", "quiz_id",
+            unique=True,
+            postgresql_where=text("type = 'quiz_published'"),
+            sqlite_where=text("type = 'quiz_published'")
+        ),
+    )
     
-    id: UUID = Field(default_factory=uuid4, primary_key=True)
+    id: UUID = Field(default_factory=uuid7, primary_key=True)
     user_id: UUID = Field(foreign_key="users.id", index=True)
     
     # Notification content
@@ -213,7 +299,7 @@ class Notification(SQLModel, table=True):
     read_at: Optional[datetime] = Field(default=None)
     
     # Timestamps
-    created_at: datetime = Field(default_factory=datetime.utcnow, index=True)
+    created_at: datetime = Field(default_factory=utcnow, index=True)
     
     # Relationships
     user: User = Relationship(back_populates="notifications")
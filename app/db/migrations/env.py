@@ -15,20 +15,9 @@ from alembic import context
 project_root = Path(__file__).resolve().parents[3]
 sys.path.insert(0, str(project_root))
 
-from app.core.config import settings
-
-# Import ALL models so Alembic can detect schema changes
-from app.db.base import (
-    User,
-    Quiz,
-    Question,
-    Attempt,
-    Answer,
-    Result,
-    RefreshToken,
-    QuizAssignment,
-    Notification,  # Added Notification model
-)
+from app.core.config import get_settings
+
+settings = get_settings()
 
 # this is the Alembic Config object
 config = context.config
@@ -37,19 +26,27 @@ config = context.config
 if config.config_file_name is not None:
     fileConfig(config.config_file_name)
 
-# Use SQLModel.metadata as target for autogenerate
-target_metadata = SQLModel.metadata
-
 # Override sqlalchemy.url from settings
 config.set_main_option("sqlalchemy.url", settings.DATABASE_URL)
 
 
+def get_target_metadata():
+    """
+    Import ALL models so Alembic can detect schema changes
+    
+    Deferred until a migration context is configured, so loading env.py
+    itself stays cheap.
+    """
+    import app.db.base  # noqa: F401  (registers every table on SQLModel.metadata)
+    return SQLModel.metadata
+
+
 def run_migrations_offline() -> None:
     """Run migrations in 'offline' mode."""
     url = config.get_main_option("sqlalchemy.url")
     context.configure(
         url=url,
-        target_metadata=target_metadata,
+        target_metadata=get_target_metadata(),
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
         compare_type=True,
@@ -64,7 +61,7 @@ def do_run_migrations(connection: Connection) -> None:
     """Run migrations in connection context."""
     context.configure(
         connection=connection,
-        target_metadata=target_metadata,
+        target_metadata=get_target_metadata(),
         compare_type=True,
         compare_server_default=True,
     )
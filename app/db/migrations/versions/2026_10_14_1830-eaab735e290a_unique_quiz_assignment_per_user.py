@@ -0,0 +1,43 @@
+"""Unique quiz assignment per user
+
+Revision ID: eaab735e290a
+Revises: c501ce4cb399
+Create Date: 2026-10-14 18:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision = 'eaab735e290a'
+down_revision = 'c501ce4cb399'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Keep the most recent assignment per (quiz_id, user_id) before adding the constraint
+    op.execute(
+        """
+        DELETE FROM quiz_assignments a
+        USING quiz_assignments b
+        WHERE a.quiz_id = b.quiz_id
+          AND a.user_id = b.user_id
+          AND (a.assigned_at, a.id) < (b.assigned_at, b.id)
+        """
+    )
+    op.create_unique_constraint(
+        'uq_quiz_assignments_quiz_id_user_id',
+        'quiz_assignments',
+        ['quiz_id', 'user_id']
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint(
+        'uq_quiz_assignments_quiz_id_user_id',
+        'quiz_assignments',
+        type_='unique'
+    )
@@ -0,0 +1,29 @@
+"""Stop storing options for true/false questions
+
+Revision ID: 7e4a2b9c5d13
+Revises: 3c8f1e5a7b92
+Create Date: 2026-10-14 20:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision = '7e4a2b9c5d13'
+down_revision = '3c8f1e5a7b92'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # TRUE_FALSE options are fixed (see TRUE_FALSE_OPTIONS); the API fills them in
+    op.execute("UPDATE questions SET options = NULL WHERE question_type = 'TRUE_FALSE'")
+
+
+def downgrade() -> None:
+    op.execute(
+        "UPDATE questions SET options = '[\"true\", \"false\"]' "
+        "WHERE question_type = 'TRUE_FALSE' AND options IS NULL"
+    )
@@ -1,7 +1,9 @@
 """Database session configuration"""
 
+import asyncio
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.orm import declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from app.core.config import settings
 from typing import AsyncGenerator
 
@@ -10,9 +12,22 @@ engine = create_async_engine(
     settings.DATABASE_URL,
     echo=settings.DB_ECHO,
     future=True,
-    pool_pre_ping=True,  # Verify connections before using
-    pool_size=20,
-    max_overflow=10
+    # The asyncio-aware queue pool (a plain QueuePool blocks the event loop)
+    poolclass=AsyncAdaptedQueuePool,
+    # No SELECT 1 per checkout; connections are recycled before server or
+    # proxy idle timeouts, and a disconnect error invalidates the whole pool
+    pool_pre_ping=False,
+    pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    connect_args={
+        # Short OLTP queries never benefit from JIT compilation
+        "server_settings": {"jit": "off"},
+        # asyncpg's per-connection server-side statement cache and the
+        # dialect's prepared-statement LRU: repeat queries skip re-parsing
+        "statement_cache_size": 1024,
+        "prepared_statement_cache_size": 1024
+    }
 )
 
 # Create async session factory
@@ -29,6 +44,11 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """
     Dependency for getting database session
     
+    FastAPI caches this dependency per request, so every repository built
+    for a request shares this one session. The session checks out a pooled
+    connection lazily on its first statement and hands it back on commit,
+    so requests that never hit the database never hold a connection.
+    
     Yields:
         Database session
     """
@@ -48,6 +68,32 @@ async def init_db() -> None:
         await conn.run_sync(SQLModel.metadata.create_all)
 
 
+async def warm_pool() -> int:
+    """
+    Open pool_size connections concurrently and return them to the pool
+    
+    Holding them all at once forces the pool to grow to its full size, so
+    the first requests after startup don't pay connect and auth round trips.
+    
+    Returns:
+        Number of connections opened
+        
+    Raises:
+        Exception: The first connection error, after the others are released
+    """
+    results = await asyncio.gather(
+        *(engine.connect() for _ in range(engine.pool.size())),
+        return_exceptions=True
+    )
+    opened = [conn for conn in results if not isinstance(conn, BaseException)]
+    await asyncio.gather(*(conn.close() for conn in opened))
+    
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
+    return len(opened)
+
+
 async def close_db() -> None:
     """Close database connections"""
     await engine.dispose()
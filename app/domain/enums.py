@@ -15,6 +15,10 @@ class QuestionType(str, Enum):
     TRUE_FALSE = "true_false"
 
 
+# True/false questions always offer these; they are not stored per question
+TRUE_FALSE_OPTIONS = ("true", "false")
+
+
 class AttemptStatus(str, Enum):
     """Quiz attempt statuses"""
     IN_PROGRESS = "in_progress"
@@ -1,25 +1,46 @@
 """FastAPI main application"""
 
 from fastapi import FastAPI, Request, status
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
+import itertools
+import logging
+import orjson
 from app.core.config import settings
-from app.core.logging import setup_logging
+from app.core.logging import setup_logging, stop_logging
 from app.core.exceptions import CustomException
-from app.db.session import init_db, close_db
+from app.core.cache import close_redis
+from app.core.middleware import ETagMiddleware
+from app.core.security import calibrate_bcrypt
+from app.db.session import init_db, close_db, warm_pool
 from app.api.v1.routers import auth, quizzes, attempts, results, leaderboard, notifications
 
+logger = logging.getLogger(__name__)
+
+# Log the traceback for 1 in N unhandled exceptions (the rest get one line)
+UNHANDLED_TRACEBACK_SAMPLE_RATE = 10
+_unhandled_exception_count = itertools.count()
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Lifespan context manager for startup and shutdown events"""
     # Startup
     setup_logging(level="INFO")
+    calibrate_bcrypt()
+    try:
+        opened = await warm_pool()
+        logger.info(f"Database pool warmed with {opened} connections")
+    except Exception as e:
+        # Not fatal: connections are opened on demand once the DB is reachable
+        logger.warning(f"Database pool warmup failed: {e}")
     # await init_db()  # Uncomment if you want to create tables automatically
     yield
     # Shutdown
     await close_db()
+    await close_redis()
+    stop_logging()
 
 
 # Create FastAPI app
@@ -29,6 +50,7 @@ app = FastAPI(
     description="Production-ready Online Quiz System API",
     docs_url="/docs",
     redoc_url="/redoc",
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
@@ -41,18 +63,21 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Conditional GETs: unchanged JSON bodies are answered with 304
+app.add_middleware(ETagMiddleware)
+
 
 # Global exception handler for custom exceptions
 @app.exception_handler(CustomException)
 async def custom_exception_handler(request: Request, exc: CustomException):
     """Handle custom exceptions and return consistent error response"""
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=exc.status_code,
         content={
             "error": {
                 "code": exc.error_code,
                 "message": exc.message,
-                "details": exc.details
+                "details": dict(exc.details)
             }
         }
     )
@@ -62,10 +87,16 @@ async def custom_exception_handler(request: Request, exc: CustomException):
 @app.exception_handler(Exception)
 async def general_exception_handler(request: Request, exc: Exception):
     """Handle unhandled exceptions"""
-    import traceback
-    traceback.print_exc()
+    # Full tracebacks are formatted on the event loop, so sample them
+    if next(_unhandled_exception_count) % UNHANDLED_TRACEBACK_SAMPLE_RATE == 0:
+        logger.exception("Unhandled exception", extra={"path": request.url.path})
+    else:
+        logger.error(
+            f"Unhandled exception: {type(exc).__name__}: {exc}",
+            extra={"path": request.url.path}
+        )
     
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
         content={
             "error": {
@@ -78,14 +109,25 @@ async def general_exception_handler(request: Request, exc: Exception):
 
 
 # Health check endpoint
+# Probes hit /health and / constantly and their bodies never change, so
+# they are encoded once and served as-is (no encoder pass per request)
+_HEALTH_BODY = orjson.dumps({
+    "status": "healthy",
+    "service": settings.PROJECT_NAME,
+    "version": settings.VERSION
+})
+_ROOT_BODY = orjson.dumps({
+    "message": f"Welcome to {settings.PROJECT_NAME}",
+    "version": settings.VERSION,
+    "docs": "/docs",
+    "health": "/health"
+})
+
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
-    return {
-        "status": "healthy",
-        "service": settings.PROJECT_NAME,
-        "version": settings.VERSION
-    }
+    return Response(content=_HEALTH_BODY, media_type="application/json")
 
 
 # Include routers
@@ -101,12 +143,7 @@ app.include_router(notifications.router, prefix=settings.API_V1_PREFIX)
 @app.get("/")
 async def root():
     """Root endpoint"""
-    return {
-        "message": f"Welcome to {settings.PROJECT_NAME}",
-        "version": settings.VERSION,
-        "docs": "/docs",
-        "health": "/health"
-    }
+    return Response(content=_ROOT_BODY, media_type="application/json")
 
 
 if __name__ == "__main__":
@@ -115,5 +152,7 @@ if __name__ == "__main__":
         "app.main:app",
         host="0.0.0.0",
         port=8000,
+        loop="uvloop",
+        http="httptools",
         reload=True
     )
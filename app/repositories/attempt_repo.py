@@ -1,18 +1,24 @@
 """Attempt repository for database operations"""
 
-from typing import Optional, List
+from typing import Dict, Optional, Sequence, Tuple
 from uuid import UUID
 from datetime import datetime
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_
+from sqlalchemy import Row, select, update, and_, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import selectinload
-from app.db.base import Attempt, Answer
+from sqlalchemy.orm.attributes import set_committed_value
+from uuid_extensions import uuid7
+from app.db.base import Attempt, Answer, Result
 from app.domain.enums import AttemptStatus
+from app.core.clock import utcnow
 
 
 class AttemptRepository:
     """Repository for Attempt entity operations"""
     
+    __slots__ = ("session",)
+    
     def __init__(self, session: AsyncSession):
         self.session = session
     
@@ -31,116 +37,273 @@ class AttemptRepository:
         )
         self.session.add(attempt)
         await self.session.commit()
-        await self.session.refresh(attempt)
         return attempt
     
-    async def get_by_id(self, attempt_id: UUID, include_answers: bool = True) -> Optional[Attempt]:
-        """Get attempt by ID"""
+    async def get_by_id(
+        self,
+        attempt_id: UUID,
+        include_answers: bool = True,
+        user_id: Optional[UUID] = None
+    ) -> Optional[Attempt]:
+        """Get attempt by ID, optionally restricted to its owner"""
         query = select(Attempt).where(Attempt.id == attempt_id)
         
+        if user_id is not None:
+            query = query.where(Attempt.user_id == user_id)
+        
         if include_answers:
             query = query.options(selectinload(Attempt.answers))
         
         result = await self.session.execute(query)
         return result.scalar_one_or_none()
     
-    async def get_for_update(self, attempt_id: UUID) -> Optional[Attempt]:
-        """Get attempt with row lock for update (prevents race conditions)"""
+    async def get_for_update(
+        self,
+        attempt_id: UUID,
+        user_id: Optional[UUID] = None,
+        include_answers: bool = False
+    ) -> Optional[Attempt]:
+        """
+        Get attempt with row lock for update (prevents race conditions)
+        
+        populate_existing makes the locked read overwrite a copy already in
+        the session, so checks run against the current row.
+        """
+        query = select(Attempt).where(Attempt.id == attempt_id)
+        
+        if user_id is not None:
+            query = query.where(Attempt.user_id == user_id)
+        
+        if include_answers:
+            query = query.options(selectinload(Attempt.answers))
+        
         result = await self.session.execute(
-            select(Attempt)
-            .where(Attempt.id == attempt_id)
-            .with_for_update()
+            query.with_for_update(), execution_options={"populate_existing": True}
         )
         return result.scalar_one_or_none()
     
-    async def get_active_attempt(self, user_id: UUID, quiz_id: UUID) -> Optional[Attempt]:
-        """Get active attempt for a user and quiz"""
-        result = await self.session.execute(
-            select(Attempt).where(
-                and_(
-                    Attempt.user_id == user_id,
-                    Attempt.quiz_id == quiz_id,
-                    Attempt.status == AttemptStatus.IN_PROGRESS
-                )
-            )
-        )
-        return result.scalar_one_or_none()
-    
-    async def count_user_attempts(self, user_id: UUID, quiz_id: UUID) -> int:
-        """Count total attempts by user for a quiz"""
-        result = await self.session.execute(
-            select(Attempt).where(
-                and_(
-                    Attempt.user_id == user_id,
-                    Attempt.quiz_id == quiz_id
-                )
-            )
+    async def get_attempt_summary(self, user_id: UUID, quiz_id: UUID) -> Tuple[Optional[UUID], int]:
+        """
+        Get a user's in-progress attempt and total attempt count for a quiz
+        in one round trip
+        
+        Returns:
+            (ID of the in-progress attempt or None, total attempt count)
+        """
+        same_quiz = and_(Attempt.user_id == user_id, Attempt.quiz_id == quiz_id)
+        stmt = select(
+            select(Attempt.id)
+            .where(same_quiz, Attempt.status == AttemptStatus.IN_PROGRESS)
+            .limit(1)
+            .scalar_subquery(),
+            select(func.count()).select_from(Attempt).where(same_quiz).scalar_subquery()
         )
-        return len(list(result.scalars().all()))
+        active_id, count = (await self.session.execute(stmt)).one()
+        return active_id, count or 0
     
-    async def update(self, attempt: Attempt) -> Attempt:
-        """Update attempt"""
+    async def mark_submitted(self, attempt: Attempt, submitted_at: datetime) -> Attempt:
+        """
+        Close an attempt for deferred grading before its result exists
+        
+        The attempt stops accepting answers and leaves IN_PROGRESS, so the
+        expiry job skips it; finalize_attempt later adds the result. Call it
+        on a row locked by get_for_update.
+        """
+        attempt.is_submitted = True
+        attempt.submitted_at = submitted_at
+        attempt.status = AttemptStatus.SUBMITTED
         self.session.add(attempt)
         await self.session.commit()
-        await self.session.refresh(attempt)
         return attempt
     
+    async def finalize_attempt(
+        self,
+        attempt: Attempt,
+        score: int,
+        total_points: int,
+        percentage: float,
+        passed: bool,
+        submitted_at: datetime,
+        time_taken_seconds: int,
+        graded: Dict[UUID, bool]
+    ) -> Result:
+        """
+        Mark an attempt submitted and create its result in one commit
+        
+        Answer correctness is written with at most two set-based UPDATEs
+        (correct / incorrect ids), then the result INSERT and the attempt
+        UPDATE are flushed in the same transaction that holds the
+        get_for_update row lock. An attempt already marked EXPIRED by
+        expire_overdue_attempts keeps that status; only an in-progress one
+        moves to SUBMITTED.
+        
+        Args:
+            graded: answer_id -> is_correct from ScoringService.calculate_score
+        
+        Returns:
+            Created result
+        """
+        for is_correct in (True, False):
+            answer_ids = [answer_id for answer_id, value in graded.items() if value is is_correct]
+            if answer_ids:
+                await self.session.execute(
+                    update(Answer)
+                    .where(Answer.id.in_(answer_ids))
+                    .values(is_correct=is_correct)
+                    .execution_options(synchronize_session=False)
+                )
+        
+        # Keep loaded answers in step without making them dirty again
+        if "answers" in attempt.__dict__:
+            for answer in attempt.answers:
+                if answer.id in graded:
+                    set_committed_value(answer, "is_correct", graded[answer.id])
+        
+        result = Result(
+            attempt_id=attempt.id,
+            user_id=attempt.user_id,
+            quiz_id=attempt.quiz_id,
+            score=score,
+            total_points=total_points,
+            percentage=percentage,
+            passed=passed
+        )
+        attempt.is_submitted = True
+        attempt.submitted_at = submitted_at
+        attempt.time_taken_seconds = time_taken_seconds
+        if attempt.status == AttemptStatus.IN_PROGRESS:
+            attempt.status = AttemptStatus.SUBMITTED
+        self.session.add_all([attempt, result])
+        await self.session.commit()
+        return result
+    
     async def create_answer(
         self,
         attempt_id: UUID,
         question_id: UUID,
         selected_answer: str
     ) -> Answer:
-        """Create or update an answer"""
-        # Check if answer already exists
+        """
+        Create or update an answer in a single INSERT ... ON CONFLICT statement.
+        Re-answering a question overwrites the selection and answered_at.
+        """
+        answers = await self.upsert_answers(attempt_id, {question_id: selected_answer})
+        return answers[0]
+    
+    async def upsert_answers(
+        self,
+        attempt_id: UUID,
+        selections: Dict[UUID, str]
+    ) -> Sequence[Answer]:
+        """
+        Create or update several answers of an attempt in one multi-row
+        INSERT ... ON CONFLICT statement
+        
+        Args:
+            attempt_id: Attempt ID
+            selections: Question ID -> selected answer (one row per question)
+        
+        Returns:
+            Created/updated answers
+        """
+        answered_at = utcnow()
+        stmt = pg_insert(Answer).values([
+            {
+                "id": uuid7(),
+                "attempt_id": attempt_id,
+                "question_id": question_id,
+                "selected_answer": selected_answer,
+                "answered_at": answered_at
+            }
+            for question_id, selected_answer in selections.items()
+        ])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Answer.attempt_id, Answer.question_id],
+            set_={
+                "selected_answer": stmt.excluded.selected_answer,
+                "answered_at": stmt.excluded.answered_at
+            }
+        ).returning(Answer)
+        
+        # populate_existing: an Answer already in the session gets the new values
         result = await self.session.execute(
-            select(Answer).where(
-                and_(
-                    Answer.attempt_id == attempt_id,
-                    Answer.question_id == question_id
-                )
-            )
+            stmt, execution_options={"populate_existing": True}
         )
-        existing_answer = result.scalar_one_or_none()
-        
-        if existing_answer:
-            # Update existing answer
-            existing_answer.selected_answer = selected_answer
-            existing_answer.answered_at = datetime.utcnow()
-            self.session.add(existing_answer)
-            await self.session.commit()
-            await self.session.refresh(existing_answer)
-            return existing_answer
-        else:
-            # Create new answer
-            answer = Answer(
-                attempt_id=attempt_id,
-                question_id=question_id,
-                selected_answer=selected_answer
-            )
-            self.session.add(answer)
-            await self.session.commit()
-            await self.session.refresh(answer)
-            return answer
+        answers = result.scalars().all()
+        await self.session.commit()
+        return answers
     
-    async def get_answers(self, attempt_id: UUID) -> List[Answer]:
+    async def get_answers(self, attempt_id: UUID) -> Sequence[Answer]:
         """Get all answers for an attempt"""
         result = await self.session.execute(
             select(Answer)
             .where(Answer.attempt_id == attempt_id)
             .options(selectinload(Answer.question))
         )
-        return list(result.scalars().all())
+        return result.scalars().all()
     
-    async def get_expired_attempts(self) -> List[Attempt]:
-        """Get all expired but not submitted attempts"""
-        now = datetime.utcnow()
+    async def expire_overdue_attempts(self) -> Sequence[Row]:
+        """
+        Mark every overdue in-progress attempt as expired in one UPDATE
+        
+        Returns:
+            (id, expires_at) rows of the attempts that were expired
+        """
         result = await self.session.execute(
-            select(Attempt).where(
+            update(Attempt)
+            .where(
                 and_(
-                    Attempt.expires_at < now,
+                    Attempt.expires_at < utcnow(),
                     Attempt.status == AttemptStatus.IN_PROGRESS
                 )
             )
+            .values(status=AttemptStatus.EXPIRED)
+            .returning(Attempt.id, Attempt.expires_at)
+            .execution_options(synchronize_session=False)
+        )
+        await self.session.commit()
+        return result.all()
+    
+    async def get_unscored_expired_attempts(self, expired_before: datetime) -> Sequence[Row]:
+        """
+        Get expired attempts that still have no result (their scoring task
+        was never run), served by the partial expired-unscored index
+        
+        Args:
+            expired_before: Only attempts whose deadline is older than this
+        
+        Returns:
+            (id, expires_at) rows
+        """
+        result = await self.session.execute(
+            select(Attempt.id, Attempt.expires_at).where(
+                and_(
+                    Attempt.status == AttemptStatus.EXPIRED,
+                    Attempt.is_submitted == False,
+                    Attempt.expires_at < expired_before
+                )
+            )
+        )
+        return result.all()
+    
+    async def get_ungraded_submitted_attempts(self, submitted_before: datetime) -> Sequence[Row]:
+        """
+        Get deferred submissions that are still ungraded (their grading
+        task was lost), served by the partial submitted-ungraded index
+        
+        Args:
+            submitted_before: Only attempts submitted before this
+        
+        Returns:
+            (id, user_id, submitted_at) rows
+        """
+        result = await self.session.execute(
+            select(Attempt.id, Attempt.user_id, Attempt.submitted_at).where(
+                and_(
+                    Attempt.status == AttemptStatus.SUBMITTED,
+                    Attempt.time_taken_seconds.is_(None),
+                    Attempt.submitted_at < submitted_before
+                )
+            )
         )
-        return list(result.scalars().all())
+        return result.all()
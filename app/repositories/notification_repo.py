@@ -1,16 +1,75 @@
 """Repository for notification data access"""
 
 from uuid import UUID
-from sqlmodel import select, and_
+from sqlmodel import select, and_, func
+from sqlalchemy import bindparam, insert, update, delete, false, literal, literal_column, text, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlmodel.ext.asyncio.session import AsyncSession
-from app.db.base import Notification
+from app.db.base import Notification, QuizAssignment, User
+from app.domain.notification_types import NotificationType
+from app.core.clock import utcnow
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import List, Optional, Tuple
+from uuid_extensions import uuid7
+
+
+def _page_stmt(unread_only: bool, keyset: bool):
+    """
+    Build the paged notification query with user_id/limit and either
+    offset or the (created_at, id) cursor as bind params.
+    Offset pages carry a count(*) OVER () total; keyset pages do not, since
+    counting every match would undo the seek.
+    """
+    columns = [Notification] if keyset else [Notification, func.count().over().label("total")]
+    stmt = select(*columns).where(Notification.user_id == bindparam("user_id"))
+    
+    if unread_only:
+        stmt = stmt.where(Notification.is_read == False)
+    
+    if keyset:
+        stmt = stmt.where(
+            tuple_(Notification.created_at, Notification.id) < tuple_(
+                bindparam("cursor_created_at", type_=Notification.__table__.c.created_at.type),
+                bindparam("cursor_id", type_=Notification.__table__.c.id.type)
+            )
+        )
+    
+    stmt = stmt.order_by(Notification.created_at.desc(), Notification.id.desc())
+    if not keyset:
+        stmt = stmt.offset(bindparam("offset"))
+    return stmt.limit(bindparam("limit"))
+
+
+# Built once so every poll reuses the same compiled statement;
+# keyed by (unread_only, keyset)
+_PAGE_STMTS = {
+    (unread_only, keyset): _page_stmt(unread_only, keyset)
+    for unread_only in (False, True)
+    for keyset in (False, True)
+}
+
+
+# Batches at least this large are written with COPY when running on asyncpg
+_COPY_THRESHOLD = 100
+
+# Rows per DELETE when purging old notifications
+_CLEANUP_BATCH_SIZE = 10000
+
+# Server-side UUIDv7 for INSERT ... SELECT rows (Postgres < 18 has no
+# uuidv7()): the millisecond timestamp overlaid on a random v4 UUID, with
+# the version nibble flipped from 4 to 7
+_PG_UUID7 = literal_column(
+    "encode(set_bit(set_bit(overlay(uuid_send(gen_random_uuid()) placing "
+    "substring(int8send(floor(extract(epoch from clock_timestamp()) * 1000)::bigint) from 3) "
+    "from 1 for 6), 52, 1), 53, 1), 'hex')::uuid"
+)
 
 
 class NotificationRepository:
     """Repository for notification data access."""
     
+    __slots__ = ("session",)
+    
     def __init__(self, session: AsyncSession) -> None:
         self.session = session
     
@@ -18,9 +77,137 @@ class NotificationRepository:
         """Create a new notification."""
         self.session.add(notification)
         await self.session.commit()
-        await self.session.refresh(notification)
         return notification
     
+    async def bulk_create(self, notifications: List[dict]) -> int:
+        """
+        Create many notifications in one multi-row INSERT (COPY on asyncpg
+        for large batches).
+        Each dict holds the same keys (user_id, type, title, message and
+        any related ids); returns the number of rows inserted.
+        """
+        if not notifications:
+            return 0
+        
+        # Core inserts skip SQLModel's default factories, so fill them here
+        now = utcnow()
+        rows = [
+            {"id": uuid7(), "is_read": False, "created_at": now, **n}
+            for n in notifications
+        ]
+        
+        conn = await self.session.connection()
+        if len(rows) >= _COPY_THRESHOLD and conn.dialect.driver == "asyncpg":
+            # COPY streams the rows without statement parameters; ids are
+            # generated here, so nothing needs to come back
+            columns = list(rows[0])
+            raw = await conn.get_raw_connection()
+            await raw.driver_connection.copy_records_to_table(
+                Notification.__tablename__,
+                records=[tuple(row[column] for column in columns) for row in rows],
+                columns=columns
+            )
+        else:
+            await self.session.execute(insert(Notification), rows)
+        await self.session.commit()
+        return len(rows)
+    
+    async def bulk_create_quiz_published(self, notifications: List[dict]) -> List[UUID]:
+        """
+        Create "quiz published" notifications, skipping users who already
+        have one for the quiz (INSERT ... ON CONFLICT DO NOTHING on the
+        partial unique index), so retries never duplicate them.
+        Returns the user ids that were actually notified.
+        """
+        if not notifications:
+            return []
+        
+        # executemany form: insertmanyvalues pages large cohorts under the
+        # driver's bind-parameter limit and still collects RETURNING rows
+        now = utcnow()
+        stmt = (
+            pg_insert(Notification)
+            .on_conflict_do_nothing(
+                index_elements=[Notification.user_id, Notification.quiz_id],
+                index_where=text("type = 'quiz_published'")
+            )
+            .returning(Notification.user_id)
+        )
+        result = await self.session.execute(stmt, [
+            {"id": uuid7(), "is_read": False, "created_at": now, **n}
+            for n in notifications
+        ])
+        user_ids = list(result.scalars().all())
+        await self.session.commit()
+        return user_ids
+    
+    async def create_quiz_published_for_assignees(
+        self,
+        quiz_id: UUID,
+        title: str,
+        message: str
+    ) -> List[UUID]:
+        """
+        Create "quiz published" notifications for every active user with an
+        active assignment to the quiz, skipping users already notified.
+        On Postgres this is one INSERT ... SELECT, so no user rows travel
+        to Python; other dialects select the ids and use
+        bulk_create_quiz_published.
+        Returns the user ids that were actually notified.
+        """
+        assignees = (
+            select(QuizAssignment.user_id)
+            .join(User, User.id == QuizAssignment.user_id)
+            .where(
+                and_(
+                    QuizAssignment.quiz_id == quiz_id,
+                    QuizAssignment.is_active == True,
+                    User.is_active == True
+                )
+            )
+        )
+        
+        conn = await self.session.connection()
+        if conn.dialect.name != "postgresql":
+            result = await self.session.execute(assignees)
+            return await self.bulk_create_quiz_published([
+                {
+                    "user_id": user_id,
+                    "type": NotificationType.QUIZ_PUBLISHED,
+                    "title": title,
+                    "message": message,
+                    "quiz_id": quiz_id
+                }
+                for user_id in result.scalars().all()
+            ])
+        
+        columns = Notification.__table__.c
+        rows = assignees.add_columns(
+            _PG_UUID7,
+            literal(NotificationType.QUIZ_PUBLISHED, columns.type.type),
+            literal(title, columns.title.type),
+            literal(message, columns.message.type),
+            literal(quiz_id, columns.quiz_id.type),
+            false(),
+            literal(utcnow(), columns.created_at.type)
+        )
+        stmt = (
+            pg_insert(Notification)
+            .from_select(
+                ["user_id", "id", "type", "title", "message", "quiz_id", "is_read", "created_at"],
+                rows
+            )
+            .on_conflict_do_nothing(
+                index_elements=[Notification.user_id, Notification.quiz_id],
+                index_where=text("type = 'quiz_published'")
+            )
+            .returning(Notification.user_id)
+        )
+        result = await self.session.execute(stmt)
+        user_ids = list(result.scalars().all())
+        await self.session.commit()
+        return user_ids
+    
     async def get_by_id(self, notification_id: UUID) -> Optional[Notification]:
         """Get notification by ID."""
         stmt = select(Notification).where(Notification.id == notification_id)
@@ -32,88 +219,139 @@ class NotificationRepository:
         user_id: UUID,
         limit: int = 50,
         offset: int = 0,
-        unread_only: bool = False
-    ) -> list[Notification]:
+        unread_only: bool = False,
+        cursor: Optional[Tuple[datetime, UUID]] = None
+    ) -> tuple[list[Notification], Optional[int]]:
         """
-        Get all notifications for a user.
-        Ordered by created_at descending (newest first).
+        Get a page of notifications for a user plus the total match count.
+        Ordered by (created_at, id) descending (newest first).
+        With a cursor - the (created_at, id) of the last row already seen -
+        the page seeks past it on the (user_id, created_at, id) index
+        instead of skipping offset rows, and the total is None.
+        Otherwise the total comes from a count(*) OVER () window in the
+        same query, so it is 0 when the offset is past the last row.
         """
-        stmt = select(Notification).where(Notification.user_id == user_id)
-        
-        if unread_only:
-            stmt = stmt.where(Notification.is_read == False)
-        
-        stmt = stmt.order_by(Notification.created_at.desc()).offset(offset).limit(limit)
+        if cursor is not None:
+            result = await self.session.execute(
+                _PAGE_STMTS[(unread_only, True)],
+                {
+                    "user_id": user_id,
+                    "cursor_created_at": cursor[0],
+                    "cursor_id": cursor[1],
+                    "limit": limit
+                }
+            )
+            return list(result.scalars().all()), None
         
-        result = await self.session.execute(stmt)
-        return list(result.scalars().all())
+        result = await self.session.execute(
+            _PAGE_STMTS[(unread_only, False)],
+            {"user_id": user_id, "offset": offset, "limit": limit}
+        )
+        rows = result.all()
+        total = rows[0].total if rows else 0
+        return [row.Notification for row in rows], total
     
     async def get_unread_count(self, user_id: UUID) -> int:
         """Get count of unread notifications for a user."""
-        stmt = select(Notification).where(
+        stmt = select(func.count()).select_from(Notification).where(
             and_(
                 Notification.user_id == user_id,
                 Notification.is_read == False
             )
         )
-        result = await self.session.execute(stmt)
-        return len(list(result.scalars().all()))
-    
-    async def mark_as_read(self, notification_id: UUID) -> Optional[Notification]:
-        """Mark a notification as read."""
-        notification = await self.get_by_id(notification_id)
-        if notification and not notification.is_read:
-            notification.is_read = True
-            notification.read_at = datetime.utcnow()
-            self.session.add(notification)
-            await self.session.commit()
-            await self.session.refresh(notification)
+        return (await self.session.scalar(stmt)) or 0
+    
+    async def mark_as_read(self, notification_id: UUID, user_id: UUID) -> Optional[Notification]:
+        """
+        Mark a user's unread notification as read (single UPDATE ... RETURNING).
+        Returns the notification, or None if no unread notification with
+        this id belongs to the user.
+        """
+        result = await self.session.execute(
+            update(Notification)
+            .where(
+                and_(
+                    Notification.id == notification_id,
+                    Notification.user_id == user_id,
+                    Notification.is_read == False
+                )
+            )
+            .values(is_read=True, read_at=utcnow())
+            .returning(Notification),
+            execution_options={"populate_existing": True}
+        )
+        notification = result.scalar_one_or_none()
+        await self.session.commit()
         return notification
     
     async def mark_all_as_read(self, user_id: UUID) -> int:
         """
-        Mark all notifications as read for a user.
+        Mark all notifications as read for a user (single UPDATE).
         Returns count of notifications marked.
         """
-        stmt = select(Notification).where(
-            and_(
-                Notification.user_id == user_id,
-                Notification.is_read == False
+        stmt = (
+            update(Notification)
+            .where(
+                and_(
+                    Notification.user_id == user_id,
+                    Notification.is_read == False
+                )
             )
+            .values(is_read=True, read_at=utcnow())
+            .execution_options(synchronize_session=False)
         )
         result = await self.session.execute(stmt)
-        notifications = list(result.scalars().all())
-        
-        for notification in notifications:
-            notification.is_read = True
-            notification.read_at = datetime.utcnow()
-            self.session.add(notification)
-        
         await self.session.commit()
-        return len(notifications)
+        return result.rowcount
     
     async def delete_old_notifications(self, days: int) -> int:
         """
-        Delete notifications older than specified days.
+        Delete notifications older than specified days, in committed
+        batches of _CLEANUP_BATCH_SIZE so no transaction holds many row
+        locks or a long-running snapshot.
         Returns count of deleted notifications.
         """
-        cutoff_date = datetime.utcnow() - timedelta(days=days)
-        
-        stmt = select(Notification).where(Notification.created_at < cutoff_date)
-        result = await self.session.execute(stmt)
-        notifications = list(result.scalars().all())
+        cutoff_date = utcnow() - timedelta(days=days)
         
-        for notification in notifications:
-            await self.session.delete(notification)
+        # Oldest rows are found through the created_at index
+        batch_ids = (
+            select(Notification.id)
+            .where(Notification.created_at < cutoff_date)
+            .limit(_CLEANUP_BATCH_SIZE)
+            .scalar_subquery()
+        )
+        stmt = (
+            delete(Notification)
+            .where(Notification.id.in_(batch_ids))
+            .execution_options(synchronize_session=False)
+        )
         
-        await self.session.commit()
-        return len(notifications)
-    
-    async def delete_by_id(self, notification_id: UUID) -> bool:
-        """Delete a notification by ID."""
-        notification = await self.get_by_id(notification_id)
-        if notification:
-            await self.session.delete(notification)
+        deleted = 0
+        while True:
+            result = await self.session.execute(stmt)
             await self.session.commit()
-            return True
-        return False
+            deleted += result.rowcount
+            # A short batch means nothing older is left
+            if result.rowcount < _CLEANUP_BATCH_SIZE:
+                return deleted
+    
+    async def delete_for_user(self, notification_id: UUID, user_id: UUID) -> Optional[bool]:
+        """
+        Delete a user's notification (single DELETE ... RETURNING).
+        Returns whether it had been read, or None if no notification with
+        this id belongs to the user.
+        """
+        result = await self.session.execute(
+            delete(Notification)
+            .where(
+                and_(
+                    Notification.id == notification_id,
+                    Notification.user_id == user_id
+                )
+            )
+            .returning(Notification.is_read)
+            .execution_options(synchronize_session=False)
+        )
+        was_read = result.scalar_one_or_none()
+        await self.session.commit()
+        return was_read
@@ -1,21 +1,58 @@
 """Quiz repository for database operations"""
 
-from typing import Optional, List
-from uuid import UUID
+from typing import Optional, List, Sequence, Tuple
+from uuid import UUID, uuid4
 from datetime import datetime
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, func
-from sqlalchemy.orm import selectinload
+from sqlalchemy import Row, select, insert, update, delete, and_, or_, exists, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import selectinload, load_only
+from sqlalchemy.orm.attributes import set_committed_value
 from app.db.base import Quiz, Question
 from app.domain.enums import UserRole
+from app.core.clock import utcnow
+
+# session.info key for the per-session quiz/question read cache
+_QUIZ_CACHE_KEY = "quiz_repo_cache"
+
+# User-facing quiz listings load only what QuizResponse serializes; in
+# particular correct_answer never leaves the database on these paths
+_LISTING_OPTIONS = (
+    load_only(
+        Quiz.id, Quiz.title, Quiz.description, Quiz.duration_minutes,
+        Quiz.passing_score, Quiz.is_published, Quiz.max_attempts, Quiz.created_at
+    ),
+    selectinload(Quiz.questions).load_only(
+        Question.id, Question.quiz_id, Question.question_text,
+        Question.question_type, Question.options, Question.points, Question.order
+    ),
+)
 
 
 class QuizRepository:
     """Repository for Quiz entity operations"""
     
+    __slots__ = ("session",)
+    
     def __init__(self, session: AsyncSession):
         self.session = session
     
+    def _cache(self) -> dict:
+        """
+        Read cache shared by every QuizRepository on this session
+        
+        The session lives for one request (or one worker job), so the same
+        quiz is not re-selected by each service that needs it, and cached
+        objects always belong to the session that loaded them.
+        """
+        return self.session.info.setdefault(_QUIZ_CACHE_KEY, {})
+    
+    def _invalidate(self, quiz_id: UUID) -> None:
+        """Drop cached reads for a quiz after it or its questions change"""
+        cache = self._cache()
+        for key in ((quiz_id, True), (quiz_id, False), ("answer_key", quiz_id)):
+            cache.pop(key, None)
+    
     async def create(
         self,
         title: str,
@@ -40,57 +77,74 @@ class QuizRepository:
         )
         self.session.add(quiz)
         await self.session.commit()
-        await self.session.refresh(quiz)
         return quiz
     
-    async def create_question(
-        self,
-        quiz_id: UUID,
-        question_text: str,
-        question_type: str,
-        options: List[str],
-        correct_answer: str,
-        points: int,
-        order: int
-    ) -> Question:
-        """Create a question for a quiz"""
-        question = Question(
-            quiz_id=quiz_id,
-            question_text=question_text,
-            question_type=question_type,
-            options=options,
-            correct_answer=correct_answer,
-            points=points,
-            order=order
-        )
-        self.session.add(question)
-        await self.session.commit()
-        await self.session.refresh(question)
-        return question
+    async def bulk_create_questions(self, quiz: Quiz, questions: List[dict]) -> List[Question]:
+        """
+        Create many questions for a quiz in one multi-row INSERT
+        
+        The rows come back through RETURNING and are attached to
+        quiz.questions, so the quiz can be served without reloading it.
+        
+        Args:
+            quiz: Quiz the questions belong to
+            questions: Column values per question (question_text, question_type,
+                options, correct_answer, points, order)
+            
+        Returns:
+            Created questions, in the given order
+        """
+        created: List[Question] = []
+        if questions:
+            # Core inserts skip SQLModel's default factories, so fill them here
+            now = utcnow()
+            # render_nulls keeps rows with NULL options (TRUE_FALSE) in the same batch
+            result = await self.session.scalars(
+                insert(Question).returning(Question, sort_by_parameter_order=True)
+                .execution_options(render_nulls=True),
+                [{"id": uuid4(), "quiz_id": quiz.id, "created_at": now, **q} for q in questions]
+            )
+            created = list(result.all())
+            await self.session.commit()
+        
+        self._invalidate(quiz.id)
+        set_committed_value(quiz, "questions", created)
+        self._cache()[(quiz.id, True)] = quiz
+        return created
     
     async def get_by_id(self, quiz_id: UUID, include_questions: bool = True) -> Optional[Quiz]:
-        """Get quiz by ID with optional questions"""
+        """Get quiz by ID with optional questions (cached per session)"""
+        cache = self._cache()
+        cached = cache.get((quiz_id, True))
+        if cached is None and not include_questions:
+            cached = cache.get((quiz_id, False))
+        if cached is not None:
+            return cached
+        
         query = select(Quiz).where(Quiz.id == quiz_id)
         
         if include_questions:
             query = query.options(selectinload(Quiz.questions))
         
         result = await self.session.execute(query)
-        return result.scalar_one_or_none()
+        quiz = result.scalar_one_or_none()
+        if quiz is not None:
+            cache[(quiz_id, include_questions)] = quiz
+        return quiz
     
-    async def get_published_quizzes(self, skip: int = 0, limit: int = 100) -> List[Quiz]:
-        """Get all published quizzes"""
+    async def get_published_quizzes(self, skip: int = 0, limit: int = 100) -> Sequence[Quiz]:
+        """Get all published quizzes (listing columns only)"""
         result = await self.session.execute(
             select(Quiz)
             .where(Quiz.is_published == True)
-            .options(selectinload(Quiz.questions))
+            .options(*_LISTING_OPTIONS)
             .offset(skip)
             .limit(limit)
             .order_by(Quiz.created_at.desc())
         )
-        return list(result.scalars().all())
+        return result.scalars().all()
     
-    async def get_all_quizzes(self, skip: int = 0, limit: int = 100) -> List[Quiz]:
+    async def get_all_quizzes(self, skip: int = 0, limit: int = 100) -> Sequence[Quiz]:
         """Get all quizzes (admin only)"""
         result = await self.session.execute(
             select(Quiz)
@@ -99,14 +153,29 @@ class QuizRepository:
             .limit(limit)
             .order_by(Quiz.created_at.desc())
         )
-        return list(result.scalars().all())
+        return result.scalars().all()
     
-    async def update(self, quiz: Quiz) -> Quiz:
-        """Update quiz"""
-        quiz.updated_at = datetime.utcnow()
-        self.session.add(quiz)
+    async def update_unpublished(self, quiz_id: UUID, values: dict) -> Optional[Quiz]:
+        """
+        Update an unpublished quiz in one UPDATE ... RETURNING
+        
+        Returns:
+            Updated quiz with questions, or None if there is no unpublished
+            quiz with this ID
+        """
+        result = await self.session.execute(
+            update(Quiz)
+            .where(and_(Quiz.id == quiz_id, Quiz.is_published == False))
+            .values(**values)
+            .returning(Quiz)
+            .options(selectinload(Quiz.questions)),
+            execution_options={"populate_existing": True}
+        )
+        quiz = result.scalar_one_or_none()
         await self.session.commit()
-        await self.session.refresh(quiz)
+        self._invalidate(quiz_id)
+        if quiz is not None:
+            self._cache()[(quiz_id, True)] = quiz
         return quiz
     
     async def publish(self, quiz_id: UUID) -> Optional[Quiz]:
@@ -115,40 +184,78 @@ class QuizRepository:
         quiz = await self.get_by_id(quiz_id, include_questions=True)
         if quiz:
             quiz.is_published = True
-            quiz.updated_at = datetime.utcnow()
             self.session.add(quiz)
             await self.session.commit()
-            await self.session.refresh(quiz)
+            self._invalidate(quiz_id)
         return quiz
     
     async def delete(self, quiz_id: UUID) -> bool:
-        """Delete a quiz"""
-        quiz = await self.get_by_id(quiz_id, include_questions=False)
-        if quiz:
-            await self.session.delete(quiz)
-            await self.session.commit()
-            return True
-        return False
-    
-    async def get_questions(self, quiz_id: UUID) -> List[Question]:
-        """Get all questions for a quiz"""
-        result = await self.session.execute(
-            select(Question)
+        """
+        Delete a quiz and its questions
+        
+        Core DELETEs skip the ORM cascade, so questions are removed
+        explicitly before the quiz.
+        """
+        await self.session.execute(
+            delete(Question)
             .where(Question.quiz_id == quiz_id)
-            .order_by(Question.order)
+            .execution_options(synchronize_session=False)
         )
-        return list(result.scalars().all())
+        result = await self.session.execute(
+            delete(Quiz)
+            .where(Quiz.id == quiz_id)
+            .execution_options(synchronize_session=False)
+        )
+        await self.session.commit()
+        self._invalidate(quiz_id)
+        return result.rowcount > 0
+    
+    async def get_answer_key(self, quiz_id: UUID) -> Optional[Tuple[int, Sequence[Row]]]:
+        """
+        Get what scoring needs for a quiz in one query (cached per session)
+        
+        Returns:
+            (passing_score, rows of id/points/correct_answer/question_type),
+            or None if the quiz does not exist
+        """
+        cache = self._cache()
+        cached = cache.get(("answer_key", quiz_id))
+        if cached is None:
+            result = await self.session.execute(
+                select(
+                    Quiz.passing_score,
+                    Question.id,
+                    Question.points,
+                    Question.correct_answer,
+                    Question.question_type
+                )
+                .select_from(Quiz)
+                .outerjoin(Question, Question.quiz_id == Quiz.id)
+                .where(Quiz.id == quiz_id)
+            )
+            rows = result.all()
+            if not rows:
+                return None
+            # A quiz without questions comes back as one row of NULLs
+            cached = cache[("answer_key", quiz_id)] = (
+                rows[0].passing_score,
+                [row for row in rows if row.id is not None]
+            )
+        return cached
     
     # Quiz Assignment Methods
     
     async def assign_quiz(
         self,
         quiz_id: UUID,
-        user_id: UUID,
+        user_ids: List[UUID],
         assigned_by: UUID,
         due_date: Optional[datetime] = None
-    ):
-        """Assign quiz to a user"""
+    ) -> int:
+        """
+        Assign quiz to users in a single INSERT ... ON CONFLICT statement.
+        Existing assignments are reactivated with the new due date.
+        """
         from app.db.base import QuizAssignment
         
         # Normalize due_date to naive datetime (database expects TIMESTAMP WITHOUT TIME ZONE)
@@ -156,35 +263,34 @@ class QuizRepository:
             # Convert to UTC and remove timezone info
             due_date = due_date.replace(tzinfo=None)
         
-        # Check if assignment already exists
-        result = await self.session.execute(
-            select(QuizAssignment).where(
-                and_(
-                    QuizAssignment.quiz_id == quiz_id,
-                    QuizAssignment.user_id == user_id
-                )
-            )
-        )
-        existing = result.scalar_one_or_none()
-        
-        if existing:
-            # Update existing assignment
-            existing.is_active = True
-            existing.due_date = due_date
-            existing.assigned_at = datetime.utcnow()
-            self.session.add(existing)
-        else:
-            # Create new assignment
-            assignment = QuizAssignment(
-                quiz_id=quiz_id,
-                user_id=user_id,
-                assigned_by=assigned_by,
-                due_date=due_date
-            )
-            self.session.add(assignment)
+        # ON CONFLICT cannot touch the same row twice in one statement
+        unique_user_ids = list(dict.fromkeys(user_ids))
+        now = utcnow()
+        rows = [
+            {
+                "id": uuid4(),
+                "quiz_id": quiz_id,
+                "user_id": user_id,
+                "assigned_by": assigned_by,
+                "assigned_at": now,
+                "due_date": due_date,
+                "is_active": True
+            }
+            for user_id in unique_user_ids
+        ]
         
+        stmt = pg_insert(QuizAssignment).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[QuizAssignment.quiz_id, QuizAssignment.user_id],
+            set_={
+                "is_active": True,
+                "due_date": stmt.excluded.due_date,
+                "assigned_at": stmt.excluded.assigned_at
+            }
+        )
+        await self.session.execute(stmt)
         await self.session.commit()
-        return True
+        return len(unique_user_ids)
     
     async def get_quiz_assignments(self, quiz_id: UUID):
         """Get all assignments for a quiz"""
@@ -197,26 +303,22 @@ class QuizRepository:
         )
         return result.all()
     
-    async def revoke_assignment(self, quiz_id: UUID, user_id: UUID) -> bool:
-        """Revoke quiz assignment from a user"""
+    async def revoke_assignments(self, quiz_id: UUID, user_ids: List[UUID]) -> int:
+        """Revoke quiz assignment from users in a single UPDATE"""
         from app.db.base import QuizAssignment
         
         result = await self.session.execute(
-            select(QuizAssignment).where(
+            update(QuizAssignment)
+            .where(
                 and_(
                     QuizAssignment.quiz_id == quiz_id,
-                    QuizAssignment.user_id == user_id
+                    QuizAssignment.user_id.in_(user_ids)
                 )
             )
+            .values(is_active=False)
         )
-        assignment = result.scalar_one_or_none()
-        
-        if assignment:
-            assignment.is_active = False
-            self.session.add(assignment)
-            await self.session.commit()
-            return True
-        return False
+        await self.session.commit()
+        return result.rowcount
     
     async def get_user_assignment(self, quiz_id: UUID, user_id: UUID):
         """Get specific user's assignment for a quiz"""
@@ -233,38 +335,27 @@ class QuizRepository:
         )
         return result.scalar_one_or_none()
     
-    async def get_user_quizzes(self, user_id: UUID) -> List[Quiz]:
-        """Get all quizzes assigned to a user or public quizzes"""
+    async def get_user_quizzes(self, user_id: UUID) -> Sequence[Quiz]:
+        """Get all quizzes assigned to a user or public quizzes (listing columns only)"""
         from app.db.base import QuizAssignment
         
-        # Get assigned quizzes
-        result = await self.session.execute(
-            select(Quiz)
-            .join(QuizAssignment, Quiz.id == QuizAssignment.quiz_id)
-            .where(
-                and_(
-                    QuizAssignment.user_id == user_id,
-                    QuizAssignment.is_active == True,
-                    Quiz.is_published == True
-                )
+        # One query: EXISTS (rather than a join) returns each quiz once even
+        # when it is both public and assigned, so no DISTINCT is needed
+        is_assigned = exists().where(
+            and_(
+                QuizAssignment.quiz_id == Quiz.id,
+                QuizAssignment.user_id == user_id,
+                QuizAssignment.is_active == True
             )
-            .options(selectinload(Quiz.questions))
         )
-        assigned_quizzes = list(result.scalars().all())
-        
-        # Get public quizzes
         result = await self.session.execute(
             select(Quiz)
             .where(
                 and_(
                     Quiz.is_published == True,
-                    Quiz.is_public == True
+                    or_(Quiz.is_public == True, is_assigned)
                 )
             )
-            .options(selectinload(Quiz.questions))
+            .options(*_LISTING_OPTIONS)
         )
-        public_quizzes = list(result.scalars().all())
-        
-        # Combine and deduplicate
-        all_quizzes = {q.id: q for q in assigned_quizzes + public_quizzes}
-        return list(all_quizzes.values())
+        return result.scalars().all()
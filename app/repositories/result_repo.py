@@ -1,15 +1,17 @@
 """Result repository for database operations"""
 
-from typing import Optional, List
+from typing import AsyncIterator, Optional, Sequence
 from uuid import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, desc
+from sqlalchemy import select, update, and_, desc, func
 from app.db.base import Result
 
 
 class ResultRepository:
     """Repository for Result entity operations"""
     
+    __slots__ = ("session",)
+    
     def __init__(self, session: AsyncSession):
         self.session = session
     
@@ -35,15 +37,11 @@ class ResultRepository:
         )
         self.session.add(result)
         await self.session.commit()
-        await self.session.refresh(result)
         return result
     
     async def get_by_id(self, result_id: UUID) -> Optional[Result]:
-        """Get result by ID"""
-        result = await self.session.execute(
-            select(Result).where(Result.id == result_id)
-        )
-        return result.scalar_one_or_none()
+        """Get result by ID (served from the session identity map when loaded)"""
+        return await self.session.get(Result, result_id)
     
     async def get_by_attempt_id(self, attempt_id: UUID) -> Optional[Result]:
         """Get result by attempt ID"""
@@ -52,44 +50,83 @@ class ResultRepository:
         )
         return result.scalar_one_or_none()
     
-    async def get_user_results(self, user_id: UUID) -> List[Result]:
+    async def get_user_results(self, user_id: UUID) -> Sequence[Result]:
         """Get all results for a user"""
         result = await self.session.execute(
             select(Result)
             .where(Result.user_id == user_id)
             .order_by(desc(Result.created_at))
         )
-        return list(result.scalars().all())
+        return result.scalars().all()
     
-    async def get_quiz_results(self, quiz_id: UUID) -> List[Result]:
-        """Get all results for a quiz"""
-        result = await self.session.execute(
+    async def stream_user_results(
+        self,
+        user_id: UUID,
+        chunk_size: int = 100
+    ) -> AsyncIterator[Result]:
+        """Stream all results for a user through a server-side cursor"""
+        rows = await self.session.stream_scalars(
+            select(Result)
+            .where(Result.user_id == user_id)
+            .order_by(desc(Result.created_at))
+            .execution_options(yield_per=chunk_size)
+        )
+        async for row in rows:
+            yield row
+    
+    async def stream_quiz_results(
+        self,
+        quiz_id: UUID,
+        chunk_size: int = 500
+    ) -> AsyncIterator[Result]:
+        """Stream all results for a quiz (best score first) through a server-side cursor"""
+        rows = await self.session.stream_scalars(
             select(Result)
             .where(Result.quiz_id == quiz_id)
             .order_by(desc(Result.score))
+            .execution_options(yield_per=chunk_size)
         )
-        return list(result.scalars().all())
+        async for row in rows:
+            yield row
     
-    async def get_leaderboard(
-        self, 
-        quiz_id: UUID, 
-        limit: int = 10
-    ) -> List[Result]:
-        """Get top results for a quiz"""
+    async def get_quiz_results(self, quiz_id: UUID) -> Sequence[Result]:
+        """Get all results for a quiz"""
         result = await self.session.execute(
             select(Result)
             .where(Result.quiz_id == quiz_id)
-            .order_by(desc(Result.score), Result.created_at)
-            .limit(limit)
+            .order_by(desc(Result.score))
         )
-        return list(result.scalars().all())
+        return result.scalars().all()
     
-    async def update_rank(self, result_id: UUID, rank: int) -> Optional[Result]:
-        """Update result rank"""
-        result = await self.get_by_id(result_id)
-        if result:
-            result.rank = rank
-            self.session.add(result)
-            await self.session.commit()
-            await self.session.refresh(result)
-        return result
+    async def sync_ranks(self) -> int:
+        """
+        Store every result's per-quiz rank in results.rank (single UPDATE)
+        
+        Ranks use the leaderboard ordering (score desc, then earliest) and
+        are computed server-side with row_number(); rows whose rank is
+        already current are not rewritten.
+        
+        Returns:
+            Number of results whose rank changed
+        """
+        ranked = select(
+            Result.id,
+            func.row_number().over(
+                partition_by=Result.quiz_id,
+                order_by=(desc(Result.score), Result.created_at)
+            ).label("rank")
+        ).subquery()
+        
+        result = await self.session.execute(
+            update(Result)
+            .where(
+                and_(
+                    Result.id == ranked.c.id,
+                    Result.rank.is_distinct_from(ranked.c.rank)
+                )
+            )
+            .values(rank=ranked.c.rank)
+            .execution_options(synchronize_session=False)
+        )
+        await self.session.commit()
+        return result.rowcount
@@ -4,14 +4,17 @@ from typing import Optional, List
 from uuid import UUID
 from datetime import datetime
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_
+from sqlalchemy import select, update, and_
 from app.db.base import User, RefreshToken
-from app.core.security import hash_password
+from app.core.security import hash_password_async
+from app.core.clock import utcnow
 
 
 class UserRepository:
     """Repository for User entity operations"""
     
+    __slots__ = ("session",)
+    
     def __init__(self, session: AsyncSession):
         self.session = session
     
@@ -20,20 +23,16 @@ class UserRepository:
         user = User(
             email=email,
             username=username,
-            hashed_password=hash_password(password),
+            hashed_password=await hash_password_async(password),
             role=role
         )
         self.session.add(user)
         await self.session.commit()
-        await self.session.refresh(user)
         return user
     
     async def get_by_id(self, user_id: UUID) -> Optional[User]:
-        """Get user by ID"""
-        result = await self.session.execute(
-            select(User).where(User.id == user_id)
-        )
-        return result.scalar_one_or_none()
+        """Get user by ID (served from the session identity map when loaded)"""
+        return await self.session.get(User, user_id)
     
     async def get_by_email(self, email: str) -> Optional[User]:
         """Get user by email"""
@@ -51,10 +50,8 @@ class UserRepository:
     
     async def update(self, user: User) -> User:
         """Update user"""
-        user.updated_at = datetime.utcnow()
         self.session.add(user)
         await self.session.commit()
-        await self.session.refresh(user)
         return user
     
     # Refresh Token Operations
@@ -62,7 +59,7 @@ class UserRepository:
     async def create_refresh_token(
         self, 
         user_id: UUID, 
-        token_hash: str, 
+        token_hash: bytes, 
         expires_at: datetime
     ) -> RefreshToken:
         """Create a refresh token"""
@@ -73,10 +70,9 @@ class UserRepository:
         )
         self.session.add(refresh_token)
         await self.session.commit()
-        await self.session.refresh(refresh_token)
         return refresh_token
     
-    async def get_refresh_token(self, token_hash: str) -> Optional[RefreshToken]:
+    async def get_refresh_token(self, token_hash: bytes) -> Optional[RefreshToken]:
         """Get refresh token by hash"""
         result = await self.session.execute(
             select(RefreshToken).where(
@@ -88,29 +84,21 @@ class UserRepository:
         )
         return result.scalar_one_or_none()
     
-    async def revoke_refresh_token(self, token_hash: str) -> None:
-        """Revoke a refresh token"""
-        result = await self.session.execute(
-            select(RefreshToken).where(RefreshToken.token_hash == token_hash)
+    async def revoke_refresh_token(self, token_hash: bytes) -> None:
+        """Revoke a refresh token (single UPDATE)"""
+        await self.session.execute(
+            update(RefreshToken)
+            .where(RefreshToken.token_hash == token_hash)
+            .values(is_revoked=True)
+            .execution_options(synchronize_session=False)
         )
-        token = result.scalar_one_or_none()
-        if token:
-            token.is_revoked = True
-            self.session.add(token)
-            await self.session.commit()
+        await self.session.commit()
     
-    async def revoke_all_user_tokens(self, user_id: UUID) -> None:
-        """Revoke all refresh tokens for a user"""
-        result = await self.session.execute(
-            select(RefreshToken).where(
-                and_(
-                    RefreshToken.user_id == user_id,
-                    RefreshToken.is_revoked == False
-                )
-            )
+    async def invalidate_tokens(self, user_id: UUID) -> None:
+        """Invalidate every token issued to a user so far (single-row UPDATE)"""
+        await self.session.execute(
+            update(User)
+            .where(User.id == user_id)
+            .values(token_invalidated_at=utcnow())
         )
-        tokens = result.scalars().all()
-        for token in tokens:
-            token.is_revoked = True
-            self.session.add(token)
         await self.session.commit()
@@ -1,6 +1,6 @@
 """Pydantic schemas for quiz assignments"""
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Optional
 from uuid import UUID
 from datetime import datetime
@@ -22,8 +22,7 @@ class QuizAssignmentResponse(BaseModel):
     due_date: Optional[datetime]
     is_active: bool
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class QuizAssignmentWithUser(BaseModel):
@@ -1,6 +1,6 @@
 """Pydantic schemas for quiz attempts"""
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import List, Optional
 from uuid import UUID
 from datetime import datetime
@@ -18,6 +18,11 @@ class AnswerSubmit(BaseModel):
     selected_answer: str
 
 
+class AnswersBulkSubmit(BaseModel):
+    """Schema for submitting several answers in one request"""
+    answers: List[AnswerSubmit] = Field(min_length=1)
+
+
 class AnswerResponse(BaseModel):
     """Schema for answer response"""
     id: UUID
@@ -25,8 +30,7 @@ class AnswerResponse(BaseModel):
     selected_answer: str
     answered_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class AttemptResponse(BaseModel):
@@ -42,8 +46,7 @@ class AttemptResponse(BaseModel):
     time_remaining_seconds: int
     answers: List[AnswerResponse]
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class AttemptSubmit(BaseModel):
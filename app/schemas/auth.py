@@ -1,33 +1,64 @@
 """Pydantic schemas for authentication"""
 
-from pydantic import BaseModel, EmailStr, Field, validator
-from typing import Optional
+from functools import lru_cache
+from pydantic import AfterValidator, BaseModel, ConfigDict, StringConstraints, field_validator
+from typing import Annotated, Optional
+from email_validator import EmailNotValidError, validate_email
 from uuid import UUID
 from datetime import datetime
 from app.domain.enums import UserRole
 
 
+@lru_cache(maxsize=4096)
+def _validate_email(value: str) -> str:
+    """
+    Validate and normalize an email address (memoized per input string)
+    
+    Deliverability (DNS) checks are skipped, as EmailStr does; repeated
+    addresses (logins, duplicate registrations) skip the parse entirely.
+    """
+    try:
+        return validate_email(value.strip(), check_deliverability=False).normalized
+    except EmailNotValidError as e:
+        raise ValueError(f"value is not a valid email address: {e}") from e
+
+
+ValidatedEmail = Annotated[str, AfterValidator(_validate_email)]
+
+
 class UserRegister(BaseModel):
     """Schema for user registration - role is NOT included for security"""
-    email: EmailStr
-    username: str = Field(min_length=3, max_length=50)
-    password: str = Field(min_length=8, max_length=100)
+    email: ValidatedEmail
+    username: Annotated[str, StringConstraints(min_length=3, max_length=50)]
+    password: Annotated[str, StringConstraints(min_length=8, max_length=100)]
     
-    @validator("password")
+    @field_validator("password")
+    @classmethod
     def validate_password(cls, v: str) -> str:
-        """Validate password strength"""
-        if not any(char.isdigit() for char in v):
+        """Validate password strength (one pass over the characters)"""
+        has_digit = has_upper = has_lower = False
+        for char in v:
+            if char.isdigit():
+                has_digit = True
+            elif char.isupper():
+                has_upper = True
+            elif char.islower():
+                has_lower = True
+            if has_digit and has_upper and has_lower:
+                break
+        
+        if not has_digit:
             raise ValueError("Password must contain at least one digit")
-        if not any(char.isupper() for char in v):
+        if not has_upper:
             raise ValueError("Password must contain at least one uppercase letter")
-        if not any(char.islower() for char in v):
+        if not has_lower:
             raise ValueError("Password must contain at least one lowercase letter")
         return v
 
 
 class UserLogin(BaseModel):
     """Schema for user login"""
-    email: EmailStr
+    email: ValidatedEmail
     password: str
 
 
@@ -53,5 +84,4 @@ class UserResponse(BaseModel):
     is_active: bool
     created_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
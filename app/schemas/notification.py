@@ -24,11 +24,16 @@ class NotificationResponse(BaseModel):
 
 
 class NotificationListResponse(BaseModel):
-    """Response schema for list of notifications with pagination."""
+    """
+    Response schema for list of notifications with pagination.
+    total is only counted for offset pages (None when paging by cursor);
+    next_cursor is set when a further page may exist.
+    """
     notifications: list[NotificationResponse]
-    total: int
+    total: Optional[int] = None
     limit: int
     offset: int
+    next_cursor: Optional[str] = None
 
 
 class UnreadCountResponse(BaseModel):
@@ -1,25 +1,33 @@
 """Pydantic schemas for quizzes and questions"""
 
-from pydantic import BaseModel, Field, validator
-from typing import List, Optional
+from pydantic import BaseModel, ConfigDict, Field, StringConstraints, field_validator, ValidationInfo
+from typing import Annotated, List, Optional
 from uuid import UUID
 from datetime import datetime
-from app.domain.enums import QuestionType
+from app.domain.enums import QuestionType, TRUE_FALSE_OPTIONS
+
+# Constrained types shared by the create and update schemas
+QuizTitle = Annotated[str, StringConstraints(min_length=3, max_length=255)]
+QuizDescription = Annotated[str, StringConstraints(min_length=10)]
+DurationMinutes = Annotated[int, Field(gt=0, le=300)]  # Max 5 hours
+PassingScore = Annotated[int, Field(ge=0, le=100)]
+MaxAttempts = Annotated[int, Field(ge=1)]
 
 
 class QuestionCreate(BaseModel):
     """Schema for creating a question"""
-    question_text: str = Field(min_length=5)
+    question_text: Annotated[str, StringConstraints(min_length=5)]
     question_type: QuestionType
-    options: List[str] = Field(min_items=2)
+    options: Annotated[List[str], Field(min_length=2)]
     correct_answer: str
-    points: int = Field(default=1, gt=0)
-    order: int = Field(ge=0)
+    points: Annotated[int, Field(gt=0)] = 1
+    order: Annotated[int, Field(ge=0)]
     
-    @validator("correct_answer")
-    def validate_correct_answer(cls, v: str, values: dict) -> str:
+    @field_validator("correct_answer")
+    @classmethod
+    def validate_correct_answer(cls, v: str, info: ValidationInfo) -> str:
         """Validate that correct answer is in options"""
-        if "options" in values and v not in values["options"]:
+        if "options" in info.data and v not in info.data["options"]:
             raise ValueError("Correct answer must be one of the options")
         return v
 
@@ -33,8 +41,15 @@ class QuestionResponse(BaseModel):
     points: int
     order: int
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
+    
+    @field_validator("options", mode="before")
+    @classmethod
+    def fill_true_false_options(cls, v, info: ValidationInfo):
+        """Supply the fixed options for TRUE_FALSE questions (stored as NULL)"""
+        if v is None and info.data.get("question_type") == QuestionType.TRUE_FALSE:
+            return list(TRUE_FALSE_OPTIONS)
+        return v
 
 
 class QuestionWithAnswer(QuestionResponse):
@@ -44,25 +59,25 @@ class QuestionWithAnswer(QuestionResponse):
 
 class QuizCreate(BaseModel):
     """Schema for creating a quiz"""
-    title: str = Field(min_length=3, max_length=255)
-    description: str = Field(min_length=10)
-    duration_minutes: int = Field(gt=0, le=300)  # Max 5 hours
-    passing_score: int = Field(ge=0, le=100)
-    randomize_questions: bool = Field(default=False)
-    randomize_options: bool = Field(default=False)
-    max_attempts: Optional[int] = Field(default=None, ge=1)
-    questions: List[QuestionCreate] = Field(min_items=1)
+    title: QuizTitle
+    description: QuizDescription
+    duration_minutes: DurationMinutes
+    passing_score: PassingScore
+    randomize_questions: bool = False
+    randomize_options: bool = False
+    max_attempts: Optional[MaxAttempts] = None
+    questions: Annotated[List[QuestionCreate], Field(min_length=1)]
 
 
 class QuizUpdate(BaseModel):
     """Schema for updating a quiz"""
-    title: Optional[str] = Field(None, min_length=3, max_length=255)
-    description: Optional[str] = Field(None, min_length=10)
-    duration_minutes: Optional[int] = Field(None, gt=0, le=300)
-    passing_score: Optional[int] = Field(None, ge=0, le=100)
+    title: Optional[QuizTitle] = None
+    description: Optional[QuizDescription] = None
+    duration_minutes: Optional[DurationMinutes] = None
+    passing_score: Optional[PassingScore] = None
     randomize_questions: Optional[bool] = None
     randomize_options: Optional[bool] = None
-    max_attempts: Optional[int] = Field(None, ge=1)
+    max_attempts: Optional[MaxAttempts] = None
 
 
 class QuizResponse(BaseModel):
@@ -77,8 +92,7 @@ class QuizResponse(BaseModel):
     created_at: datetime
     questions: List[QuestionResponse]
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class QuizAdminResponse(QuizResponse):
@@ -100,5 +114,4 @@ class QuizListItem(BaseModel):
     created_at: datetime
     question_count: int
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
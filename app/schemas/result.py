@@ -1,6 +1,6 @@
 """Pydantic schemas for quiz results"""
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Optional
 from uuid import UUID
 from datetime import datetime
@@ -19,8 +19,7 @@ class ResultResponse(BaseModel):
     rank: Optional[int]
     created_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class LeaderboardEntry(BaseModel):
@@ -33,8 +32,7 @@ class LeaderboardEntry(BaseModel):
     percentage: float
     submitted_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class UserResultSummary(BaseModel):
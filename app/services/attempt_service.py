@@ -1,15 +1,22 @@
 """Attempt service for quiz attempt management with timed quizzes"""
 
-from datetime import datetime, timedelta
-from typing import List
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional, Sequence
 from uuid import UUID
+from fastapi import BackgroundTasks
+import logging
 import random
+import time
 from app.repositories.attempt_repo import AttemptRepository
 from app.repositories.quiz_repo import QuizRepository
 from app.repositories.result_repo import ResultRepository
 from app.services.scoring_service import ScoringService
-from app.db.base import Attempt, Answer, Question
-from app.domain.enums import AttemptStatus
+from app.services.quiz_service import QUIZ_ACCESS_TTL_SECONDS, quiz_access_cache_ns
+from app.services.notification_service import queue_result_notification
+from app.db.base import Attempt, Answer, Question, Quiz
+from app.schemas.attempt import AnswerSubmit
+from app.core.clock import utcnow
+from app.core.cache import cache_get, cache_set
 from app.core.exceptions import (
     QuizNotFoundException,
     QuizNotPublishedException,
@@ -21,6 +28,8 @@ from app.core.exceptions import (
     InvalidOperationException
 )
 
+logger = logging.getLogger(__name__)
+
 
 class AttemptService:
     """Service for quiz attempt operations"""
@@ -37,7 +46,12 @@ class AttemptService:
         self.result_repo = result_repo
         self.scoring_service = scoring_service
     
-    async def can_user_access_quiz(self, user_id: UUID, quiz_id: UUID) -> bool:
+    async def can_user_access_quiz(
+        self,
+        user_id: UUID,
+        quiz: Quiz,
+        now: Optional[datetime] = None
+    ) -> bool:
         """
         Check if user has permission to access quiz
         
@@ -45,28 +59,43 @@ class AttemptService:
         1. If quiz.is_public = True → Anyone can access
         2. If quiz.is_public = False → Only assigned users can access
         
+        Assignment decisions are cached briefly per (quiz, user); assigning
+        or revoking clears the quiz's entries, and an allow never outlives
+        the assignment's due date.
+        
         Args:
             user_id: User ID
-            quiz_id: Quiz ID
+            quiz: Quiz (already loaded by the caller)
+            now: Caller's captured current time (defaults to utcnow())
             
         Returns:
             True if user has access, False otherwise
         """
-        quiz = await self.quiz_repo.get_by_id(quiz_id, include_questions=False)
-        
         # Public quizzes - anyone can access
         if quiz.is_public:
             return True
         
+        namespace = quiz_access_cache_ns(quiz.id)
+        cached = await cache_get(namespace, str(user_id))
+        if cached is not None:
+            return cached == b"1"
+        
         # Check if user is assigned
-        assignment = await self.quiz_repo.get_user_assignment(quiz_id, user_id)
+        now = now or utcnow()
+        allowed = False
+        ttl = QUIZ_ACCESS_TTL_SECONDS
+        assignment = await self.quiz_repo.get_user_assignment(quiz.id, user_id)
         if assignment and assignment.is_active:
             # Check due date if exists
-            if assignment.due_date and datetime.utcnow() > assignment.due_date:
-                return False
-            return True
+            if assignment.due_date is None:
+                allowed = True
+            elif now <= assignment.due_date:
+                allowed = True
+                ttl = min(ttl, int((assignment.due_date - now).total_seconds()))
         
-        return False
+        if ttl > 0:
+            await cache_set(namespace, str(user_id), b"1" if allowed else b"0", expire=ttl)
+        return allowed
     
     async def start_attempt(self, quiz_id: UUID, user_id: UUID) -> Attempt:
         """
@@ -86,6 +115,8 @@ class AttemptService:
             ActiveAttemptExistsException: If active attempt exists
             MaxAttemptsReachedException: If max attempts reached
         """
+        now = utcnow()
+        
         # Get quiz
         quiz = await self.quiz_repo.get_by_id(quiz_id, include_questions=True)
         if not quiz:
@@ -96,7 +127,7 @@ class AttemptService:
             raise QuizNotPublishedException(details={"quiz_id": str(quiz_id)})
         
         # CHECK ACCESS PERMISSION (NEW)
-        has_access = await self.can_user_access_quiz(user_id, quiz_id)
+        has_access = await self.can_user_access_quiz(user_id, quiz, now)
         if not has_access:
             from app.core.exceptions import QuizAccessDeniedException
             raise QuizAccessDeniedException(
@@ -104,23 +135,22 @@ class AttemptService:
                 details={"quiz_id": str(quiz_id), "user_id": str(user_id)}
             )
         
-        # Check for active attempt
-        active_attempt = await self.attempt_repo.get_active_attempt(user_id, quiz_id)
-        if active_attempt:
+        # Check for active attempt and max attempts (one query for both)
+        active_attempt_id, attempt_count = await self.attempt_repo.get_attempt_summary(
+            user_id, quiz_id
+        )
+        if active_attempt_id:
             raise ActiveAttemptExistsException(
-                details={"attempt_id": str(active_attempt.id)}
+                details={"attempt_id": str(active_attempt_id)}
             )
         
-        # Check max attempts
-        if quiz.max_attempts:
-            attempt_count = await self.attempt_repo.count_user_attempts(user_id, quiz_id)
-            if attempt_count >= quiz.max_attempts:
-                raise MaxAttemptsReachedException(
-                    details={"max_attempts": quiz.max_attempts, "current": attempt_count}
-                )
+        if quiz.max_attempts and attempt_count >= quiz.max_attempts:
+            raise MaxAttemptsReachedException(
+                details={"max_attempts": quiz.max_attempts, "current": attempt_count}
+            )
         
         # Calculate expiry time
-        expires_at = datetime.utcnow() + timedelta(minutes=quiz.duration_minutes)
+        expires_at = now + timedelta(minutes=quiz.duration_minutes)
         
         # Create attempt
         attempt = await self.attempt_repo.create(quiz_id, user_id, expires_at)
@@ -133,6 +163,7 @@ class AttemptService:
     async def submit_answer(
         self,
         attempt_id: UUID,
+        user_id: UUID,
         question_id: UUID,
         selected_answer: str
     ) -> Answer:
@@ -141,6 +172,7 @@ class AttemptService:
         
         Args:
             attempt_id: Attempt ID
+            user_id: ID of the user who must own the attempt
             question_id: Question ID
             selected_answer: Selected answer
             
@@ -148,12 +180,62 @@ class AttemptService:
             Created/updated answer
             
         Raises:
-            AttemptNotFoundException: If attempt not found
+            AttemptNotFoundException: If attempt not found or not owned by user
             QuizExpiredException: If quiz has expired
             AlreadySubmittedException: If quiz already submitted
         """
-        # Get attempt
-        attempt = await self.attempt_repo.get_by_id(attempt_id, include_answers=False)
+        await self._get_answerable_attempt(attempt_id, user_id)
+        
+        # Create/update answer
+        answer = await self.attempt_repo.create_answer(
+            attempt_id, question_id, selected_answer
+        )
+        
+        return answer
+    
+    async def submit_answers_bulk(
+        self,
+        attempt_id: UUID,
+        user_id: UUID,
+        answers: List[AnswerSubmit]
+    ) -> Sequence[Answer]:
+        """
+        Submit several answers of an attempt at once
+        
+        The attempt is checked once and all answers are written in a single
+        upsert; if a question appears more than once the last answer wins.
+        
+        Args:
+            attempt_id: Attempt ID
+            user_id: ID of the user who must own the attempt
+            answers: Answers to create or update
+            
+        Returns:
+            Created/updated answers
+            
+        Raises:
+            AttemptNotFoundException: If attempt not found or not owned by user
+            QuizExpiredException: If quiz has expired
+            AlreadySubmittedException: If quiz already submitted
+        """
+        await self._get_answerable_attempt(attempt_id, user_id)
+        
+        selections = {a.question_id: a.selected_answer for a in answers}
+        return await self.attempt_repo.upsert_answers(attempt_id, selections)
+    
+    async def _get_answerable_attempt(self, attempt_id: UUID, user_id: UUID) -> Attempt:
+        """
+        Load an attempt that may still receive answers
+        
+        Raises:
+            AttemptNotFoundException: If attempt not found or not owned by user
+            QuizExpiredException: If quiz has expired (the attempt is auto-submitted)
+            AlreadySubmittedException: If quiz already submitted
+        """
+        # Get attempt (ownership is enforced in the same query)
+        attempt = await self.attempt_repo.get_by_id(
+            attempt_id, include_answers=False, user_id=user_id
+        )
         if not attempt:
             raise AttemptNotFoundException(details={"attempt_id": str(attempt_id)})
         
@@ -164,87 +246,94 @@ class AttemptService:
             )
         
         # Check if expired
-        if datetime.utcnow() > attempt.expires_at:
+        if utcnow() > attempt.expires_at:
             # Auto-submit expired attempt
-            await self.submit_attempt(attempt_id)
+            await self.submit_attempt(attempt_id, user_id=user_id)
             raise QuizExpiredException(
                 details={
                     "attempt_id": str(attempt_id),
-                    "expired_at": attempt.expires_at.isoformat()
+                    # orjson formats the datetime when the error is rendered
+                    "expired_at": attempt.expires_at
                 }
             )
         
-        # Create/update answer
-        answer = await self.attempt_repo.create_answer(
-            attempt_id, question_id, selected_answer
-        )
-        
-        return answer
+        return attempt
     
-    async def submit_attempt(self, attempt_id: UUID) -> dict:
+    async def submit_attempt(
+        self,
+        attempt_id: UUID,
+        user_id: Optional[UUID] = None,
+        background_tasks: Optional[BackgroundTasks] = None,
+        submitted_at: Optional[datetime] = None
+    ) -> dict:
         """
         Submit quiz attempt (atomic operation)
         
         Args:
             attempt_id: Attempt ID
+            user_id: If given, the attempt must belong to this user
+            background_tasks: If given, the result notification is queued
+                after the response is sent instead of inline
+            submitted_at: Submission time to record instead of now: the
+                time queue_submit_attempt accepted the attempt (it is then
+                already marked submitted and is graded unless it has a
+                result), or an expired attempt's deadline
             
         Returns:
             Result details
             
         Raises:
-            AttemptNotFoundException: If attempt not found
+            AttemptNotFoundException: If attempt not found or not owned by user
             AlreadySubmittedException: If already submitted
         """
-        # Start transaction - lock attempt row
-        attempt = await self.attempt_repo.get_for_update(attempt_id)
+        # Start transaction - lock attempt row (answers are loaded for scoring)
+        attempt = await self.attempt_repo.get_for_update(
+            attempt_id, user_id=user_id, include_answers=True
+        )
         if not attempt:
             raise AttemptNotFoundException(details={"attempt_id": str(attempt_id)})
         
-        # Check if already submitted
-        if attempt.is_submitted:
+        # Check if already submitted (a deferred submission is graded once;
+        # only finalize_attempt writes time_taken_seconds)
+        if attempt.is_submitted and (submitted_at is None or attempt.time_taken_seconds is not None):
             raise AlreadySubmittedException(
                 details={"attempt_id": str(attempt_id)}
             )
         
         # Calculate time taken
-        time_taken_seconds = int((datetime.utcnow() - attempt.started_at).total_seconds())
+        submitted_at = submitted_at or utcnow()
+        time_taken_seconds = int((submitted_at - attempt.started_at).total_seconds())
         
         # Calculate score
-        score_data = await self.scoring_service.calculate_score(attempt_id)
+        score_data = await self.scoring_service.calculate_score(attempt)
         
-        # Create result
-        result = await self.result_repo.create(
-            attempt_id=attempt_id,
-            user_id=attempt.user_id,
-            quiz_id=attempt.quiz_id,
+        # Create result and mark the attempt submitted in one commit
+        result = await self.attempt_repo.finalize_attempt(
+            attempt,
             score=score_data["score"],
             total_points=score_data["total_points"],
             percentage=score_data["percentage"],
-            passed=score_data["passed"]
+            passed=score_data["passed"],
+            submitted_at=submitted_at,
+            time_taken_seconds=time_taken_seconds,
+            graded=score_data["graded"]
         )
         
-        # Update attempt
-        attempt.is_submitted = True
-        attempt.submitted_at = datetime.utcnow()
-        attempt.time_taken_seconds = time_taken_seconds
-        attempt.status = AttemptStatus.SUBMITTED
-        await self.attempt_repo.update(attempt)
-        
-        # Queue background tasks
-        from app.workers.celery_app import celery_app
-        
-        # Send result notification
-        celery_app.send_task(
-            "notifications.send_result_notification",
-            args=[
-                str(attempt.user_id),
-                str(attempt.quiz_id),
-                str(result.id),  # Added result_id
-                score_data["score"],
-                score_data["percentage"],
-                score_data["passed"]
-            ]
+        # Queue the result notification for the next debounced bulk flush
+        # (after the response when the caller passes BackgroundTasks, so the
+        # Redis round-trip isn't awaited)
+        notification_args = (
+            attempt.user_id,
+            attempt.quiz_id,
+            result.id,
+            score_data["score"],
+            score_data["percentage"],
+            score_data["passed"]
         )
+        if background_tasks is not None:
+            background_tasks.add_task(queue_result_notification, *notification_args)
+        else:
+            await queue_result_notification(*notification_args)
         
         # Update leaderboard (if leaderboard worker exists)
         # celery_app.send_task("leaderboard.update_rankings", args=[str(result.id)])
@@ -257,9 +346,51 @@ class AttemptService:
             "passed": score_data["passed"]
         }
     
+    async def queue_submit_attempt(self, attempt_id: UUID, user_id: UUID) -> None:
+        """
+        Submit a quiz attempt now and leave grading to a Celery worker
+        
+        Under the row lock the attempt is marked submitted with the current
+        time, so it stops accepting answers, a repeated submit is rejected
+        and queue latency does not count towards time_taken_seconds. The
+        worker grades it with that submission time; if the task cannot be
+        queued it is graded inline.
+        
+        Args:
+            attempt_id: Attempt ID
+            user_id: The attempt must belong to this user
+            
+        Raises:
+            AttemptNotFoundException: If attempt not found or not owned by user
+            AlreadySubmittedException: If already submitted
+        """
+        attempt = await self.attempt_repo.get_for_update(attempt_id, user_id=user_id)
+        if not attempt:
+            raise AttemptNotFoundException(details={"attempt_id": str(attempt_id)})
+        
+        if attempt.is_submitted:
+            raise AlreadySubmittedException(
+                details={"attempt_id": str(attempt_id)}
+            )
+        
+        submitted_at = utcnow()
+        await self.attempt_repo.mark_submitted(attempt, submitted_at)
+        
+        from app.workers.celery_app import celery_app
+        try:
+            celery_app.send_task(
+                "app.workers.attempt_worker.score_attempt",
+                args=[attempt_id.hex, user_id.hex, submitted_at.isoformat()]
+            )
+        except Exception as e:
+            # The attempt is already closed: grade it now rather than leave
+            # it to the recovery sweep
+            logger.warning(f"Could not queue grading of attempt {attempt_id}, grading inline: {e}")
+            await self.submit_attempt(attempt_id, user_id=user_id, submitted_at=submitted_at)
+    
     async def get_attempt(self, attempt_id: UUID) -> Attempt:
         """
-        Get attempt by ID
+        Get attempt by ID with answers eager-loaded (single IN query)
         
         Args:
             attempt_id: Attempt ID
@@ -275,15 +406,26 @@ class AttemptService:
             raise AttemptNotFoundException(details={"attempt_id": str(attempt_id)})
         return attempt
     
+    def time_remaining_seconds(self, attempt: Attempt) -> int:
+        """
+        Seconds left before the attempt expires, never negative
+        
+        Args:
+            attempt: Attempt (expires_at is naive UTC)
+            
+        Returns:
+            Remaining seconds
+        """
+        expires_at_ts = attempt.expires_at.replace(tzinfo=timezone.utc).timestamp()
+        return max(0, int(expires_at_ts - time.time()))
+    
     def randomize_questions(self, questions: List[Question]) -> List[Question]:
-        """Randomize question order"""
-        shuffled = questions.copy()
-        random.shuffle(shuffled)
-        return shuffled
+        """Randomize question order (new list; the input is left as is)"""
+        return random.sample(questions, len(questions))
     
     def randomize_options(self, question: Question) -> Question:
         """Randomize option order for a question"""
-        shuffled_options = question.options.copy()
-        random.shuffle(shuffled_options)
-        question.options = shuffled_options
+        if question.options is None:
+            return question
+        question.options = random.sample(question.options, len(question.options))
         return question
@@ -1,15 +1,16 @@
 """Authentication service with JWT token rotation"""
 
-from datetime import datetime, timedelta
-from typing import Tuple
+from datetime import timedelta, timezone
+from typing import Any, Dict, Tuple
 from uuid import UUID
-from jose import JWTError
+from jwt import PyJWTError
 from app.repositories.user_repo import UserRepository
 from app.core.security import (
-    verify_password,
+    verify_password_async,
     create_access_token,
     create_refresh_token,
     decode_token,
+    forget_decoded_token,
     hash_token
 )
 from app.core.config import settings
@@ -20,6 +21,8 @@ from app.core.exceptions import (
     TokenExpiredException
 )
 from app.db.base import User
+from app.domain.enums import UserRole
+from app.core.clock import utcnow
 
 
 class AuthService:
@@ -81,14 +84,15 @@ class AuthService:
         Raises:
             InvalidCredentialsException: If credentials are invalid
         """
-        # Verify user exists
+        # Always run bcrypt so unknown emails take as long as wrong passwords
         user = await self.user_repo.get_by_email(email)
-        if not user or not verify_password(password, user.hashed_password):
+        stored_hash = user.hashed_password if user else None
+        if not await verify_password_async(password, stored_hash):
             raise InvalidCredentialsException()
         
         # Generate tokens
         access_token = create_access_token(
-            data={"sub": str(user.id), "role": user.role}
+            data=self._access_claims(user)
         )
         refresh_token = create_refresh_token(
             data={"sub": str(user.id)}
@@ -96,7 +100,7 @@ class AuthService:
         
         # Store hashed refresh token
         token_hash = hash_token(refresh_token)
-        expires_at = datetime.utcnow() + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
+        expires_at = utcnow() + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
         await self.user_repo.create_refresh_token(user.id, token_hash, expires_at)
         
         return access_token, refresh_token, settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
@@ -115,6 +119,7 @@ class AuthService:
             InvalidTokenException: If token is invalid
             TokenExpiredException: If token is expired
         """
+        now = utcnow()
         try:
             # Decode refresh token
             payload = decode_token(refresh_token)
@@ -130,8 +135,9 @@ class AuthService:
                 )
             
             # Check expiration
-            if db_token.expires_at < datetime.utcnow():
+            if db_token.expires_at < now:
                 await self.user_repo.revoke_refresh_token(token_hash)
+                forget_decoded_token(refresh_token)
                 raise TokenExpiredException()
             
             # Get user
@@ -139,12 +145,17 @@ class AuthService:
             if not user:
                 raise InvalidTokenException(message="User not found")
             
-            # Revoke old refresh token (rotation)
+            if self._issued_before_invalidation(payload, user):
+                raise InvalidTokenException(message="Token has been revoked")
+            
+            # Revoke old refresh token (rotation); it can never verify again,
+            # so it should not hold a decoded-token cache slot until exp
             await self.user_repo.revoke_refresh_token(token_hash)
+            forget_decoded_token(refresh_token)
             
             # Generate new tokens
             new_access_token = create_access_token(
-                data={"sub": str(user.id), "role": user.role}
+                data=self._access_claims(user)
             )
             new_refresh_token = create_refresh_token(
                 data={"sub": str(user.id)}
@@ -152,22 +163,22 @@ class AuthService:
             
             # Store new hashed refresh token
             new_token_hash = hash_token(new_refresh_token)
-            new_expires_at = datetime.utcnow() + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
+            new_expires_at = now + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
             await self.user_repo.create_refresh_token(user.id, new_token_hash, new_expires_at)
             
             return new_access_token, new_refresh_token, settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
             
-        except JWTError:
+        except PyJWTError:
             raise InvalidTokenException(message="Invalid or malformed token")
     
     async def logout(self, user_id: UUID) -> None:
         """
-        Logout user by revoking all refresh tokens
+        Logout user by invalidating every access and refresh token issued so far
         
         Args:
             user_id: User ID
         """
-        await self.user_repo.revoke_all_user_tokens(user_id)
+        await self.user_repo.invalidate_tokens(user_id)
     
     async def get_current_user(self, token: str) -> User:
         """
@@ -191,7 +202,36 @@ class AuthService:
             if not user:
                 raise InvalidTokenException(message="User not found")
             
+            if self._issued_before_invalidation(payload, user):
+                raise InvalidTokenException(message="Token has been revoked")
+            
             return user
             
-        except JWTError:
+        except PyJWTError:
             raise InvalidTokenException(message="Invalid or malformed token")
+    
+    @staticmethod
+    def _access_claims(user: User) -> Dict[str, Any]:
+        """Claims embedded in access tokens so role/active checks skip the DB"""
+        return {
+            "sub": str(user.id),
+            "role": UserRole(user.role).value,
+            "active": user.is_active
+        }
+    
+    @staticmethod
+    def _issued_before_invalidation(payload: Dict[str, Any], user: User) -> bool:
+        """
+        Check whether a token was issued before the user's last logout
+        
+        Args:
+            payload: Decoded token payload
+            user: Token owner
+            
+        Returns:
+            True if the token must be rejected
+        """
+        if user.token_invalidated_at is None:
+            return False
+        invalidated_ts = user.token_invalidated_at.replace(tzinfo=timezone.utc).timestamp()
+        return payload.get("iat", 0) < invalidated_ts
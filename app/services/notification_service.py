@@ -7,11 +7,118 @@ from app.repositories.quiz_repo import QuizRepository
 from app.repositories.user_repo import UserRepository
 from app.db.base import Notification, Quiz, User
 from app.domain.notification_types import NotificationType
-from typing import Optional
+from app.core.cache import get_redis, cache_get, cache_set, cache_incr_existing, cache_incr_existing_many
+from app.core.exceptions import ValidationException
+from datetime import datetime
+from redis.exceptions import RedisError
+from typing import List, Optional, Tuple
+import base64
+import binascii
 import logging
+import orjson
 
 logger = logging.getLogger(__name__)
 
+# Per-user unread counters; the TTL bounds drift from concurrent rebuilds
+UNREAD_COUNT_CACHE_NS = "notifications:unread"
+UNREAD_COUNT_TTL_SECONDS = 300
+
+# Result notification text: (title, emoji) per outcome, plus the message template
+_RESULT_TITLE_EMOJI = {
+    True: ("Quiz Result: Passed", "✅"),
+    False: ("Quiz Result: Failed", "❌")
+}
+_RESULT_MESSAGE = "{emoji} '{title}' - Score: {score} ({percentage:.1f}%)"
+
+# Result notifications are debounced: producers push onto a Redis list and
+# the first push in a window schedules one flush task for the whole burst
+RESULT_NOTIFICATIONS_PENDING_KEY = "notifications:results:pending"
+RESULT_NOTIFICATIONS_FLUSH_KEY = "notifications:results:flush"
+RESULT_NOTIFICATION_DEBOUNCE_MS = 500
+# A flush moves the burst to its own batch list and deletes it only after
+# the notifications are committed; a redelivered flush resumes its batch
+RESULT_NOTIFICATIONS_BATCH_PREFIX = "notifications:results:batch:"
+
+# KEYS: flush marker, pending list, batch list. Claims the pending burst
+# for the batch (unless the batch is left from an earlier delivery of the
+# same flush) and returns the batch
+_CLAIM_RESULT_BATCH = """
+if redis.call('EXISTS', KEYS[3]) == 0 then
+    redis.call('DEL', KEYS[1])
+    if redis.call('EXISTS', KEYS[2]) == 1 then
+        redis.call('RENAME', KEYS[2], KEYS[3])
+    end
+end
+return redis.call('LRANGE', KEYS[3], 0, -1)
+"""
+
+# KEYS: flush marker, pending list, batch list; ARGV: debounce ms.
+# Moves a failed batch back to the pending list and returns whether the
+# caller must schedule a flush for it
+_REQUEUE_RESULT_BATCH = """
+while redis.call('LMOVE', KEYS[3], KEYS[2], 'LEFT', 'RIGHT') do end
+return redis.call('SET', KEYS[1], '1', 'NX', 'PX', ARGV[1])
+"""
+
+
+def encode_notification_cursor(notification: Notification) -> str:
+    """Opaque page cursor for the (created_at, id) of a listed notification."""
+    raw = f"{notification.created_at.isoformat()}|{notification.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_notification_cursor(cursor: str) -> Tuple[datetime, UUID]:
+    """Parse a cursor from encode_notification_cursor (ValidationException if malformed)."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, notification_id = raw.split("|")
+        return datetime.fromisoformat(created_at), UUID(notification_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise ValidationException(
+            message="Invalid pagination cursor",
+            details={"cursor": cursor}
+        )
+
+
+async def queue_result_notification(
+    user_id: UUID,
+    quiz_id: UUID,
+    result_id: UUID,
+    score: int,
+    percentage: float,
+    passed: bool
+) -> None:
+    """
+    Queue a result notification for the next debounced bulk flush.
+    Falls back to a per-result task when Redis is unavailable.
+    """
+    from app.workers.celery_app import celery_app
+    
+    # Ids travel as UUID.hex (32 chars, vs 36 for str()); UUID() parses either
+    args = [user_id.hex, quiz_id.hex, result_id.hex, score, percentage, passed]
+    try:
+        async with get_redis().pipeline(transaction=False) as pipe:
+            pipe.rpush(RESULT_NOTIFICATIONS_PENDING_KEY, orjson.dumps(args))
+            pipe.set(RESULT_NOTIFICATIONS_FLUSH_KEY, b"1", nx=True, px=RESULT_NOTIFICATION_DEBOUNCE_MS)
+            _, schedule_flush = await pipe.execute()
+    except RedisError as e:
+        logger.warning(f"Result notification queue unavailable, sending directly: {e}")
+        celery_app.send_task("notifications.send_result_notification", args=args)
+        return
+    
+    if schedule_flush:
+        _schedule_result_flush()
+
+
+def _schedule_result_flush() -> None:
+    """Send the flush task for the pending burst after the debounce window"""
+    from app.workers.celery_app import celery_app
+    
+    celery_app.send_task(
+        "notifications.flush_result_notifications",
+        countdown=RESULT_NOTIFICATION_DEBOUNCE_MS / 1000
+    )
+
 
 class NotificationService:
     """Service for managing in-app notifications."""
@@ -50,6 +157,7 @@ class NotificationService:
         )
         
         created = await self.notification_repo.create(notification)
+        await cache_incr_existing(UNREAD_COUNT_CACHE_NS, str(user_id), 1)
         logger.info(f"Created notification {created.id} for user {user_id}")
         return created
     
@@ -58,26 +166,25 @@ class NotificationService:
         Create notifications for all assigned users when a quiz is published.
         Returns count of notifications created.
         """
-        quiz: Optional[Quiz] = await self.quiz_repo.get_by_id(quiz_id)
+        quiz: Optional[Quiz] = await self.quiz_repo.get_by_id(quiz_id, include_questions=False)
         if not quiz:
             logger.error(f"Quiz {quiz_id} not found for notification")
             return 0
         
-        # Get all assigned users
-        assignments = await self.quiz_repo.get_quiz_assignments(quiz_id)
-        
-        count = 0
-        for assignment in assignments:
-            user: Optional[User] = await self.user_repo.get_by_id(assignment.user_id)
-            if user and user.is_active:
-                await self.create_notification(
-                    user_id=user.id,
-                    type=NotificationType.QUIZ_PUBLISHED,
-                    title="New Quiz Published",
-                    message=f"'{quiz.title}' is now available. Duration: {quiz.duration_minutes} min.",
-                    quiz_id=quiz_id
-                )
-                count += 1
+        # Every recipient gets the same text, so render it once
+        message = f"'{quiz.title}' is now available. Duration: {quiz.duration_minutes} min."
+        
+        # One INSERT ... SELECT over the active assignees; users already
+        # notified for this quiz (a retried task) are skipped
+        notified_user_ids = await self.notification_repo.create_quiz_published_for_assignees(
+            quiz_id, title="New Quiz Published", message=message
+        )
+        count = len(notified_user_ids)
+        
+        # Bump every recipient's unread counter in one Redis round trip
+        await cache_incr_existing_many(
+            UNREAD_COUNT_CACHE_NS, (str(user_id) for user_id in notified_user_ids), 1
+        )
         
         logger.info(f"Created {count} quiz published notifications for quiz {quiz_id}")
         return count
@@ -88,7 +195,7 @@ class NotificationService:
         quiz_id: UUID
     ) -> Notification:
         """Create notification when a quiz is assigned to a user."""
-        quiz: Optional[Quiz] = await self.quiz_repo.get_by_id(quiz_id)
+        quiz: Optional[Quiz] = await self.quiz_repo.get_by_id(quiz_id, include_questions=False)
         if not quiz:
             raise ValueError(f"Quiz {quiz_id} not found")
         
@@ -104,6 +211,36 @@ class NotificationService:
             quiz_id=quiz_id
         )
     
+    async def notify_quiz_assigned_many(
+        self,
+        user_ids: List[UUID],
+        quiz_id: UUID
+    ) -> int:
+        """
+        Create assignment notifications for a batch of users in one INSERT.
+        Returns count of notifications created.
+        """
+        quiz: Optional[Quiz] = await self.quiz_repo.get_by_id(quiz_id, include_questions=False)
+        if not quiz:
+            raise ValueError(f"Quiz {quiz_id} not found")
+        
+        message = f"You've been assigned '{quiz.title}'. Duration: {quiz.duration_minutes} min."
+        
+        count = await self.notification_repo.bulk_create([
+            {
+                "user_id": user_id,
+                "type": NotificationType.QUIZ_ASSIGNED,
+                "title": "Quiz Assigned",
+                "message": message,
+                "quiz_id": quiz_id
+            }
+            for user_id in user_ids
+        ])
+        await cache_incr_existing_many(UNREAD_COUNT_CACHE_NS, (str(user_id) for user_id in user_ids), 1)
+        
+        logger.info(f"Created {count} quiz assignment notifications for quiz {quiz_id}")
+        return count
+    
     async def notify_result_available(
         self,
         user_id: UUID,
@@ -114,22 +251,77 @@ class NotificationService:
         passed: bool
     ) -> Notification:
         """Create notification when quiz result is available."""
-        quiz: Optional[Quiz] = await self.quiz_repo.get_by_id(quiz_id)
+        quiz: Optional[Quiz] = await self.quiz_repo.get_by_id(quiz_id, include_questions=False)
         if not quiz:
             raise ValueError(f"Quiz {quiz_id} not found")
         
-        status_emoji = "✅" if passed else "❌"
-        status_text = "Passed" if passed else "Failed"
+        title, emoji = _RESULT_TITLE_EMOJI[bool(passed)]
         
         return await self.create_notification(
             user_id=user_id,
             type=NotificationType.RESULT_AVAILABLE,
-            title=f"Quiz Result: {status_text}",
-            message=f"{status_emoji} '{quiz.title}' - Score: {score} ({percentage:.1f}%)",
+            title=title,
+            message=_RESULT_MESSAGE.format(
+                emoji=emoji, title=quiz.title, score=score, percentage=percentage
+            ),
             quiz_id=quiz_id,
             result_id=result_id
         )
     
+    async def flush_result_notifications(self, batch_id: str) -> int:
+        """
+        Create every queued result notification in one INSERT.
+        batch_id names the flush (its task id) so a redelivery resumes the
+        same batch; a crash after the commit can create the batch twice.
+        Returns count of notifications created.
+        """
+        batch_key = f"{RESULT_NOTIFICATIONS_BATCH_PREFIX}{batch_id}"
+        keys = [RESULT_NOTIFICATIONS_FLUSH_KEY, RESULT_NOTIFICATIONS_PENDING_KEY, batch_key]
+        redis = get_redis()
+        
+        # The flush marker is dropped as the burst is claimed, so any later
+        # push schedules a new flush instead of waiting on this one
+        pending = await redis.eval(_CLAIM_RESULT_BATCH, len(keys), *keys)
+        if not pending:
+            return 0
+        
+        try:
+            notifications = []
+            for user_id, quiz_id, result_id, score, percentage, passed in map(orjson.loads, pending):
+                quiz: Optional[Quiz] = await self.quiz_repo.get_by_id(UUID(quiz_id), include_questions=False)
+                if not quiz:
+                    logger.error(f"Quiz {quiz_id} not found for result {result_id} notification")
+                    continue
+                
+                title, emoji = _RESULT_TITLE_EMOJI[bool(passed)]
+                notifications.append({
+                    "user_id": UUID(user_id),
+                    "type": NotificationType.RESULT_AVAILABLE,
+                    "title": title,
+                    "message": _RESULT_MESSAGE.format(
+                        emoji=emoji, title=quiz.title, score=score, percentage=percentage
+                    ),
+                    "quiz_id": UUID(quiz_id),
+                    "result_id": UUID(result_id)
+                })
+            
+            count = await self.notification_repo.bulk_create(notifications)
+        except Exception:
+            # Put the burst back and make sure a flush is coming for it
+            if await redis.eval(
+                _REQUEUE_RESULT_BATCH, len(keys), *keys, RESULT_NOTIFICATION_DEBOUNCE_MS
+            ):
+                _schedule_result_flush()
+            raise
+        
+        await redis.delete(batch_key)
+        await cache_incr_existing_many(
+            UNREAD_COUNT_CACHE_NS, (str(n["user_id"]) for n in notifications), 1
+        )
+        
+        logger.info(f"Created {count} result notifications")
+        return count
+    
     async def notify_deadline_approaching(
         self,
         user_id: UUID,
@@ -137,7 +329,7 @@ class NotificationService:
         hours_remaining: int
     ) -> Notification:
         """Create notification when quiz deadline is approaching."""
-        quiz: Optional[Quiz] = await self.quiz_repo.get_by_id(quiz_id)
+        quiz: Optional[Quiz] = await self.quiz_repo.get_by_id(quiz_id, include_questions=False)
         if not quiz:
             raise ValueError(f"Quiz {quiz_id} not found")
         
@@ -154,16 +346,30 @@ class NotificationService:
         user_id: UUID,
         limit: int = 50,
         offset: int = 0,
-        unread_only: bool = False
-    ) -> list[Notification]:
-        """Get all notifications for a user."""
+        unread_only: bool = False,
+        cursor: Optional[str] = None
+    ) -> tuple[list[Notification], Optional[int]]:
+        """
+        Get a page of notifications for a user and the total count.
+        With a cursor the page continues after it and the total is None.
+        """
         return await self.notification_repo.get_user_notifications(
-            user_id, limit, offset, unread_only
+            user_id, limit, offset, unread_only,
+            cursor=decode_notification_cursor(cursor) if cursor else None
         )
     
     async def get_unread_count(self, user_id: UUID) -> int:
-        """Get count of unread notifications."""
-        return await self.notification_repo.get_unread_count(user_id)
+        """Get count of unread notifications (cached counter, DB on miss)."""
+        cached = await cache_get(UNREAD_COUNT_CACHE_NS, str(user_id))
+        if cached is not None:
+            return max(0, int(cached))
+        
+        count = await self.notification_repo.get_unread_count(user_id)
+        await cache_set(
+            UNREAD_COUNT_CACHE_NS, str(user_id), str(count).encode(),
+            expire=UNREAD_COUNT_TTL_SECONDS
+        )
+        return count
     
     async def mark_as_read(
         self,
@@ -171,6 +377,13 @@ class NotificationService:
         user_id: UUID
     ) -> Optional[Notification]:
         """Mark notification as read (with user verification)."""
+        # Ownership is part of the UPDATE, so the common case is one statement
+        updated = await self.notification_repo.mark_as_read(notification_id, user_id)
+        if updated is not None:
+            await cache_incr_existing(UNREAD_COUNT_CACHE_NS, str(user_id), -1)
+            return updated
+        
+        # Not found, already read, or someone else's
         notification = await self.notification_repo.get_by_id(notification_id)
         
         if not notification:
@@ -180,11 +393,16 @@ class NotificationService:
         if notification.user_id != user_id:
             raise PermissionError("Cannot mark another user's notification")
         
-        return await self.notification_repo.mark_as_read(notification_id)
+        return notification
     
     async def mark_all_as_read(self, user_id: UUID) -> int:
         """Mark all notifications as read for a user."""
-        return await self.notification_repo.mark_all_as_read(user_id)
+        count = await self.notification_repo.mark_all_as_read(user_id)
+        await cache_set(
+            UNREAD_COUNT_CACHE_NS, str(user_id), b"0",
+            expire=UNREAD_COUNT_TTL_SECONDS
+        )
+        return count
     
     async def delete_notification(
         self,
@@ -192,13 +410,15 @@ class NotificationService:
         user_id: UUID
     ) -> bool:
         """Delete a notification (with user verification)."""
-        notification = await self.notification_repo.get_by_id(notification_id)
+        # Ownership is part of the DELETE, so the common case is one statement
+        was_read = await self.notification_repo.delete_for_user(notification_id, user_id)
+        if was_read is not None:
+            if not was_read:
+                await cache_incr_existing(UNREAD_COUNT_CACHE_NS, str(user_id), -1)
+            return True
         
-        if not notification:
+        # Not found, or someone else's
+        if not await self.notification_repo.get_by_id(notification_id):
             return False
         
-        # Verify notification belongs to user
-        if notification.user_id != user_id:
-            raise PermissionError("Cannot delete another user's notification")
-        
-        return await self.notification_repo.delete_by_id(notification_id)
+        raise PermissionError("Cannot delete another user's notification")
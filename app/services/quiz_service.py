@@ -1,12 +1,29 @@
 """Quiz service for quiz management"""
 
-from typing import List, Optional
+from typing import List, Optional, Sequence
 from uuid import UUID
 from datetime import datetime
 from app.repositories.quiz_repo import QuizRepository
 from app.db.base import Quiz, Question
 from app.core.exceptions import QuizNotFoundException, InvalidOperationException
 from app.schemas.quiz import QuestionCreate
+from app.domain.enums import QuestionType
+from app.core.cache import cache_clear
+
+# Cache namespace for the public published-quiz listing
+PUBLISHED_QUIZZES_CACHE_NS = "quizzes:published"
+
+# Users per assignment-notification task: one broker message and one
+# bulk INSERT each, while large cohorts still spread across workers
+ASSIGNMENT_NOTIFICATION_BATCH_SIZE = 500
+
+# Per-user access decisions for one quiz; cleared when assignments change
+QUIZ_ACCESS_TTL_SECONDS = 60
+
+
+def quiz_access_cache_ns(quiz_id: UUID) -> str:
+    """Cache namespace holding the access decisions for one quiz"""
+    return f"quizzes:access:{quiz_id}"
 
 
 class QuizService:
@@ -56,20 +73,22 @@ class QuizService:
             created_by=created_by
         )
         
-        # Create questions
-        for q_data in questions:
-            await self.quiz_repo.create_question(
-                quiz_id=quiz.id,
-                question_text=q_data.question_text,
-                question_type=q_data.question_type,
-                options=q_data.options,
-                correct_answer=q_data.correct_answer,
-                points=q_data.points,
-                order=q_data.order
-            )
-        
-        # Reload quiz with questions
-        quiz = await self.quiz_repo.get_by_id(quiz.id, include_questions=True)
+        # Create all questions in one INSERT; they come back attached to the quiz
+        await self.quiz_repo.bulk_create_questions(
+            quiz,
+            [
+                {
+                    "question_text": q_data.question_text,
+                    "question_type": q_data.question_type,
+                    # TRUE_FALSE options are fixed, so they are not stored
+                    "options": None if q_data.question_type == QuestionType.TRUE_FALSE else q_data.options,
+                    "correct_answer": q_data.correct_answer,
+                    "points": q_data.points,
+                    "order": q_data.order
+                }
+                for q_data in questions
+            ]
+        )
         return quiz
     
     async def get_quiz(self, quiz_id: UUID) -> Quiz:
@@ -90,11 +109,11 @@ class QuizService:
             raise QuizNotFoundException(details={"quiz_id": str(quiz_id)})
         return quiz
     
-    async def get_published_quizzes(self, skip: int = 0, limit: int = 100) -> List[Quiz]:
+    async def get_published_quizzes(self, skip: int = 0, limit: int = 100) -> Sequence[Quiz]:
         """Get all published quizzes"""
         return await self.quiz_repo.get_published_quizzes(skip, limit)
     
-    async def get_all_quizzes(self, skip: int = 0, limit: int = 100) -> List[Quiz]:
+    async def get_all_quizzes(self, skip: int = 0, limit: int = 100) -> Sequence[Quiz]:
         """Get all quizzes (admin only)"""
         return await self.quiz_repo.get_all_quizzes(skip, limit)
     
@@ -129,32 +148,34 @@ class QuizService:
             QuizNotFoundException: If quiz not found
             InvalidOperationException: If quiz is already published
         """
-        quiz = await self.get_quiz(quiz_id)
-        
-        # Prevent updating published quizzes
-        if quiz.is_published:
-            raise InvalidOperationException(
-                message="Cannot update published quiz",
-                details={"quiz_id": str(quiz_id)}
-            )
+        fields = {
+            "title": title,
+            "description": description,
+            "duration_minutes": duration_minutes,
+            "passing_score": passing_score,
+            "randomize_questions": randomize_questions,
+            "randomize_options": randomize_options,
+            "max_attempts": max_attempts
+        }
+        values = {name: value for name, value in fields.items() if value is not None}
         
-        # Update fields
-        if title is not None:
-            quiz.title = title
-        if description is not None:
-            quiz.description = description
-        if duration_minutes is not None:
-            quiz.duration_minutes = duration_minutes
-        if passing_score is not None:
-            quiz.passing_score = passing_score
-        if randomize_questions is not None:
-            quiz.randomize_questions = randomize_questions
-        if randomize_options is not None:
-            quiz.randomize_options = randomize_options
-        if max_attempts is not None:
-            quiz.max_attempts = max_attempts
+        # Single UPDATE guarded on is_published; only a miss needs a read
+        updated = await self.quiz_repo.update_unpublished(quiz_id, values) if values else None
+        if updated is None:
+            quiz = await self.get_quiz(quiz_id)
+            
+            # Prevent updating published quizzes
+            if quiz.is_published:
+                raise InvalidOperationException(
+                    message="Cannot update published quiz",
+                    details={"quiz_id": str(quiz_id)}
+                )
+            
+            # Nothing to change
+            return quiz
         
-        return await self.quiz_repo.update(quiz)
+        await cache_clear(PUBLISHED_QUIZZES_CACHE_NS)
+        return updated
     
     async def publish_quiz(self, quiz_id: UUID) -> Quiz:
         """
@@ -173,11 +194,13 @@ class QuizService:
         if not quiz:
             raise QuizNotFoundException(details={"quiz_id": str(quiz_id)})
         
+        await cache_clear(PUBLISHED_QUIZZES_CACHE_NS)
+        
         # Trigger notification to assigned users (Celery task)
         from app.workers.celery_app import celery_app
         celery_app.send_task(
             "notifications.send_quiz_published",
-            args=[str(quiz_id)]
+            args=[quiz_id.hex]
         )
         
         return quiz
@@ -198,6 +221,8 @@ class QuizService:
         deleted = await self.quiz_repo.delete(quiz_id)
         if not deleted:
             raise QuizNotFoundException(details={"quiz_id": str(quiz_id)})
+        await cache_clear(PUBLISHED_QUIZZES_CACHE_NS)
+        await cache_clear(quiz_access_cache_ns(quiz_id))
         return True
     
     # Quiz Assignment Methods
@@ -224,20 +249,23 @@ class QuizService:
         # Verify quiz exists
         await self.get_quiz(quiz_id)
         
-        # Assign to each user
-        for user_id in user_ids:
-            await self.quiz_repo.assign_quiz(
-                quiz_id=quiz_id,
-                user_id=user_id,
-                assigned_by=assigned_by,
-                due_date=due_date
-            )
-            
-            # Send notification to assigned user (Celery task)
-            from app.workers.celery_app import celery_app
+        # Assign all users in one statement
+        await self.quiz_repo.assign_quiz(
+            quiz_id=quiz_id,
+            user_ids=user_ids,
+            assigned_by=assigned_by,
+            due_date=due_date
+        )
+        await cache_clear(quiz_access_cache_ns(quiz_id))
+        
+        # Notify assigned users in batches (one Celery task and bulk INSERT each)
+        from app.workers.celery_app import celery_app
+        # Ids travel as UUID.hex (32 chars, vs 36 for str()); UUID() parses either
+        notify_ids = [user_id.hex for user_id in dict.fromkeys(user_ids)]
+        for start in range(0, len(notify_ids), ASSIGNMENT_NOTIFICATION_BATCH_SIZE):
             celery_app.send_task(
-                "notifications.send_quiz_assigned",
-                args=[str(user_id), str(quiz_id)]
+                "notifications.send_quiz_assigned_many",
+                args=[notify_ids[start:start + ASSIGNMENT_NOTIFICATION_BATCH_SIZE], quiz_id.hex]
             )
         
         return {
@@ -257,12 +285,14 @@ class QuizService:
         Returns:
             True if revoked
         """
-        return await self.quiz_repo.revoke_assignment(quiz_id, user_id)
+        revoked = await self.quiz_repo.revoke_assignments(quiz_id, [user_id])
+        await cache_clear(quiz_access_cache_ns(quiz_id))
+        return revoked > 0
     
     async def get_quiz_assignments(self, quiz_id: UUID):
         """Get all assignments for a quiz"""
         return await self.quiz_repo.get_quiz_assignments(quiz_id)
     
-    async def get_user_quizzes(self, user_id: UUID) -> List[Quiz]:
+    async def get_user_quizzes(self, user_id: UUID) -> Sequence[Quiz]:
         """Get quizzes assigned to a user or public quizzes"""
         return await self.quiz_repo.get_user_quizzes(user_id)
@@ -1,10 +1,10 @@
 """Scoring service for quiz evaluation"""
 
 from typing import List
-from uuid import UUID
 from app.repositories.attempt_repo import AttemptRepository
 from app.repositories.quiz_repo import QuizRepository
-from app.db.base import Answer
+from app.db.base import Answer, Attempt
+from app.core.exceptions import QuizNotFoundException
 
 
 class ScoringService:
@@ -14,12 +14,12 @@ class ScoringService:
         self.attempt_repo = attempt_repo
         self.quiz_repo = quiz_repo
     
-    async def calculate_score(self, attempt_id: UUID) -> dict:
+    async def calculate_score(self, attempt: Attempt) -> dict:
         """
         Calculate score for a quiz attempt
         
         Args:
-            attempt_id: Attempt ID
+            attempt: Attempt with answers loaded
             
         Returns:
             Dictionary with scoring details:
@@ -27,72 +27,57 @@ class ScoringService:
             - total_points: Total possible points
             - percentage: Percentage score
             - passed: Whether user passed
+            - graded: answer_id -> is_correct for every scored answer
+              (persisted by AttemptRepository.finalize_attempt)
+            
+        Raises:
+            QuizNotFoundException: If the attempt's quiz no longer exists
         """
-        # Get attempt with answers
-        attempt = await self.attempt_repo.get_by_id(attempt_id, include_answers=True)
-        if not attempt:
-            raise ValueError("Attempt not found")
-        
-        # Get quiz questions
-        questions = await self.quiz_repo.get_questions(attempt.quiz_id)
-        question_dict = {q.id: q for q in questions}
+        # Passing score and question key come back in one query
+        answer_key_row = await self.quiz_repo.get_answer_key(attempt.quiz_id)
+        if answer_key_row is None:
+            raise QuizNotFoundException(details={"quiz_id": str(attempt.quiz_id)})
+        passing_score, questions = answer_key_row
+        # Normalize each correct answer once: question_id -> (answer, points)
+        answer_key = {
+            q.id: (self._normalize_answer(q.correct_answer), q.points)
+            for q in questions
+        }
         
         # Calculate score
         score = 0
         total_points = sum(q.points for q in questions)
+        graded = {}
         
         for answer in attempt.answers:
-            question = question_dict.get(answer.question_id)
-            if not question:
+            key = answer_key.get(answer.question_id)
+            if key is None:
                 continue
+            correct_answer, points = key
             
-            # Check if answer is correct
-            is_correct = self._check_answer(
-                answer.selected_answer,
-                question.correct_answer,
-                question.question_type
-            )
-            
-            # Update answer correctness
-            answer.is_correct = is_correct
+            # Check if answer is correct and record answer correctness
+            # (already-normalized selections skip the strip/lower copy)
+            selected = answer.selected_answer
+            is_correct = selected == correct_answer or self._normalize_answer(selected) == correct_answer
+            graded[answer.id] = is_correct
             
             # Add points if correct
             if is_correct:
-                score += question.points
+                score += points
         
         # Calculate percentage
         percentage = (score / total_points * 100) if total_points > 0 else 0
-        
-        # Get quiz for passing score
-        quiz = await self.quiz_repo.get_by_id(attempt.quiz_id, include_questions=False)
-        passed = percentage >= quiz.passing_score
+        passed = percentage >= passing_score
         
         return {
             "score": score,
             "total_points": total_points,
             "percentage": round(percentage, 2),
-            "passed": passed
+            "passed": passed,
+            "graded": graded
         }
     
-    def _check_answer(
-        self,
-        selected_answer: str,
-        correct_answer: str,
-        question_type: str
-    ) -> bool:
-        """
-        Check if selected answer is correct
-        
-        Args:
-            selected_answer: User's selected answer
-            correct_answer: Correct answer
-            question_type: Type of question
-            
-        Returns:
-            True if correct, False otherwise
-        """
-        # Normalize answers for comparison (case-insensitive, trimmed)
-        selected = selected_answer.strip().lower()
-        correct = correct_answer.strip().lower()
-        
-        return selected == correct
+    @staticmethod
+    def _normalize_answer(answer: str) -> str:
+        """Normalize an answer for comparison (case-insensitive, trimmed)"""
+        return answer.strip().lower()
@@ -2,7 +2,7 @@
 
 import pytest
 import asyncio
-from typing import AsyncGenerator
+from typing import AsyncGenerator, Awaitable, Callable
 from httpx import AsyncClient
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from app.main import app
@@ -10,6 +10,10 @@ from app.db.base import SQLModel
 from app.db.session import get_db
 from app.core.config import settings
 
+# Minimum bcrypt cost: hashes are read at call time, so this covers the
+# registration hash and the login dummy hash without touching production
+settings.BCRYPT_ROUNDS = 4
+
 # Test database URL
 TEST_DATABASE_URL = "sqlite+aiosqlite:///:memory:"
 
@@ -60,6 +64,44 @@ async def client(db_session: AsyncSession) -> AsyncGenerator[AsyncClient, None]:
     app.dependency_overrides.clear()
 
 
+# Password of every user registered through auth_headers
+TEST_PASSWORD = "Test123456"
+
+
+@pytest.fixture(scope="function")
+def login(client: AsyncClient) -> Callable[[str], Awaitable[dict]]:
+    """Log in the user registered as `name`, returning the token pair"""
+    async def _login(name: str) -> dict:
+        response = await client.post(f"{settings.API_V1_PREFIX}/auth/login", json={
+            "email": f"{name}@example.com",
+            "password": TEST_PASSWORD
+        })
+        assert response.status_code == 200
+        return response.json()
+    
+    return _login
+
+
+@pytest.fixture(scope="function")
+def auth_headers(
+    client: AsyncClient,
+    login: Callable[[str], Awaitable[dict]]
+) -> Callable[[str], Awaitable[dict]]:
+    """Register a user named `name` and log in, returning bearer headers"""
+    async def _auth_headers(name: str) -> dict:
+        response = await client.post(f"{settings.API_V1_PREFIX}/auth/register", json={
+            "email": f"{name}@example.com",
+            "username": name,
+            "password": TEST_PASSWORD,
+            "role": "user"
+        })
+        assert response.status_code == 201
+        tokens = await login(name)
+        return {"Authorization": f"Bearer {tokens['access_token']}"}
+    
+    return _auth_headers
+
+
 @pytest.fixture(scope="session")
 def event_loop():
     """Create event loop for async tests"""
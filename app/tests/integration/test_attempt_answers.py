@@ -0,0 +1,242 @@
+"""Integration tests for answering and submitting attempts"""
+
+import pytest
+from datetime import datetime, timedelta
+from uuid import UUID
+from httpx import AsyncClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.core.clock import utcnow
+from app.core.exceptions import AlreadySubmittedException
+from app.db.base import Answer, Attempt, Question, Quiz
+from app.domain.enums import AttemptStatus, QuestionType
+from app.repositories.attempt_repo import AttemptRepository
+from app.repositories.quiz_repo import QuizRepository
+from app.repositories.result_repo import ResultRepository
+from app.services.attempt_service import AttemptService
+from app.services.scoring_service import ScoringService
+from app.workers.celery_app import celery_app
+
+
+async def _create_quiz(db_session: AsyncSession, creator_id: UUID) -> Quiz:
+    """Create a published public quiz with two true/false questions"""
+    quiz = Quiz(
+        title="Bulk answers quiz",
+        description="Quiz used by the answer submission tests",
+        duration_minutes=10,
+        passing_score=50,
+        is_public=True,
+        is_published=True,
+        created_by=creator_id
+    )
+    quiz.questions = [
+        Question(
+            question_text=f"Statement number {order}",
+            question_type=QuestionType.TRUE_FALSE,
+            correct_answer="true",
+            order=order
+        )
+        for order in range(2)
+    ]
+    db_session.add(quiz)
+    await db_session.commit()
+    return quiz
+
+
+@pytest.fixture
+def sent_tasks(monkeypatch) -> list:
+    """Record Celery tasks instead of publishing them to the broker"""
+    sent = []
+    monkeypatch.setattr(celery_app, "send_task", lambda name, **kwargs: sent.append((name, kwargs)))
+    return sent
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("sent_tasks")
+async def test_bulk_answers(client: AsyncClient, db_session: AsyncSession, auth_headers):
+    """Test bulk submission upserts answers, last answer winning"""
+    headers = await auth_headers("bulkowner")
+    me = (await client.get(f"{settings.API_V1_PREFIX}/auth/me", headers=headers)).json()
+    quiz = await _create_quiz(db_session, UUID(me["id"]))
+    first, second = (str(q.id) for q in sorted(quiz.questions, key=lambda q: q.order))
+
+    response = await client.post(
+        f"{settings.API_V1_PREFIX}/attempts/quizzes/{quiz.id}/start", headers=headers
+    )
+    assert response.status_code == 201
+    attempt_id = response.json()["id"]
+    url = f"{settings.API_V1_PREFIX}/attempts/{attempt_id}/answers/bulk"
+
+    # Duplicate question ids: the last answer wins
+    response = await client.post(url, headers=headers, json={"answers": [
+        {"question_id": first, "selected_answer": "false"},
+        {"question_id": second, "selected_answer": "true"},
+        {"question_id": first, "selected_answer": "true"}
+    ]})
+    assert response.status_code == 200
+    answers = {a["question_id"]: a for a in response.json()}
+    assert len(answers) == 2
+    assert answers[first]["selected_answer"] == "true"
+    assert answers[second]["selected_answer"] == "true"
+
+    # Re-answering updates the existing row instead of adding one
+    response = await client.post(url, headers=headers, json={"answers": [
+        {"question_id": second, "selected_answer": "false"}
+    ]})
+    assert response.status_code == 200
+    (answer,) = response.json()
+    assert answer["id"] == answers[second]["id"]
+    assert answer["selected_answer"] == "false"
+
+    rows = (await db_session.execute(
+        select(Answer).where(Answer.attempt_id == UUID(attempt_id))
+    )).scalars().all()
+    assert {str(row.question_id): row.selected_answer for row in rows} == {
+        first: "true",
+        second: "false"
+    }
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("sent_tasks")
+async def test_bulk_answers_rejects_foreign_and_expired_attempts(
+    client: AsyncClient,
+    db_session: AsyncSession,
+    auth_headers
+):
+    """Test another user's attempt is not found and an expired one is rejected"""
+    headers = await auth_headers("bulkowner")
+    other_headers = await auth_headers("bulkother")
+    me = (await client.get(f"{settings.API_V1_PREFIX}/auth/me", headers=headers)).json()
+    quiz = await _create_quiz(db_session, UUID(me["id"]))
+    question_id = str(quiz.questions[0].id)
+
+    response = await client.post(
+        f"{settings.API_V1_PREFIX}/attempts/quizzes/{quiz.id}/start", headers=headers
+    )
+    attempt_id = response.json()["id"]
+    url = f"{settings.API_V1_PREFIX}/attempts/{attempt_id}/answers/bulk"
+    body = {"answers": [{"question_id": question_id, "selected_answer": "true"}]}
+
+    # Someone else's attempt looks like a missing one
+    response = await client.post(url, headers=other_headers, json=body)
+    assert response.status_code == 404
+
+    # Past its deadline the attempt is auto-submitted and the answers refused
+    attempt = await db_session.get(Attempt, UUID(attempt_id))
+    attempt.expires_at = utcnow() - timedelta(seconds=1)
+    await db_session.commit()
+
+    response = await client.post(url, headers=headers, json=body)
+    assert response.status_code == 400
+
+    await db_session.refresh(attempt)
+    assert attempt.is_submitted is True
+
+
+@pytest.mark.asyncio
+async def test_deferred_submit_closes_attempt_before_grading(
+    client: AsyncClient,
+    db_session: AsyncSession,
+    sent_tasks: list,
+    auth_headers
+):
+    """Test ?defer=true submits at request time and queues one grading task"""
+    headers = await auth_headers("deferowner")
+    me = (await client.get(f"{settings.API_V1_PREFIX}/auth/me", headers=headers)).json()
+    quiz = await _create_quiz(db_session, UUID(me["id"]))
+    question_id = str(quiz.questions[0].id)
+
+    response = await client.post(
+        f"{settings.API_V1_PREFIX}/attempts/quizzes/{quiz.id}/start", headers=headers
+    )
+    attempt_id = response.json()["id"]
+    answers_url = f"{settings.API_V1_PREFIX}/attempts/{attempt_id}/answers"
+    submit_url = f"{settings.API_V1_PREFIX}/attempts/{attempt_id}/submit"
+
+    response = await client.post(answers_url, headers=headers, json={
+        "question_id": question_id, "selected_answer": "true"
+    })
+    assert response.status_code == 200
+
+    response = await client.post(submit_url, headers=headers, params={"defer": "true"})
+    assert response.status_code == 202
+
+    # The attempt is closed before any worker runs
+    attempt = await db_session.get(Attempt, UUID(attempt_id))
+    await db_session.refresh(attempt)
+    assert attempt.is_submitted is True
+    assert attempt.status == AttemptStatus.SUBMITTED
+    assert attempt.submitted_at is not None
+
+    response = await client.post(answers_url, headers=headers, json={
+        "question_id": question_id, "selected_answer": "false"
+    })
+    assert response.status_code == 409
+
+    # A repeated deferred submit is rejected and queues nothing
+    response = await client.post(submit_url, headers=headers, params={"defer": "true"})
+    assert response.status_code == 409
+
+    score_tasks = [kw["args"] for name, kw in sent_tasks if name.endswith(".score_attempt")]
+    assert len(score_tasks) == 1
+    task_attempt_id, task_user_id, task_submitted_at = score_tasks[0]
+    assert UUID(task_attempt_id) == attempt.id
+    assert datetime.fromisoformat(task_submitted_at) == attempt.submitted_at
+
+    # The worker grades with the recorded submission time, exactly once
+    attempt_repo = AttemptRepository(db_session)
+    quiz_repo = QuizRepository(db_session)
+    service = AttemptService(
+        attempt_repo, quiz_repo, ResultRepository(db_session), ScoringService(attempt_repo, quiz_repo)
+    )
+    submitted_at = datetime.fromisoformat(task_submitted_at)
+    result = await service.submit_attempt(
+        attempt.id, user_id=UUID(task_user_id), submitted_at=submitted_at
+    )
+    assert result["score"] == 1
+
+    await db_session.refresh(attempt)
+    assert attempt.submitted_at == submitted_at
+    assert attempt.time_taken_seconds == int((submitted_at - attempt.started_at).total_seconds())
+
+    with pytest.raises(AlreadySubmittedException):
+        await service.submit_attempt(
+            attempt.id, user_id=UUID(task_user_id), submitted_at=submitted_at
+        )
+
+
+@pytest.mark.asyncio
+async def test_deferred_submit_grades_inline_when_queueing_fails(
+    client: AsyncClient,
+    db_session: AsyncSession,
+    monkeypatch,
+    auth_headers
+):
+    """Test a deferred submit whose grading task cannot be sent is graded in the request"""
+    def _send_task(name, **kwargs):
+        if name.endswith(".score_attempt"):
+            raise ConnectionError("broker unavailable")
+
+    monkeypatch.setattr(celery_app, "send_task", _send_task)
+    headers = await auth_headers("deferfallback")
+    me = (await client.get(f"{settings.API_V1_PREFIX}/auth/me", headers=headers)).json()
+    quiz = await _create_quiz(db_session, UUID(me["id"]))
+
+    response = await client.post(
+        f"{settings.API_V1_PREFIX}/attempts/quizzes/{quiz.id}/start", headers=headers
+    )
+    attempt_id = response.json()["id"]
+
+    response = await client.post(
+        f"{settings.API_V1_PREFIX}/attempts/{attempt_id}/submit",
+        headers=headers,
+        params={"defer": "true"}
+    )
+    assert response.status_code == 202
+
+    attempt = await db_session.get(Attempt, UUID(attempt_id))
+    await db_session.refresh(attempt)
+    assert attempt.status == AttemptStatus.SUBMITTED
+    assert attempt.time_taken_seconds == int((attempt.submitted_at - attempt.started_at).total_seconds())
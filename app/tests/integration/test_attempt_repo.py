@@ -0,0 +1,92 @@
+"""Integration tests for the attempt repository"""
+
+import pytest
+from datetime import timedelta
+from uuid import uuid4
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.repositories.attempt_repo import AttemptRepository
+from app.domain.enums import AttemptStatus
+from app.core.clock import utcnow
+
+
+async def _finalize(repo: AttemptRepository, attempt) -> None:
+    """Finalize an attempt with a fixed result"""
+    await repo.finalize_attempt(
+        attempt,
+        score=1,
+        total_points=2,
+        percentage=50.0,
+        passed=False,
+        submitted_at=utcnow(),
+        time_taken_seconds=60,
+        graded={}
+    )
+
+
+@pytest.mark.asyncio
+async def test_finalize_moves_in_progress_attempt_to_submitted(db_session: AsyncSession):
+    """Test finalizing an in-progress attempt marks it submitted"""
+    repo = AttemptRepository(db_session)
+    attempt = await repo.create(uuid4(), uuid4(), utcnow() + timedelta(minutes=10))
+
+    await _finalize(repo, attempt)
+
+    attempt = await repo.get_by_id(attempt.id, include_answers=False)
+    assert attempt.is_submitted is True
+    assert attempt.status == AttemptStatus.SUBMITTED
+
+
+@pytest.mark.asyncio
+async def test_finalize_keeps_expired_status(db_session: AsyncSession):
+    """Test an attempt expired by the periodic job stays EXPIRED once scored"""
+    repo = AttemptRepository(db_session)
+    attempt = await repo.create(uuid4(), uuid4(), utcnow() - timedelta(minutes=1))
+
+    expired = await repo.expire_overdue_attempts()
+    assert [row.id for row in expired] == [attempt.id]
+
+    attempt = await repo.get_for_update(attempt.id)
+    await _finalize(repo, attempt)
+
+    attempt = await repo.get_by_id(attempt.id, include_answers=False)
+    assert attempt.is_submitted is True
+    assert attempt.status == AttemptStatus.EXPIRED
+
+
+@pytest.mark.asyncio
+async def test_unscored_expired_attempts_until_scored(db_session: AsyncSession):
+    """Test expired attempts are listed for rescoring until they are scored"""
+    repo = AttemptRepository(db_session)
+    expires_at = utcnow() - timedelta(minutes=10)
+    attempt = await repo.create(uuid4(), uuid4(), expires_at)
+    await repo.create(uuid4(), uuid4(), utcnow() + timedelta(minutes=10))
+
+    (expired,) = await repo.expire_overdue_attempts()
+    assert tuple(expired) == (attempt.id, expires_at)
+
+    # Recently expired attempts are left to their own scoring task
+    assert await repo.get_unscored_expired_attempts(expires_at) == []
+    unscored = await repo.get_unscored_expired_attempts(utcnow())
+    assert [tuple(row) for row in unscored] == [(attempt.id, expires_at)]
+
+    attempt = await repo.get_for_update(attempt.id)
+    await _finalize(repo, attempt)
+    assert await repo.get_unscored_expired_attempts(utcnow()) == []
+
+
+@pytest.mark.asyncio
+async def test_ungraded_submitted_attempts_until_graded(db_session: AsyncSession):
+    """Test deferred submissions are listed for regrading until they are graded"""
+    repo = AttemptRepository(db_session)
+    attempt = await repo.create(uuid4(), uuid4(), utcnow() + timedelta(minutes=10))
+    submitted_at = utcnow() - timedelta(minutes=10)
+    await repo.mark_submitted(attempt, submitted_at)
+
+    # Recent submissions are left to their own grading task
+    assert await repo.get_ungraded_submitted_attempts(submitted_at) == []
+    ungraded = await repo.get_ungraded_submitted_attempts(utcnow())
+    assert [tuple(row) for row in ungraded] == [(attempt.id, attempt.user_id, submitted_at)]
+
+    attempt = await repo.get_for_update(attempt.id)
+    await _finalize(repo, attempt)
+    assert await repo.get_ungraded_submitted_attempts(utcnow()) == []
@@ -0,0 +1,50 @@
+"""Integration tests for ETag / conditional GET handling"""
+
+import pytest
+from httpx import AsyncClient
+from app.core.config import settings
+
+
+@pytest.mark.asyncio
+async def test_json_get_returns_etag_and_304_on_match(client: AsyncClient, auth_headers):
+    """Test GET responses carry an ETag and a matching If-None-Match gets 304"""
+    headers = await auth_headers("etaguser")
+
+    # A POST is not a GET, so it carries no ETag
+    response = await client.post(f"{settings.API_V1_PREFIX}/auth/login", json={
+        "email": "etaguser@example.com",
+        "password": "Test123456"
+    })
+    assert response.status_code == 200
+    assert "etag" not in response.headers
+
+    url = f"{settings.API_V1_PREFIX}/auth/me"
+
+    response = await client.get(url, headers=headers)
+    assert response.status_code == 200
+    etag = response.headers["etag"]
+    assert response.headers["cache-control"] == "private, no-cache"
+
+    # Same body -> same ETag
+    response = await client.get(url, headers=headers)
+    assert response.headers["etag"] == etag
+
+    # Strong and weak validators both match
+    for validator in (etag, f"W/{etag}", f'"other", {etag}'):
+        response = await client.get(url, headers={**headers, "If-None-Match": validator})
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["etag"] == etag
+
+    # A stale validator gets the full body
+    response = await client.get(url, headers={**headers, "If-None-Match": '"stale"'})
+    assert response.status_code == 200
+    assert response.json()["email"] == "etaguser@example.com"
+
+
+@pytest.mark.asyncio
+async def test_error_responses_have_no_etag(client: AsyncClient):
+    """Test non-200 GET responses pass through untouched"""
+    response = await client.get(f"{settings.API_V1_PREFIX}/auth/me")
+    assert response.status_code in [401, 403]
+    assert "etag" not in response.headers
@@ -0,0 +1,46 @@
+"""Integration tests for the notification repository"""
+
+import pytest
+from uuid import uuid4
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.base import Notification
+from app.domain.notification_types import NotificationType
+from app.repositories.notification_repo import NotificationRepository, _COPY_THRESHOLD
+
+
+def _notification(user_id, index: int) -> dict:
+    """Notification row as passed to bulk_create"""
+    return {
+        "user_id": user_id,
+        "type": NotificationType.RESULT_AVAILABLE,
+        "title": f"Result {index}",
+        "message": f"Result message {index}",
+        "quiz_id": uuid4()
+    }
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_inserts_every_row(db_session: AsyncSession):
+    """Test a large batch is written (executemany INSERT off asyncpg)"""
+    repo = NotificationRepository(db_session)
+    user_id = uuid4()
+    count = _COPY_THRESHOLD + 5
+
+    inserted = await repo.bulk_create([_notification(user_id, i) for i in range(count)])
+    assert inserted == count
+
+    rows = (await db_session.execute(
+        select(Notification).where(Notification.user_id == user_id)
+    )).scalars().all()
+    assert len(rows) == count
+    assert {row.title for row in rows} == {f"Result {i}" for i in range(count)}
+    # Defaults normally filled by the model are set for Core inserts too
+    assert len({row.id for row in rows}) == count
+    assert all(row.is_read is False and row.created_at is not None for row in rows)
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_empty_batch(db_session: AsyncSession):
+    """Test an empty batch writes nothing"""
+    assert await NotificationRepository(db_session).bulk_create([]) == 0
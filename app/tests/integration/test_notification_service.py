@@ -0,0 +1,58 @@
+"""Integration tests for the notification service"""
+
+import pytest
+from uuid import UUID, uuid4
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.base import Notification
+from app.domain.notification_types import NotificationType
+from app.services.notification_service import NotificationService
+
+
+async def _create_notification(service: NotificationService, user_id: UUID) -> Notification:
+    """Create an unread notification for a user"""
+    return await service.create_notification(
+        user_id=user_id,
+        type=NotificationType.RESULT_AVAILABLE,
+        title="Result",
+        message="Your result is available"
+    )
+
+
+@pytest.mark.asyncio
+async def test_mark_as_read_checks_ownership(db_session: AsyncSession):
+    """Test marking as read: owner succeeds, others get PermissionError, unknown ids None"""
+    service = NotificationService(db_session)
+    owner_id, other_id = uuid4(), uuid4()
+    notification = await _create_notification(service, owner_id)
+
+    with pytest.raises(PermissionError):
+        await service.mark_as_read(notification.id, other_id)
+
+    updated = await service.mark_as_read(notification.id, owner_id)
+    assert updated.id == notification.id
+    assert updated.is_read is True
+    assert updated.read_at is not None
+
+    # Already read: the notification is returned unchanged
+    again = await service.mark_as_read(notification.id, owner_id)
+    assert again.id == notification.id
+    assert again.read_at == updated.read_at
+
+    assert await service.mark_as_read(uuid4(), owner_id) is None
+
+
+@pytest.mark.asyncio
+async def test_delete_notification_checks_ownership(db_session: AsyncSession):
+    """Test deleting: others get PermissionError and the row survives; unknown ids are False"""
+    service = NotificationService(db_session)
+    owner_id, other_id = uuid4(), uuid4()
+    notification = await _create_notification(service, owner_id)
+
+    with pytest.raises(PermissionError):
+        await service.delete_notification(notification.id, other_id)
+    assert await service.notification_repo.get_by_id(notification.id) is not None
+
+    assert await service.delete_notification(notification.id, owner_id) is True
+    assert await service.notification_repo.get_by_id(notification.id) is None
+
+    assert await service.delete_notification(notification.id, owner_id) is False
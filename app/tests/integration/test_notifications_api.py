@@ -0,0 +1,69 @@
+"""Integration tests for the notifications API"""
+
+import pytest
+from uuid import UUID
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.domain.notification_types import NotificationType
+from app.repositories.notification_repo import NotificationRepository
+
+
+@pytest.mark.asyncio
+async def test_cursor_pages_cover_every_notification_once(
+    client: AsyncClient,
+    db_session: AsyncSession,
+    auth_headers
+):
+    """Test following next_cursor walks all notifications newest first without repeats"""
+    headers = await auth_headers("pageruser")
+    url = f"{settings.API_V1_PREFIX}/notifications/"
+    me = (await client.get(f"{settings.API_V1_PREFIX}/auth/me", headers=headers)).json()
+
+    # One batch shares created_at, so ordering falls back to the id
+    await NotificationRepository(db_session).bulk_create([
+        {
+            "user_id": UUID(me["id"]),
+            "type": NotificationType.RESULT_AVAILABLE,
+            "title": f"Result {i}",
+            "message": "Your result is available"
+        }
+        for i in range(5)
+    ])
+
+    response = await client.get(url, headers=headers, params={"limit": 5})
+    assert response.status_code == 200
+    everything = [n["id"] for n in response.json()["notifications"]]
+    assert len(everything) == 5
+
+    # The first page is an offset page with the total count...
+    response = await client.get(url, headers=headers, params={"limit": 2})
+    page = response.json()
+    assert page["total"] == 5
+    seen = [n["id"] for n in page["notifications"]]
+
+    # ...later pages seek past the cursor and skip counting
+    while page["next_cursor"] is not None:
+        response = await client.get(
+            url, headers=headers, params={"limit": 2, "cursor": page["next_cursor"]}
+        )
+        assert response.status_code == 200
+        page = response.json()
+        assert page["total"] is None
+        seen.extend(n["id"] for n in page["notifications"])
+
+    assert seen == everything
+
+
+@pytest.mark.asyncio
+async def test_malformed_cursor_is_rejected(client: AsyncClient, auth_headers):
+    """Test a cursor that does not decode answers 400"""
+    headers = await auth_headers("pageruser")
+
+    for cursor in ("not-a-cursor", "bm90fGF8Y3Vyc29y"):
+        response = await client.get(
+            f"{settings.API_V1_PREFIX}/notifications/",
+            headers=headers,
+            params={"cursor": cursor}
+        )
+        assert response.status_code == 400
@@ -0,0 +1,51 @@
+"""Integration tests for token invalidation on logout"""
+
+import pytest
+from httpx import AsyncClient
+from app.core.config import settings
+
+
+@pytest.mark.asyncio
+async def test_logout_invalidates_tokens_of_every_session(
+    client: AsyncClient,
+    auth_headers,
+    login
+):
+    """Test logout revokes access and refresh tokens issued before it"""
+    # Two independent sessions of the same user
+    first_headers = await auth_headers("logoutuser")
+    second = await login("logoutuser")
+
+    # Logging out from the first session...
+    response = await client.post(
+        f"{settings.API_V1_PREFIX}/auth/logout", headers=first_headers
+    )
+    assert response.status_code == 204
+
+    # ...rejects the access token of the second one
+    response = await client.get(
+        f"{settings.API_V1_PREFIX}/auth/me",
+        headers={"Authorization": f"Bearer {second['access_token']}"}
+    )
+    assert response.status_code == 401
+
+    # ...and its refresh token
+    response = await client.post(
+        f"{settings.API_V1_PREFIX}/auth/refresh",
+        json={"refresh_token": second["refresh_token"]}
+    )
+    assert response.status_code == 401
+
+    # Tokens issued after the logout work again
+    third = await login("logoutuser")
+    response = await client.get(
+        f"{settings.API_V1_PREFIX}/auth/me",
+        headers={"Authorization": f"Bearer {third['access_token']}"}
+    )
+    assert response.status_code == 200
+
+    response = await client.post(
+        f"{settings.API_V1_PREFIX}/auth/refresh",
+        json={"refresh_token": third["refresh_token"]}
+    )
+    assert response.status_code == 200
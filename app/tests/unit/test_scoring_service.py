@@ -1,59 +1,132 @@
 """Unit tests for scoring service"""
 
 import pytest
+from types import SimpleNamespace
 from uuid import uuid4
 from app.services.scoring_service import ScoringService
+from app.core.exceptions import QuizNotFoundException
+
+
+class StubQuizRepo:
+    """Quiz repository returning a fixed answer key"""
+
+    def __init__(self, answer_key):
+        self.answer_key = answer_key
+
+    async def get_answer_key(self, quiz_id):
+        return self.answer_key
+
+
+def _question(correct_answer: str, question_type: str = "mcq", points: int = 1):
+    """Answer key row as returned by QuizRepository.get_answer_key"""
+    return SimpleNamespace(
+        id=uuid4(),
+        points=points,
+        correct_answer=correct_answer,
+        question_type=question_type
+    )
+
+
+def _attempt(*selections):
+    """Attempt answering (question, selected_answer) pairs"""
+    return SimpleNamespace(
+        quiz_id=uuid4(),
+        answers=[
+            SimpleNamespace(id=uuid4(), question_id=question.id, selected_answer=selected)
+            for question, selected in selections
+        ]
+    )
+
+
+async def _score(passing_score: int, questions, attempt) -> dict:
+    """Score an attempt against a stubbed answer key"""
+    service = ScoringService(None, StubQuizRepo((passing_score, questions)))
+    return await service.calculate_score(attempt)
 
 
 class TestScoringService:
     """Test cases for ScoringService"""
-    
-    def test_check_answer_mcq_correct(self):
+
+    async def test_calculate_score_mcq_correct(self):
         """Test correct MCQ answer"""
-        service = ScoringService(None, None)
-        result = service._check_answer(
-            selected_answer="Option A",
-            correct_answer="Option A",
-            question_type="mcq"
-        )
-        assert result is True
-    
-    def test_check_answer_mcq_incorrect(self):
+        question = _question("Option A")
+        attempt = _attempt((question, "Option A"))
+
+        result = await _score(50, [question], attempt)
+
+        assert result["score"] == 1
+        assert result["graded"] == {attempt.answers[0].id: True}
+
+    async def test_calculate_score_mcq_incorrect(self):
         """Test incorrect MCQ answer"""
-        service = ScoringService(None, None)
-        result = service._check_answer(
-            selected_answer="Option B",
-            correct_answer="Option A",
-            question_type="mcq"
-        )
-        assert result is False
-    
-    def test_check_answer_case_insensitive(self):
-        """Test case-insensitive answer checking"""
-        service = ScoringService(None, None)
-        result = service._check_answer(
-            selected_answer="option a",
-            correct_answer="Option A",
-            question_type="mcq"
-        )
-        assert result is True
-    
-    def test_check_answer_true_false(self):
-        """Test true/false question"""
-        service = ScoringService(None, None)
-        
-        # Correct
-        result = service._check_answer(
-            selected_answer="true",
-            correct_answer="true",
-            question_type="true_false"
-        )
-        assert result is True
-        
-        # Incorrect
-        result = service._check_answer(
-            selected_answer="false",
-            correct_answer="true",
-            question_type="true_false"
-        )
-        assert result is False
+        question = _question("Option A")
+        attempt = _attempt((question, "Option B"))
+
+        result = await _score(50, [question], attempt)
+
+        assert result["score"] == 0
+        assert result["graded"] == {attempt.answers[0].id: False}
+
+    async def test_calculate_score_case_insensitive(self):
+        """Test case-insensitive, trimmed answer checking"""
+        question = _question("Option A")
+        attempt = _attempt((question, "  option a "))
+
+        result = await _score(50, [question], attempt)
+
+        assert result["graded"] == {attempt.answers[0].id: True}
+
+    async def test_calculate_score_true_false(self):
+        """Test true/false questions"""
+        correct = _question("true", question_type="true_false")
+        incorrect = _question("true", question_type="true_false")
+        attempt = _attempt((correct, "True"), (incorrect, "false"))
+
+        result = await _score(50, [correct, incorrect], attempt)
+
+        assert result["graded"] == {
+            attempt.answers[0].id: True,
+            attempt.answers[1].id: False
+        }
+
+    async def test_calculate_score_totals(self):
+        """Test points, percentage and pass mark over the whole quiz"""
+        questions = [_question("a", points=2), _question("b", points=1), _question("c", points=3)]
+        # The third question is left unanswered
+        attempt = _attempt((questions[0], "a"), (questions[1], "x"))
+
+        result = await _score(30, questions, attempt)
+
+        assert result["score"] == 2
+        assert result["total_points"] == 6
+        assert result["percentage"] == 33.33
+        assert result["passed"] is True
+
+        result = await _score(40, questions, attempt)
+        assert result["passed"] is False
+
+    async def test_calculate_score_ignores_unknown_questions(self):
+        """Test answers to questions outside the quiz are not graded"""
+        question = _question("a")
+        attempt = _attempt((question, "a"), (_question("a"), "a"))
+
+        result = await _score(50, [question], attempt)
+
+        assert result["score"] == 1
+        assert result["graded"] == {attempt.answers[0].id: True}
+
+    async def test_calculate_score_quiz_without_questions(self):
+        """Test a quiz with no questions scores zero instead of dividing by zero"""
+        result = await _score(0, [], _attempt())
+
+        assert result["score"] == 0
+        assert result["total_points"] == 0
+        assert result["percentage"] == 0
+        assert result["graded"] == {}
+
+    async def test_calculate_score_missing_quiz(self):
+        """Test scoring an attempt whose quiz is gone raises a domain error"""
+        service = ScoringService(None, StubQuizRepo(None))
+
+        with pytest.raises(QuizNotFoundException):
+            await service.calculate_score(_attempt())
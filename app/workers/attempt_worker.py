@@ -1,32 +1,152 @@
 """Attempt worker for auto-submitting expired quizzes"""
 
+from datetime import datetime, timedelta
+from typing import Optional
+from uuid import UUID
+from celery import group
 from app.workers.celery_app import celery_app
+from app.workers.notification_worker import run_in_worker_loop, run_with_db
+from app.repositories.attempt_repo import AttemptRepository
+from app.repositories.quiz_repo import QuizRepository
+from app.repositories.result_repo import ResultRepository
+from app.services.attempt_service import AttemptService
+from app.services.scoring_service import ScoringService
+from app.core.exceptions import CustomException
+from app.core.clock import utcnow
+from sqlalchemy.ext.asyncio import AsyncSession
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+# Expired attempts still unscored this long after their deadline, and
+# deferred submissions still ungraded this long after being accepted, are
+# dispatched again: their scoring task was lost or never sent
+RESCORE_EXPIRED_AFTER = timedelta(minutes=5)
+REGRADE_SUBMITTED_AFTER = timedelta(minutes=5)
+
+
 @celery_app.task(name="app.workers.attempt_worker.auto_submit_expired_attempts")
 def auto_submit_expired_attempts():
     """
-    Periodic task to auto-submit expired quiz attempts
+    Periodic task to expire overdue quiz attempts and score them
     Runs every minute
+    
+    One UPDATE ... RETURNING (served by the partial expires_at index)
+    flips the overdue attempts; scoring then fans out in parallel,
+    together with earlier expired attempts that never got a result and
+    deferred submissions whose grading task was lost.
     """
     logger.info("Checking for expired quiz attempts")
+    to_score = {}
+    ungraded = []
+    counts = {}
+    
+    async def _work(db: AsyncSession) -> None:
+        attempt_repo = AttemptRepository(db)
+        expired = await attempt_repo.expire_overdue_attempts()
+        unscored = await attempt_repo.get_unscored_expired_attempts(utcnow() - RESCORE_EXPIRED_AFTER)
+        ungraded.extend(
+            await attempt_repo.get_ungraded_submitted_attempts(utcnow() - REGRADE_SUBMITTED_AFTER)
+        )
+        counts.update(expired=len(expired), rescored=len(unscored), regraded=len(ungraded))
+        # An attempt can be in both lists when the sweep fell behind
+        to_score.update(expired)
+        to_score.update(unscored)
+    
+    run_in_worker_loop(run_with_db(_work))
+    
+    tasks = [
+        score_expired_attempt.s(attempt_id.hex, expires_at.isoformat())
+        for attempt_id, expires_at in to_score.items()
+    ]
+    tasks.extend(
+        score_attempt.s(attempt_id.hex, user_id.hex, submitted_at.isoformat())
+        for attempt_id, user_id, submitted_at in ungraded
+    )
+    if tasks:
+        group(tasks).apply_async()
+    
+    logger.info(
+        f"Expired attempts check completed: {counts['expired']} attempt(s) expired, "
+        f"{counts['rescored']} unscored attempt(s) dispatched again, "
+        f"{counts['regraded']} ungraded submission(s) queued again"
+    )
+    return {"status": "success", **counts}
+
+
+def _score_attempt(
+    attempt_id: str,
+    user_id: Optional[str] = None,
+    submitted_at: Optional[str] = None
+) -> dict:
+    """
+    Submit and score one attempt in a fresh DB session
+    
+    Args:
+        attempt_id: Attempt ID
+        user_id: If given, the attempt must belong to this user
+        submitted_at: ISO submission time to record (a deferred submission's
+            acceptance time, or an expired attempt's deadline)
+        
+    Returns:
+        Task status, with the result ID when the attempt was scored
+    """
+    outcome = {}
+    
+    async def _work(db: AsyncSession) -> None:
+        attempt_repo = AttemptRepository(db)
+        quiz_repo = QuizRepository(db)
+        attempt_service = AttemptService(
+            attempt_repo, quiz_repo, ResultRepository(db), ScoringService(attempt_repo, quiz_repo)
+        )
+        try:
+            outcome.update(await attempt_service.submit_attempt(
+                UUID(attempt_id),
+                user_id=UUID(user_id) if user_id else None,
+                submitted_at=datetime.fromisoformat(submitted_at) if submitted_at else None
+            ))
+        except CustomException as e:
+            # Already scored (a duplicate submit, or expiry raced the user)
+            logger.info(f"Skipping attempt {attempt_id}: {e.message}")
+    
+    run_in_worker_loop(run_with_db(_work))
     
-    # TODO: Implement auto-submit logic
-    # Example:
-    # from datetime import datetime
-    # db = get_db_session()
-    # attempt_repo = AttemptRepository(db)
-    # 
-    # expired_attempts = await attempt_repo.get_expired_attempts()
-    # for attempt in expired_attempts:
-    #     logger.info(f"Auto-submitting expired attempt {attempt.id}")
-    #     await attempt_service.submit_attempt(attempt.id)
-    
-    logger.info("Expired attempts check completed")
-    return {"status": "success"}
+    if not outcome:
+        return {"status": "skipped", "attempt_id": attempt_id}
+    return {"status": "success", "attempt_id": attempt_id, "result_id": str(outcome["result_id"])}
+
+
+@celery_app.task(name="app.workers.attempt_worker.score_attempt", acks_late=True)
+def score_attempt(attempt_id: str, user_id: str, submitted_at: Optional[str] = None):
+    """
+    Score an attempt the user submitted with deferred grading
+    
+    The attempt was already marked submitted by queue_submit_attempt;
+    the result notification is sent from submit_attempt as usual.
+    
+    Args:
+        attempt_id: Attempt ID
+        user_id: Owner of the attempt
+        submitted_at: ISO time the submission was accepted
+    """
+    return _score_attempt(attempt_id, user_id, submitted_at)
+
+
+@celery_app.task(name="app.workers.attempt_worker.score_expired_attempt", acks_late=True)
+def score_expired_attempt(attempt_id: str, expires_at: Optional[str] = None):
+    """
+    Score an attempt that expired without being submitted
+    
+    Acked after it runs: a task lost with its worker is redelivered, and
+    scoring twice is refused by submit_attempt under the row lock.
+    
+    Args:
+        attempt_id: Attempt ID
+        expires_at: ISO deadline, recorded as the submission time so the
+            attempt is timed at exactly its allowed duration
+    """
+    return _score_attempt(attempt_id, submitted_at=expires_at)
 
 
 @celery_app.task(name="app.workers.attempt_worker.send_expiry_warning")
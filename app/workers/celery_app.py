@@ -1,35 +1,58 @@
 """Celery application configuration"""
 
+import orjson
 from celery import Celery
+from kombu.serialization import register
 from app.core.config import settings
 
+# orjson for task messages and results: C encoder/decoder, compact output
+register(
+    "orjson",
+    orjson.dumps,
+    orjson.loads,
+    content_type="application/x-orjson",
+    content_encoding="binary"
+)
+
 # Create Celery app
 celery_app = Celery(
     "quiz_system",
     broker=settings.CELERY_BROKER_URL,
     backend=settings.CELERY_RESULT_BACKEND,
+    # The canonical task modules; nothing else is scanned for tasks
     include=[
         "app.workers.notification_worker",
         "app.workers.leaderboard_worker",
         "app.workers.attempt_worker"
-    ]
+    ],
+    # No signature binding on apply_async (send_task never checks anyway);
+    # the expired-attempt fan-out would otherwise bind every id
+    strict_typing=False
 )
 
 # Celery configuration
 celery_app.conf.update(
-    task_serializer="json",
-    accept_content=["json"],
-    result_serializer="json",
+    task_serializer="orjson",
+    # json stays accepted for messages queued before the switch
+    accept_content=["orjson", "json"],
+    result_serializer="orjson",
     timezone="UTC",
     enable_utc=True,
+    # Every task is fire-and-forget (nobody reads AsyncResults), so skip the
+    # result-backend write per task but still record failures
+    task_ignore_result=True,
+    task_store_errors_even_if_ignored=True,
+    # Only applies to tasks that opt back into storing results
     task_track_started=True,
+    # Notification tasks are short and I/O-bound: they get their own queue,
+    # served by a thread-pool worker (see docker-compose.yml)
+    task_routes={"notifications.*": {"queue": "notifications"}},
+    # Enforced by prefork only: tasks on the threads-pool notifications
+    # queue run without these limits
     task_time_limit=30 * 60,  # 30 minutes
     task_soft_time_limit=25 * 60,  # 25 minutes
 )
 
-# Auto-discover tasks
-celery_app.autodiscover_tasks(["app.workers"])
-
 
 # Celery Beat Schedule (periodic tasks)
 celery_app.conf.beat_schedule = {
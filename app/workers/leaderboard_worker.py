@@ -1,6 +1,9 @@
 """Leaderboard worker for Redis and DB sync"""
 
 from app.workers.celery_app import celery_app
+from app.workers.notification_worker import run_in_worker_loop, run_with_db
+from app.repositories.result_repo import ResultRepository
+from sqlalchemy.ext.asyncio import AsyncSession
 import logging
 
 logger = logging.getLogger(__name__)
@@ -32,22 +35,19 @@ def update_leaderboard(result_id: str):
 @celery_app.task(name="app.workers.leaderboard_worker.sync_leaderboard_to_db")
 def sync_leaderboard_to_db():
     """
-    Periodic task to sync Redis leaderboard to database
+    Periodic task to store leaderboard ranks in the database
     Runs every 5 minutes
+    
+    All quizzes are re-ranked by one UPDATE ... FROM (row_number() OVER
+    (PARTITION BY quiz_id)), so no ranking data travels to the worker.
     """
-    logger.info("Syncing leaderboard from Redis to database")
+    logger.info("Syncing leaderboard ranks to database")
+    updated = []
     
-    # TODO: Implement Redis to DB sync
-    # Example:
-    # redis_client = get_redis()
-    # for quiz_id in get_all_quiz_ids():
-    #     leaderboard = redis_client.zrevrange(
-    #         f"leaderboard:{quiz_id}",
-    #         0, -1,
-    #         withscores=True
-    #     )
-    #     for rank, (user_id, score) in enumerate(leaderboard, start=1):
-    #         update_result_rank_in_db(quiz_id, user_id, rank)
+    async def _work(db: AsyncSession) -> None:
+        updated.append(await ResultRepository(db).sync_ranks())
+    
+    run_in_worker_loop(run_with_db(_work))
     
-    logger.info("Leaderboard sync completed")
-    return {"status": "success"}
+    logger.info(f"Leaderboard sync completed: {updated[0]} rank(s) updated")
+    return {"status": "success", "updated": updated[0]}
@@ -1,27 +1,115 @@
 """Notification worker for in-app notifications"""
 
 from uuid import UUID
+from celery.concurrency import get_implementation
+from celery.signals import worker_init, worker_process_init, worker_process_shutdown, worker_shutdown
 from app.workers.celery_app import celery_app
-from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncEngine, AsyncSession
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from app.core.config import settings
+from app.core.cache import close_redis
 from app.services.notification_service import NotificationService
 from app.repositories.notification_repo import NotificationRepository
 from app.repositories.quiz_repo import QuizRepository
 from app.repositories.user_repo import UserRepository
+from typing import Coroutine, Optional
 import asyncio
 import logging
+import threading
 
+try:
+    # libuv-based loop for the worker's asyncio/asyncpg I/O (not on Windows)
+    import uvloop
+except ImportError:
+    uvloop = None
 
-async def run_with_db(callback):
-    """Helper to run async code with a fresh DB connection in a new loop."""
-    engine = create_async_engine(settings.DATABASE_URL, pool_pre_ping=True)
-    AsyncSessionLocal = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
-    
+logger = logging.getLogger(__name__)
+
+# One engine per worker process, created after the fork and reused by every
+# task. An asyncpg pool is bound to the loop its connections were opened on,
+# so tasks run on one long-lived loop per process (on its own thread, so
+# tasks from any pool thread can submit to it) rather than asyncio.run.
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_thread: Optional[threading.Thread] = None
+_engine: Optional[AsyncEngine] = None
+_session_factory: Optional[async_sessionmaker] = None
+_init_lock = threading.Lock()
+
+# Tasks one worker process runs at once; set from the worker in worker_init
+_tasks_per_process = 1
+
+
+@worker_init.connect
+def record_worker_concurrency(sender, **kwargs) -> None:
+    """Note how many tasks each process of this worker runs concurrently."""
+    global _tasks_per_process
+    pool = get_implementation(sender.pool_cls)
+    if pool.__module__ in ("celery.concurrency.prefork", "celery.concurrency.solo"):
+        # Each prefork child (or the solo worker) runs one task at a time
+        _tasks_per_process = 1
+    else:
+        _tasks_per_process = sender.concurrency
+
+
+@worker_process_init.connect
+def init_worker_db(**kwargs) -> None:
+    """Start this worker process's event loop and create its engine and session factory."""
+    global _loop, _loop_thread, _engine, _session_factory
+    _loop = uvloop.new_event_loop() if uvloop else asyncio.new_event_loop()
+    if hasattr(asyncio, "eager_task_factory"):
+        # Python 3.12+: tasks run inline until their first real suspension,
+        # so ones that finish without I/O never go through the scheduler
+        _loop.set_task_factory(asyncio.eager_task_factory)
+    _loop_thread = threading.Thread(target=_loop.run_forever, name="worker-event-loop", daemon=True)
+    _loop_thread.start()
+    _engine = create_async_engine(
+        settings.DATABASE_URL,
+        poolclass=AsyncAdaptedQueuePool,
+        pool_pre_ping=True,
+        pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+        pool_size=settings.WORKER_DB_POOL_SIZE * _tasks_per_process,
+        max_overflow=settings.WORKER_DB_MAX_OVERFLOW * _tasks_per_process,
+        pool_timeout=settings.WORKER_DB_POOL_TIMEOUT_SECONDS
+    )
+    _session_factory = async_sessionmaker(_engine, class_=AsyncSession, expire_on_commit=False)
+
+
+@worker_process_shutdown.connect
+@worker_shutdown.connect
+def close_worker_db(**kwargs) -> None:
+    """
+    Dispose of the engine and Redis client on their loop, then stop it.
+    Prefork children get worker_process_shutdown; solo and threads pools
+    never send it, so the worker's own worker_shutdown cleans up there
+    (in a prefork parent nothing was created and this is a no-op).
+    """
+    global _loop, _loop_thread, _engine, _session_factory
+    if _loop is None:
+        return
     try:
-        async with AsyncSessionLocal() as db:
-            await callback(db)
+        asyncio.run_coroutine_threadsafe(_engine.dispose(), _loop).result()
+        asyncio.run_coroutine_threadsafe(close_redis(), _loop).result()
     finally:
-        await engine.dispose()
+        _loop.call_soon_threadsafe(_loop.stop)
+        _loop_thread.join()
+        _loop.close()
+        _loop = _loop_thread = _engine = _session_factory = None
+
+
+def run_in_worker_loop(coro: Coroutine) -> None:
+    """Run a coroutine on this worker process's event loop and wait for it."""
+    if _loop is None:
+        # Pools without worker_process_init (solo, threads, eager tasks)
+        with _init_lock:
+            if _loop is None:
+                init_worker_db()
+    asyncio.run_coroutine_threadsafe(coro, _loop).result()
+
+
+async def run_with_db(callback):
+    """Helper to run async code with a session from the worker's pool."""
+    async with _session_factory() as db:
+        await callback(db)
 
 
 @celery_app.task(name="notifications.send_quiz_published")
@@ -36,10 +124,10 @@ def send_quiz_published(quiz_id: str) -> None:
             user_repo=UserRepository(db)
         )
         
-        count = await notification_service.notify_quiz_published(UUID(quiz_id))
-        logger.info(f"Created {count} quiz published notifications for quiz {quiz_id}")
+        # The service logs the count
+        await notification_service.notify_quiz_published(UUID(quiz_id))
     
-    asyncio.run(run_with_db(_work))
+    run_in_worker_loop(run_with_db(_work))
 
 
 @celery_app.task(name="notifications.send_quiz_assigned")
@@ -58,9 +146,30 @@ def send_quiz_assigned(user_id: str, quiz_id: str) -> None:
             UUID(user_id),
             UUID(quiz_id)
         )
-        logger.info(f"Created quiz assignment notification for user {user_id}")
+        logger.info("Created quiz assignment notification for user %s", user_id)
     
-    asyncio.run(run_with_db(_work))
+    run_in_worker_loop(run_with_db(_work))
+
+
+@celery_app.task(name="notifications.send_quiz_assigned_many")
+def send_quiz_assigned_many(user_ids: list[str], quiz_id: str) -> None:
+    """Celery task to create assignment notifications for a batch of users."""
+    
+    async def _work(db: AsyncSession) -> None:
+        notification_service = NotificationService(
+            session=db,
+            notification_repo=NotificationRepository(db),
+            quiz_repo=QuizRepository(db),
+            user_repo=UserRepository(db)
+        )
+        
+        # The service logs the count
+        await notification_service.notify_quiz_assigned_many(
+            [UUID(user_id) for user_id in user_ids],
+            UUID(quiz_id)
+        )
+    
+    run_in_worker_loop(run_with_db(_work))
 
 
 @celery_app.task(name="notifications.send_result_notification")
@@ -90,18 +199,44 @@ def send_result_notification(
             percentage,
             passed
         )
-        logger.info(f"Created result notification for user {user_id}")
+        logger.info("Created result notification for user %s", user_id)
+    
+    run_in_worker_loop(run_with_db(_work))
+
+
+@celery_app.task(name="notifications.flush_result_notifications", bind=True, acks_late=True)
+def flush_result_notifications(self) -> None:
+    """
+    Celery task to create the debounced burst of result notifications.
+    Acked after it runs: a flush lost with its worker is redelivered with
+    the same task id and resumes the burst it had claimed.
+    """
+    
+    async def _work(db: AsyncSession) -> None:
+        notification_service = NotificationService(
+            session=db,
+            notification_repo=NotificationRepository(db),
+            quiz_repo=QuizRepository(db),
+            user_repo=UserRepository(db)
+        )
+        
+        # The service logs the count
+        await notification_service.flush_result_notifications(self.request.id)
     
-    asyncio.run(run_with_db(_work))
+    run_in_worker_loop(run_with_db(_work))
 
 
-@celery_app.task(name="notifications.cleanup_old_notifications")
+@celery_app.task(name="notifications.cleanup_old_notifications", acks_late=True)
 def cleanup_old_notifications() -> None:
-    """Delete notifications older than 30 days."""
+    """
+    Delete notifications older than 30 days.
+    Acked after it runs: a purge cut short by a lost worker is redelivered,
+    and re-running it only deletes what is left.
+    """
     
     async def _work(db: AsyncSession) -> None:
         notification_repo = NotificationRepository(db)
         count = await notification_repo.delete_old_notifications(30)
-        logger.info(f"Cleaned up {count} old notifications")
+        logger.info("Cleaned up %d old notifications", count)
     
-    asyncio.run(run_with_db(_work))
+    run_in_worker_loop(run_with_db(_work))